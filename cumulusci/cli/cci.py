@@ -1,13 +1,17 @@
 import code
 import contextlib
+import importlib
 import pdb
 import runpy
 import sys
 import traceback
+from typing import Dict, List, Tuple
 
 import click
 import requests
 import rich
+from click.shell_completion import CompletionItem
+from click.utils import make_default_short_help
 from rich.console import Console
 from rich.markup import escape
 
@@ -18,16 +22,8 @@ from cumulusci.utils import get_cci_upgrade_command
 from cumulusci.utils.http.requests_utils import init_requests_trust
 from cumulusci.utils.logging import tee_stdout_stderr
 
-from .error import error
-from .flow import flow
 from .logger import get_tempfile_logger, init_logger
-from .org import org
-from .plan import plan
-from .project import project
-from .robot import robot
 from .runtime import CliRuntime, pass_runtime
-from .service import service
-from .task import task
 from .utils import (
     check_latest_version,
     get_installed_version,
@@ -41,6 +37,37 @@ SUGGEST_ERROR_COMMAND = (
 
 USAGE_ERRORS = (CumulusCIUsageError, click.UsageError)
 
+# Top level command groups, with the module that defines each one
+# and its short help for `cci --help`
+COMMAND_GROUPS = {
+    "error": ("cumulusci.cli.error", "Get or share information about an error"),
+    "flow": (
+        "cumulusci.cli.flow",
+        "Commands for finding and running flows for a project",
+    ),
+    "org": (
+        "cumulusci.cli.org",
+        "Commands for connecting and interacting with Salesforce orgs",
+    ),
+    "plan": (
+        "cumulusci.cli.plan",
+        "Commands for getting information about MetaDeploy plans",
+    ),
+    "project": (
+        "cumulusci.cli.project",
+        "Commands for interacting with project repository configurations",
+    ),
+    "robot": ("cumulusci.cli.robot", "Commands for working with Robot Framework"),
+    "service": (
+        "cumulusci.cli.service",
+        "Commands for connecting services to the keychain",
+    ),
+    "task": (
+        "cumulusci.cli.task",
+        "Commands for finding and running tasks for a project",
+    ),
+}
+
 
 #
 # Root command
@@ -192,7 +219,64 @@ def version_info_wrapper(
     ctx.exit()
 
 
-@click.group("main", help="")
+class LazyGroup(click.Group):
+    """A click Group which imports the module of a subcommand only when
+    the subcommand is used, so that cci starts without importing every
+    command and its dependencies.
+
+    Listing the subcommands in help and shell completions doesn't import them.
+    """
+
+    def __init__(self, *args, lazy_commands: Dict[str, Tuple[str, str]], **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str):
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            module = importlib.import_module(self.lazy_commands[cmd_name][0])
+            self.add_command(getattr(module, cmd_name))
+        return super().get_command(ctx, cmd_name)
+
+    def _short_helps(
+        self, ctx: click.Context, limit: int = 45
+    ) -> List[Tuple[str, str]]:
+        short_helps = []
+        for name in self.list_commands(ctx):
+            if name in self.commands:
+                if not self.commands[name].hidden:
+                    short_helps.append(
+                        (name, self.commands[name].get_short_help_str(limit))
+                    )
+            else:
+                help = self.lazy_commands[name][1]
+                short_helps.append((name, make_default_short_help(help, limit)))
+        return short_helps
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter):
+        names = self.list_commands(ctx)
+        if names:
+            # allow for 3 times the default spacing, as click does
+            limit = formatter.width - 6 - max(len(name) for name in names)
+            with formatter.section("Commands"):
+                formatter.write_dl(self._short_helps(ctx, limit))
+
+    def shell_complete(
+        self, ctx: click.Context, incomplete: str
+    ) -> List[CompletionItem]:
+        results = [
+            CompletionItem(name, help=help)
+            for name, help in self._short_helps(ctx)
+            if name.startswith(incomplete)
+        ]
+        # Skip click.Group's completions, which import every subcommand
+        results.extend(click.Command.shell_complete(self, ctx, incomplete))
+        return results
+
+
+@click.group("main", help="", cls=LazyGroup, lazy_commands=COMMAND_GROUPS)
 @click.option(  # based on https://click.palletsprojects.com/en/8.1.x/options/#callbacks-and-eager-options
     "--version",
     is_flag=True,
@@ -232,13 +316,8 @@ def shell(runtime, script=None, python=None):
         code.interact(local=variables)
 
 
-# Top Level Groups
-
-cli.add_command(error)
-cli.add_command(project)
-cli.add_command(org)
-cli.add_command(service)
-cli.add_command(task)
-cli.add_command(flow)
-cli.add_command(plan)
-cli.add_command(robot)
+def __getattr__(name: str):
+    """Import the top level command groups on first use, e.g. `cci.org`"""
+    if name in COMMAND_GROUPS:
+        return cli.get_command(click.Context(cli), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
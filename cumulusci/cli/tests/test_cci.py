@@ -2,6 +2,7 @@ import contextlib
 import io
 import os
 import shutil
+import subprocess
 import sys
 import tempfile
 from pathlib import Path
@@ -400,6 +401,59 @@ def test_cli():
     run_click_command(cci.cli)
 
 
+def test_cli__command_groups_imported_lazily():
+    """Importing the CLI and listing its commands must not import the command groups."""
+    script = (
+        "import sys\n"
+        "from cumulusci.cli import cci\n"
+        "try:\n"
+        "    cci.cli(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported = {
+        line.split("|")[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+    assert "cumulusci.cli.cci" in imported
+    assert not imported & {module for module, _ in cci.COMMAND_GROUPS.values()}
+    for name in cci.COMMAND_GROUPS:
+        assert f"  {name} " in result.stdout
+
+
+@pytest.mark.parametrize("name", cci.COMMAND_GROUPS)
+def test_cli__command_group_short_help(name):
+    module, short_help = cci.COMMAND_GROUPS[name]
+    group = cci.cli.get_command(click.Context(cci.cli), name)
+    assert group.callback.__module__ == module
+    assert group.get_short_help_str(limit=100) == short_help
+
+
+@pytest.mark.parametrize("limit", [45, 100])
+def test_cli__lazy_short_help_matches_loaded_groups(limit):
+    group = cci.LazyGroup("main", lazy_commands=cci.COMMAND_GROUPS)
+    ctx = click.Context(group)
+    lazy = group._short_helps(ctx, limit)
+    for name in cci.COMMAND_GROUPS:
+        group.get_command(ctx, name)
+        assert group.commands[name].get_short_help_str(limit) == dict(lazy)[name]
+    assert group._short_helps(ctx, limit) == lazy
+
+
+def test_cli__shell_complete():
+    ctx = click.Context(cci.cli)
+    completions = cci.cli.shell_complete(ctx, "p")
+    assert [item.value for item in completions] == ["plan", "project"]
+    assert completions[0].help == "Commands for getting information about..."
+
+
 @mock.patch(
     "cumulusci.cli.cci.get_latest_final_version",
     mock.Mock(return_value=version.parse("100")),
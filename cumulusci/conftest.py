@@ -13,6 +13,7 @@ from pytest import fixture
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from cumulusci.core.config.universal_config import UniversalConfig
 from cumulusci.core.dependencies.utils import TaskContext
 from cumulusci.core.github import get_github_api
 from cumulusci.salesforce_api.org_schema_models import Base
@@ -111,6 +112,23 @@ def patch_home_and_env(request):
             yield
 
 
+@pytest.fixture(scope="session")
+def config_cache_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("config_cache")
+
+
+@pytest.fixture(autouse=True)
+def isolate_config_cache(config_cache_dir):
+    "Keep parsed cumulusci.yml files out of the real ~/.cumulusci, even with use_real_env."
+    with mock.patch.object(
+        UniversalConfig,
+        "config_cache_dir",
+        new_callable=mock.PropertyMock,
+        return_value=config_cache_dir,
+    ):
+        yield
+
+
 @pytest.fixture()
 def temp_db():
     with TemporaryDirectory() as t:
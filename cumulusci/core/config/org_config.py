@@ -16,11 +16,18 @@ from cumulusci.core.exceptions import (
     DependencyResolutionError,
     ServiceNotConfigured,
 )
+from cumulusci.core.task_cache import TASK_CACHE_NAME, TaskResultCache
 from cumulusci.oauth.client import OAuth2Client, OAuth2ClientConfig
 from cumulusci.oauth.salesforce import SANDBOX_LOGIN_URL, jwt_session
+from cumulusci.salesforce_api.api_limits import ApiLimitGovernor
+from cumulusci.salesforce_api.describe_cache import DescribeCache
 from cumulusci.utils import parse_api_datetime
 from cumulusci.utils.fileutils import open_fs_resource
 from cumulusci.utils.http.requests_utils import safe_json_from_response
+from cumulusci.utils.salesforce.count_sobjects import (
+    RECORD_COUNT_CACHE_NAME,
+    RecordCountCache,
+)
 from cumulusci.utils.version_strings import StrictVersion
 
 SKIP_REFRESH = os.environ.get("CUMULUSCI_DISABLE_REFRESH")
@@ -80,6 +87,8 @@ class OrgConfig(BaseConfig):
         self._installed_packages = None
         self._is_person_accounts_enabled = None
         self._multiple_currencies_is_enabled = False
+        self._api_governor = None
+        self._describe_cache = None
 
         super().__init__(config)
 
@@ -172,6 +181,59 @@ class OrgConfig(BaseConfig):
             version=self.latest_api_version,
         )
 
+    @property
+    def api_governor(self) -> ApiLimitGovernor:
+        """Tracks API usage of this org across every connection made to it."""
+        if self._api_governor is None:
+            self._api_governor = ApiLimitGovernor()
+        return self._api_governor
+
+    @property
+    def describe_cache(self) -> DescribeCache:
+        """Describe responses shared by every task that uses this org config."""
+        if self._describe_cache is None:
+            self._describe_cache = DescribeCache()
+        return self._describe_cache
+
+    def describe(self, sobject: Optional[str] = None, sf=None) -> dict:
+        """Return the global describe, or the describe of `sobject`.
+
+        Responses are cached per org and API version, so steps of a flow
+        share them. Pass `sf` to describe through an existing connection."""
+        sf = sf or self.salesforce_client
+        fetch = getattr(sf, sobject).describe if sobject else sf.describe
+        return self.describe_cache.get(
+            (self.org_id, sf.sf_version, "describe", sobject), fetch
+        )
+
+    def reset_describe_cache(self):
+        """Forget cached describes, e.g. after the running user's permissions
+        may have changed."""
+        if self._describe_cache is not None:
+            self._describe_cache.invalidate()
+
+    def org_changed(self):
+        """Forget cached describes and task results after the org's
+        metadata may have changed."""
+        self.reset_describe_cache()
+        if self.keychain and self.username and self.get_domain():
+            self.task_result_cache().clear()
+
+    def task_result_cache(self) -> TaskResultCache:
+        """Results saved for this org by tasks with a cache policy."""
+        with self.get_orginfo_cache_dir(TASK_CACHE_NAME) as directory:
+            return TaskResultCache(directory.getsyspath())
+
+    def record_count_cache(self) -> RecordCountCache:
+        """Record counts saved for this org by get_org_schema."""
+        with self.get_orginfo_cache_dir(RECORD_COUNT_CACHE_NAME) as directory:
+            return RecordCountCache(directory / "record_counts.json")
+
+    def records_changed(self):
+        """Forget cached record counts after records were inserted or deleted."""
+        if self.keychain and self.username and self.get_domain():
+            self.record_count_cache().clear()
+
     @property
     def latest_api_version(self):
         if not self._latest_api_version:
@@ -422,7 +484,7 @@ class OrgConfig(BaseConfig):
         if self._is_person_accounts_enabled is None:
             self._is_person_accounts_enabled = any(
                 field["name"] == "IsPersonAccount"
-                for field in self.salesforce_client.Account.describe()["fields"]
+                for field in self.describe("Account")["fields"]
             )
         return self._is_person_accounts_enabled
 
@@ -481,7 +543,7 @@ class OrgConfig(BaseConfig):
         if not self._multiple_currencies_is_enabled:
             try:
                 # Multiple Currencies is enabled if CurrencyType can be described (implying the Sobject is exposed).
-                self.salesforce_client.CurrencyType.describe()
+                self.describe("CurrencyType")
                 self._multiple_currencies_is_enabled = True
             except SalesforceResourceNotFound:
                 # CurrencyType Sobject is not exposed meaning Multiple Currencies is not enabled.
@@ -549,8 +611,8 @@ class OrgConfig(BaseConfig):
         # - DatedConversionRate Sobject is createable.
         # Advanced Currency Management (ACM) can be disabled, and if so, DatedConversionRate Sobject will no longer be createable.
         try:
-            # Always check the describe since ACM can be disabled.
-            return self.salesforce_client.DatedConversionRate.describe()["createable"]
+            # ACM can be disabled, but doing so by deploying settings resets the describe cache.
+            return self.describe("DatedConversionRate")["createable"]
         except SalesforceResourceNotFound:
             # DatedConversionRate Sobject is not exposed meaning Multiple Currencies is not enabled.
             return False
@@ -559,7 +621,7 @@ class OrgConfig(BaseConfig):
     def is_survey_advanced_features_enabled(self) -> bool:
         return any(
             f["name"] == "PermissionsAllowSurveyAdvancedFeatures"
-            for f in self.salesforce_client.PermissionSet.describe()["fields"]
+            for f in self.describe("PermissionSet")["fields"]
         )
 
     def resolve_04t_dependencies(self, dependencies):
@@ -40,13 +40,15 @@ from cumulusci.core.github import (
     get_github_api_for_repo,
 )
 from cumulusci.core.source import GitHubSource, LocalFolderSource, NullSource
-from cumulusci.core.utils import merge_config
 from cumulusci.utils.fileutils import FSResource, open_fs_resource
 from cumulusci.utils.git import current_branch, git_path, parse_repo_url, split_repo_url
 from cumulusci.utils.yaml.cumulusci_yml import (
     GitHubSourceModel,
     LocalFolderSourceModel,
+    cci_cached_load_with_digest,
+    cci_cached_merge,
     cci_safe_load,
+    config_digest,
 )
 
 sys.modules.setdefault(
@@ -87,6 +89,9 @@ class BaseProjectConfig(BaseTaskFlowConfig, ProjectConfigPropertiesMixin):
     config_project_local: dict
     config_additional_yaml: dict
     additional_yaml: Optional[str]
+    # identifies the files config was loaded from; None if it wasn't
+    config_digest: Optional[str]
+    flow_plans: Dict[str, list]
     source: Union[NullSource, GitHubSource, LocalFolderSource]
     _cache_dir: Optional[Path]
     included_sources: Dict[
@@ -130,6 +135,10 @@ class BaseProjectConfig(BaseTaskFlowConfig, ProjectConfigPropertiesMixin):
         # Store requested cache directory, which may be our parent's if we are a subproject
         self._cache_dir = cache_dir
 
+        self.config_digest = None
+        # resolved flow steps, keyed by the digests they were resolved from
+        self.flow_plans = {}
+
         super().__init__(config=config)
 
     @property
@@ -160,15 +169,22 @@ class BaseProjectConfig(BaseTaskFlowConfig, ProjectConfigPropertiesMixin):
             )
 
         # Load the project's yaml config file
-        project_config = cci_safe_load(self.config_project_path, logger=self.logger)
+        project_config, project_digest = cci_cached_load_with_digest(
+            self.config_project_path,
+            self.universal_config_obj.config_cache_dir,
+            logger=self.logger,
+        )
 
         if project_config:
             self.config_project.update(project_config)
 
         # Load the local project yaml config file if it exists
+        local_digest = ""
         if self.config_project_local_path:
-            local_config = cci_safe_load(
-                self.config_project_local_path, logger=self.logger
+            local_config, local_digest = cci_cached_load_with_digest(
+                self.config_project_local_path,
+                self.universal_config_obj.config_cache_dir,
+                logger=self.logger,
             )
             if local_config:
                 self.config_project_local.update(local_config)
@@ -183,14 +199,25 @@ class BaseProjectConfig(BaseTaskFlowConfig, ProjectConfigPropertiesMixin):
             if additional_yaml_config:
                 self.config_additional_yaml.update(additional_yaml_config)
 
-        self.config = merge_config(
+        universal_digest = getattr(self.universal_config_obj, "config_digest", None)
+        if isinstance(universal_digest, str):
+            self.config_digest = config_digest(
+                universal_digest,
+                project_digest,
+                local_digest,
+                self.additional_yaml or "",
+            )
+        self.config = cci_cached_merge(
             {
                 "universal_config": self.config_universal,
                 "global_config": self.config_global,
                 "project_config": self.config_project,
                 "project_local_config": self.config_project_local,
                 "additional_yaml": self.config_additional_yaml,
-            }
+            },
+            self.config_project_path,
+            self.config_digest,
+            self.universal_config_obj.config_cache_dir,
         )
 
         self._validate_config()
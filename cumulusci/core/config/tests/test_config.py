@@ -1309,6 +1309,70 @@ class TestOrgConfig:
         assert config.installed_packages == expected
         sf.restful.assert_called()
 
+    @mock.patch("cumulusci.core.config.org_config.OrgConfig.salesforce_client")
+    def test_describe__cached(self, sf):
+        config = OrgConfig({"org_id": "00D000000000001"}, "test")
+        sf.sf_version = "62.0"
+        sf.describe.return_value = {"sobjects": [{"name": "Account"}]}
+        sf.Account.describe.return_value = {"fields": [{"name": "Id"}]}
+
+        assert config.describe() == config.describe()
+        assert config.describe("Account") == config.describe("Account")
+        sf.describe.assert_called_once()
+        sf.Account.describe.assert_called_once()
+
+        config.reset_describe_cache()
+        config.describe("Account")
+        assert sf.Account.describe.call_count == 2
+
+    def test_org_changed__clears_describes_and_task_results(self):
+        config = OrgConfig(
+            {
+                "instance_url": "http://zombo.com/welcome",
+                "username": "test-example@example.com",
+            },
+            "test",
+            keychain=DummyKeychain(),
+        )
+        with TemporaryDirectory() as t:
+            with mock.patch("cumulusci.tests.util.DummyKeychain.cache_dir", Path(t)):
+                config.task_result_cache().set("key", "result", {})
+                config.describe_cache.get(("key",), lambda: "stale")
+                config.reset_describe_cache()
+                assert config.task_result_cache().get("key", 60)["result"] == "result"
+
+                config.describe_cache.get(("key",), lambda: "stale")
+                config.org_changed()
+                assert config.task_result_cache().get("key", 60) is None
+                assert len(config.describe_cache) == 0
+
+    def test_records_changed(self):
+        config = OrgConfig(
+            {
+                "instance_url": "http://zombo.com/welcome",
+                "username": "test-example@example.com",
+            },
+            "test",
+            keychain=DummyKeychain(),
+        )
+        with TemporaryDirectory() as t:
+            with mock.patch("cumulusci.tests.util.DummyKeychain.cache_dir", Path(t)):
+                config.record_count_cache().update({"Account": 5})
+                config.records_changed()
+                assert config.record_count_cache().get(["Account"]) == {}
+
+        # Without a keychain there is nothing to clear
+        OrgConfig({}, "test").records_changed()
+
+    def test_describe__uses_connection(self):
+        config = OrgConfig({"org_id": "00D000000000001"}, "test")
+        sf = mock.Mock(sf_version="62.0")
+        sf.describe.return_value = {"sobjects": []}
+
+        assert config.describe(sf=sf) == {"sobjects": []}
+        assert config.describe(sf=sf) == {"sobjects": []}
+        sf.describe.assert_called_once()
+
     @mock.patch("cumulusci.core.config.org_config.OrgConfig.salesforce_client")
     def test_has_minimum_package_version(self, sf):
         config = OrgConfig({}, "test")
@@ -268,6 +268,44 @@ class TestBaseProjectConfig:
             assert config.config_additional_yaml != {}
             assert config.project__package__api_version == 45.0
 
+    def test_load_project_config__cached_merge(self, mock_class):
+        mock_class.return_value = self.tempdir_home
+        os.mkdir(os.path.join(self.tempdir_project, ".git"))
+        self._create_git_config()
+        self._create_project_config()
+        self._create_project_config_local(
+            "project:\n    package:\n        api_version: 45.0\n"
+        )
+        local_path = os.path.join(
+            self.tempdir_home,
+            ".cumulusci",
+            self.project_name,
+            BaseProjectConfig.config_filename,
+        )
+
+        with cd(self.tempdir_project):
+            universal_config = UniversalConfig()
+            config = BaseProjectConfig(universal_config)
+            assert config.config_digest
+            assert config.project__package__api_version == 45.0
+
+            with mock.patch(
+                "cumulusci.utils.yaml.cumulusci_yml.merge_config"
+            ) as merge_config:
+                config = BaseProjectConfig(universal_config)
+            merge_config.assert_not_called()
+            assert config.project__package__api_version == 45.0
+            assert config.project__package__name == "TestProject"
+
+            self._write_file(
+                local_path, "project:\n    package:\n        api_version: 46.0\n"
+            )
+            config = BaseProjectConfig(universal_config)
+            assert config.project__package__api_version == 46.0
+
+            config = BaseProjectConfig(universal_config, additional_yaml="a: 1")
+            assert config.a == 1
+
 
 @mock.patch("sarge.Command")
 class TestScratchOrgConfig:
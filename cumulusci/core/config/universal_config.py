@@ -6,8 +6,11 @@ from cumulusci.core.config.project_config import (
     BaseProjectConfig,
     ProjectConfigPropertiesMixin,
 )
-from cumulusci.core.utils import merge_config
-from cumulusci.utils.yaml.cumulusci_yml import cci_safe_load
+from cumulusci.utils.yaml.cumulusci_yml import (
+    cci_cached_load_with_digest,
+    cci_cached_merge,
+    config_digest,
+)
 
 __location__ = os.path.dirname(os.path.realpath(__file__))
 
@@ -19,6 +22,8 @@ class UniversalConfig(BaseTaskFlowConfig, ProjectConfigPropertiesMixin):
     cli: dict
 
     config = None
+    # identifies the files config was loaded from; None if it wasn't
+    config_digest = None
     config_filename = "cumulusci.yml"
     project_config_class = BaseProjectConfig
     universal_config_obj = None
@@ -58,6 +63,11 @@ class UniversalConfig(BaseTaskFlowConfig, ProjectConfigPropertiesMixin):
 
         return config_path
 
+    @property
+    def config_cache_dir(self) -> Path:
+        """Where parsed configuration files are cached. Usually ~/.cumulusci/config_cache"""
+        return Path(self.cumulusci_config_dir) / "config_cache"
+
     @property
     def config_universal_path(self):
         return os.path.abspath(
@@ -71,18 +81,27 @@ class UniversalConfig(BaseTaskFlowConfig, ProjectConfigPropertiesMixin):
             return
 
         # load the universal config
-        UniversalConfig.config_universal = cci_safe_load(self.config_universal_path)
+        universal_config, universal_digest = cci_cached_load_with_digest(
+            self.config_universal_path, self.config_cache_dir
+        )
+        UniversalConfig.config_universal = universal_config
 
         # Load the local config
         if self.config_global_path:
-            config = cci_safe_load(self.config_global_path)
+            config, global_digest = cci_cached_load_with_digest(
+                self.config_global_path, self.config_cache_dir
+            )
         else:
-            config = {}
+            config, global_digest = {}, ""
         UniversalConfig.config_global = config
 
-        UniversalConfig.config = merge_config(
+        UniversalConfig.config_digest = config_digest(universal_digest, global_digest)
+        UniversalConfig.config = cci_cached_merge(
             {
                 "universal_config": UniversalConfig.config_universal,
                 "global_config": UniversalConfig.config_global,
-            }
+            },
+            self.config_universal_path,
+            UniversalConfig.config_digest,
+            self.config_cache_dir,
         )
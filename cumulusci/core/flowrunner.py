@@ -27,7 +27,8 @@ Upon initialization, FlowRunner:
 Upon running the flow, FlowRunner:
 
 - Refreshes the org credentials
-- Runs each StepSpec in order
+- Runs each StepSpec in order, or concurrently once the steps it
+  `depends_on` have finished if any step declares its dependencies
 - * Logs the task or skip
 - * Updates any ^^ task option values with return_values references
 - * Creates a TaskRunner to run the task and get the result
@@ -52,17 +53,27 @@ Option values/overrides can be passed in at a number of levels, in increasing or
 """
 
 import copy
+import hashlib
+import inspect
+import json
 import logging
+import os
+import threading
+import time
 from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
 from operator import attrgetter
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
     DefaultDict,
     Dict,
     List,
     NamedTuple,
     Optional,
+    Set,
     Tuple,
     Type,
     Union,
@@ -78,6 +89,13 @@ from cumulusci.core.exceptions import (
     FlowInfiniteLoopError,
     TaskImportError,
 )
+from cumulusci.core.task_cache import (
+    TASK_CACHE_NAME,
+    TaskResultCache,
+    get_cache_policy,
+    source_tree_hash,
+    task_cache_key,
+)
 from cumulusci.utils.version_strings import LooseVersion
 
 if TYPE_CHECKING:
@@ -88,6 +106,24 @@ RETURN_VALUE_OPTION_PREFIX = "^^"
 
 jinja2_env = ImmutableSandboxedEnvironment()
 
+DEFAULT_MAX_PARALLEL_STEPS = 4
+
+
+@lru_cache(maxsize=None)
+def compile_expression(source: str) -> Callable[..., Any]:
+    """Compile a jinja2 expression from a `when` clause or preflight check,
+    reusing the compiled expression each time the same source is evaluated."""
+    return jinja2_env.compile_expression(source)
+
+
+def max_parallel_steps() -> int:
+    """The number of flow steps run at once, from CUMULUSCI_MAX_PARALLEL_STEPS."""
+    value = os.environ.get("CUMULUSCI_MAX_PARALLEL_STEPS")
+    try:
+        return max(1, int(value)) if value is not None else DEFAULT_MAX_PARALLEL_STEPS
+    except ValueError:
+        return DEFAULT_MAX_PARALLEL_STEPS
+
 
 class StepVersion(LooseVersion):
     """Like LooseVersion, but converts "/" into -1 to support comparisons"""
@@ -110,6 +146,7 @@ class StepSpec:
         "path",
         "skip",
         "when",
+        "depends_on",
     )
 
     step_num: StepVersion
@@ -123,6 +160,9 @@ class StepSpec:
     path: str
     skip: bool
     when: Optional[str]
+    # The depends_on of the step, and of each flow step it is nested in,
+    # outermost first. None means the step waits for all steps before it.
+    depends_on: Tuple[Optional[Tuple[str, ...]], ...]
 
     def __init__(
         self,
@@ -135,6 +175,7 @@ class StepSpec:
         from_flow: Optional[str] = None,
         skip: bool = False,
         when: Optional[str] = None,
+        depends_on: Tuple[Optional[Tuple[str, ...]], ...] = (),
     ):
         self.step_num = step_num
         self.task_name = task_name
@@ -144,6 +185,7 @@ class StepSpec:
         self.allow_failure = allow_failure
         self.skip = skip
         self.when = when
+        self.depends_on = depends_on
 
         # Store the dotted path to this step.
         # This is not guaranteed to be unique, because multiple steps
@@ -241,20 +283,28 @@ class TaskRunner:
     step: StepSpec
     org_config: Optional[OrgConfig]
     flow: Optional["FlowCoordinator"]
+    logger: Optional[logging.Logger]
 
     def __init__(
         self,
         step: StepSpec,
         org_config: Optional[OrgConfig],
         flow: Optional["FlowCoordinator"] = None,
+        logger: Optional[logging.Logger] = None,
     ):
         self.step = step
         self.org_config = org_config
         self.flow = flow
+        self.logger = logger
 
     @classmethod
-    def from_flow(cls, flow: "FlowCoordinator", step: StepSpec) -> "TaskRunner":
-        return cls(step, flow.org_config, flow=flow)
+    def from_flow(
+        cls,
+        flow: "FlowCoordinator",
+        step: StepSpec,
+        logger: Optional[logging.Logger] = None,
+    ) -> "TaskRunner":
+        return cls(step, flow.org_config, flow=flow, logger=logger)
 
     def run_step(self, **options) -> StepResult:
         """
@@ -273,6 +323,32 @@ class TaskRunner:
 
         assert self.step.task_class
 
+        policy = get_cache_policy(task_config)
+        cache = self._get_result_cache() if policy else None
+        if cache:
+            cache_key = task_cache_key(
+                self.step.task_class,
+                task_config["options"],
+                self.org_config.org_id if self.org_config else None,
+                source_tree_hash(self.step.project_config) if policy.source else None,
+            )
+            entry = cache.get(cache_key, policy.ttl)
+            if entry:
+                (self.logger or self.flow.logger).info(
+                    f"Using the result of {self.step.task_name} from "
+                    f"{time.time() - entry['timestamp']:.0f} seconds ago"
+                )
+                return StepResult(
+                    self.step.step_num,
+                    self.step.task_name,
+                    self.step.path,
+                    entry["result"],
+                    entry["return_values"],
+                    None,
+                )
+
+        # Steps run in parallel each log through their own logger.
+        kwargs = {"logger": self.logger} if self.logger else {}
         task = self.step.task_class(
             self.step.project_config,
             TaskConfig(task_config),
@@ -280,14 +356,19 @@ class TaskRunner:
             name=self.step.task_name,
             stepnum=self.step.step_num,
             flow=self.flow,
+            **kwargs,
         )
         self._log_options(task)
         exc = None
         try:
             task()
         except Exception as e:
-            self.flow.logger.error(f"Exception in task {self.step.path}")
+            (self.logger or self.flow.logger).error(
+                f"Exception in task {self.step.path}"
+            )
             exc = e
+        if cache and exc is None:
+            cache.set(cache_key, task.result, task.return_values)
         return StepResult(
             self.step.step_num,
             self.step.task_name,
@@ -297,6 +378,13 @@ class TaskRunner:
             exc,
         )
 
+    def _get_result_cache(self) -> Optional[TaskResultCache]:
+        """Where to save the results of tasks with a cache policy."""
+        if self.org_config and self.org_config.keychain:
+            return self.org_config.task_result_cache()
+        if self.step.project_config.repo_root:
+            return TaskResultCache(self.step.project_config.cache_dir / TASK_CACHE_NAME)
+
     def _log_options(self, task: "BaseTask"):
         if not task.task_options:
             task.logger.info("No task options present")
@@ -322,6 +410,7 @@ class TaskRunner:
 
 class FlowCoordinator:
     org_config: Optional[OrgConfig]
+    _org_config_cache: Optional["OrgConfigCache"]
     steps: List[StepSpec]
     callbacks: FlowCallback
     logger: logging.Logger
@@ -330,6 +419,9 @@ class FlowCoordinator:
     runtime_options: dict
     name: Optional[str]
     results: List[StepResult]
+    # Seconds spent resolving the flow's steps, and whether they were cached
+    plan_time: float
+    plan_cached: bool
 
     def __init__(
         self,
@@ -344,6 +436,7 @@ class FlowCoordinator:
         self.flow_config = flow_config
         self.name = name
         self.org_config = None
+        self._org_config_cache = None
 
         if not callbacks:
             callbacks = FlowCallback()
@@ -353,6 +446,8 @@ class FlowCoordinator:
 
         self.skip = skip or []
         self.results = []
+        # Steps may run in parallel; callbacks are never called concurrently
+        self._callback_lock = threading.Lock()
 
         self.logger = self._init_logger()
         self.steps = self._init_steps()
@@ -374,10 +469,11 @@ class FlowCoordinator:
         instance.steps = steps
         return instance
 
-    def _rule(self, fill="=", length=60, new_line=False):
-        self.logger.info(f"{fill * length}")
+    def _rule(self, fill="=", length=60, new_line=False, logger=None):
+        logger = logger or self.logger
+        logger.info(f"{fill * length}")
         if new_line:
-            self.logger.info("")
+            logger.info("")
 
     def get_summary(self, verbose=False):
         """Returns an output string that contains the description of the flow
@@ -461,6 +557,7 @@ class FlowCoordinator:
 
     def run(self, org_config: OrgConfig):
         self.org_config = org_config
+        self._org_config_cache = OrgConfigCache(org_config)
         line = f"Initializing flow: {self.__class__.__name__}"
         if self.name:
             line = f"{line} ({self.name})"
@@ -485,14 +582,19 @@ class FlowCoordinator:
         self.logger.info("Steps:")
         for line in self.get_summary().splitlines():
             self.logger.info(line)
+        cached = " (cached)" if self.plan_cached else ""
+        self.logger.info(f"Resolved steps in {self.plan_time:.2f}s{cached}")
         self._rule(fill="-", new_line=True)
 
         self.logger.info("Starting execution")
         self._rule(new_line=True)
 
         try:
-            for step in self.steps:
-                self._run_step(step)
+            if any(any(d is not None for d in step.depends_on) for step in self.steps):
+                self._run_steps_in_parallel()
+            else:
+                for step in self.steps:
+                    self._run_step(step)
             flow_name = f"'{self.name}' " if self.name else ""
             self.logger.info(
                 f"Completed flow {flow_name}on org {org_config.name} successfully!"
@@ -500,41 +602,153 @@ class FlowCoordinator:
         finally:
             self.callbacks.post_flow(self)
 
-    def _run_step(self, step: StepSpec):
+    def _run_step(self, step: StepSpec, logger: Optional[logging.Logger] = None):
+        logger = logger or self.logger
         if step.skip:
-            self._rule(fill="*")
-            self.logger.info(f"Skipping task: {step.task_name}")
-            self._rule(fill="*", new_line=True)
+            self._rule(fill="*", logger=logger)
+            logger.info(f"Skipping task: {step.task_name}")
+            self._rule(fill="*", new_line=True, logger=logger)
             return
 
         if step.when:
             jinja2_context = {
                 "project_config": step.project_config,
-                "org_config": self.org_config,
+                "org_config": self._org_config_cache or self.org_config,
             }
-            expr = jinja2_env.compile_expression(step.when)
+            expr = compile_expression(step.when)
             value = expr(**jinja2_context)
             if not value:
-                self.logger.info(
+                logger.info(
                     f"Skipping task {step.task_name} (skipped unless {step.when})"
                 )
                 return
 
-        self._rule(fill="-")
-        self.logger.info(f"Running task: {step.task_name}")
-        self._rule(fill="-", new_line=True)
-
-        self.callbacks.pre_task(step)
-        result = TaskRunner.from_flow(self, step).run_step()
-        self.callbacks.post_task(step, result)
-
-        self.results.append(
-            result
-        )  # add even a failed result to the result set for the post flow
+        self._rule(fill="-", logger=logger)
+        logger.info(f"Running task: {step.task_name}")
+        self._rule(fill="-", new_line=True, logger=logger)
+
+        with self._callback_lock:
+            self.callbacks.pre_task(step)
+        result = TaskRunner.from_flow(
+            self, step, logger=logger if logger is not self.logger else None
+        ).run_step()
+        with self._callback_lock:
+            self.callbacks.post_task(step, result)
+            # The task may have changed the org
+            if self._org_config_cache:
+                self._org_config_cache.reset()
+
+            self.results.append(
+                result
+            )  # add even a failed result to the result set for the post flow
 
         if result.exception and not step.allow_failure:
             raise result.exception  # PY3: raise an exception type we control *from* this exception instead?
 
+    def _run_steps_in_parallel(self):
+        """Run each step as soon as the steps it depends on have finished,
+        up to max_parallel_steps() at once.
+
+        Tasks change the process's working directory and output streams
+        while they run, so only steps whose tasks are `thread_safe` run
+        alongside each other. Any other step waits for the running steps
+        to finish, and no step starts until it is done.
+
+        Callbacks are called one at a time, from whichever thread runs the
+        step. Results are kept in step order, whichever step finishes first."""
+        dependencies = self._get_step_dependencies(self.steps)
+        started: Set[int] = set()
+        finished: Set[int] = set()
+        running = {}
+        failure = None
+        try:
+            with ThreadPoolExecutor(max_workers=max_parallel_steps()) as executor:
+                while True:
+                    for i, step in enumerate(self.steps):
+                        if failure is not None or i in started:
+                            continue
+                        if not dependencies[i] <= finished:
+                            continue
+                        if running and not (
+                            self._is_thread_safe(step)
+                            and all(
+                                self._is_thread_safe(self.steps[j])
+                                for j in running.values()
+                            )
+                        ):
+                            continue
+                        started.add(i)
+                        future = executor.submit(
+                            self._run_step, step, self._get_step_logger(step)
+                        )
+                        running[future] = i
+                    if not running:
+                        break
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in sorted(done, key=running.__getitem__):
+                        finished.add(running.pop(future))
+                        if future.exception() and failure is None:
+                            failure = future.exception()
+        finally:
+            self.results.sort(key=attrgetter("step_num"))
+        if failure:
+            raise failure
+
+    def _is_thread_safe(self, step: StepSpec) -> bool:
+        return step.skip or getattr(step.task_class, "thread_safe", False)
+
+    def _get_step_logger(self, step: StepSpec) -> logging.Logger:
+        logger = self.logger.getChild(f"step{step.step_num}")
+        if not any(isinstance(f, StepLogFilter) for f in logger.filters):
+            logger.addFilter(StepLogFilter(f"{step.step_num}:{step.task_name}"))
+        return logger
+
+    def _get_step_dependencies(self, steps: List[StepSpec]) -> List[Set[int]]:
+        """Find the steps each step must wait for, by their index in `steps`.
+
+        A step waits for every step before it, unless it (or the flow step
+        it is nested in) declares `depends_on`. Then it waits only for the
+        listed steps of the same flow, and all the steps nested in them."""
+        numbers = [str(step.step_num).split("/") for step in steps]
+        for j, step in enumerate(steps):
+            for level, depends_on in enumerate(step.depends_on):
+                if depends_on is None:
+                    continue
+                siblings = {
+                    parts[level]
+                    for parts in numbers[:j]
+                    if len(parts) > level
+                    and parts[:level] == numbers[j][:level]
+                    and parts[level] != numbers[j][level]
+                }
+                for number in depends_on:
+                    if number not in siblings:
+                        raise FlowConfigError(
+                            f"Step {'/'.join(numbers[j][: level + 1])} depends on "
+                            f"step {number}, which is not an earlier step of the same flow."
+                        )
+
+        dependencies = []
+        for j, step in enumerate(steps):
+            waits_for = set()
+            for i in range(j):
+                # The level of the flow in which the two steps diverge
+                level = 0
+                last = min(len(numbers[i]), len(numbers[j])) - 1
+                while level < last and numbers[i][level] == numbers[j][level]:
+                    level += 1
+                depends_on = (
+                    step.depends_on[level] if level < len(step.depends_on) else None
+                )
+                if (
+                    depends_on is None
+                    or numbers[i][level] in depends_on
+                    or numbers[i][level] == numbers[j][level]
+                ):
+                    waits_for.add(i)
+            dependencies.append(waits_for)
+        return dependencies
+
     def _init_logger(self) -> logging.Logger:
         """
         Returns a logging.Logger-like object to use for the duration of the flow. Tasks will receive this logger
@@ -548,8 +762,58 @@ class FlowCoordinator:
         """
         Given the flow config and everything else, create a list of steps to run, sorted by step number.
 
+        Resolved steps are cached on the project config, so building the same
+        flow again from the same configuration files doesn't resolve them again.
+
         :return: List[StepSpec]
         """
+        start = time.perf_counter()
+        plans = getattr(self.project_config, "flow_plans", {})
+        key = self._get_plan_key()
+        steps = plans.get(key) if key else None
+        self.plan_cached = steps is not None
+        if steps is None:
+            steps = self._resolve_steps()
+            if key:
+                plans[key] = steps
+
+        # Callbacks and tasks may change steps, so each flow gets its own copies.
+        steps = [copy.copy(step) for step in steps]
+        for step in steps:
+            step.task_config = copy.deepcopy(step.task_config)
+        self.plan_time = time.perf_counter() - start
+        return steps
+
+    def _get_plan_key(self) -> Optional[str]:
+        """A hash of what this flow's steps are resolved from: the digests of
+        the configuration files and the flow's own config, name and options.
+        None if the project config wasn't loaded from files, since its config
+        may have been built or changed in memory."""
+        project_digest = getattr(self.project_config, "config_digest", None)
+        flow_project_config = self.flow_config.project_config or self.project_config
+        flow_digest = getattr(flow_project_config, "config_digest", None)
+        if not isinstance(project_digest, str) or not isinstance(flow_digest, str):
+            return None
+        try:
+            data = json.dumps(
+                [
+                    project_digest,
+                    flow_digest,
+                    repr(flow_project_config.source),
+                    self.name,
+                    self.flow_config.config,
+                    self.runtime_options,
+                    self.skip,
+                ],
+                sort_keys=True,
+                default=repr,
+            )
+        except (TypeError, ValueError):
+            # e.g. step numbers of mixed types can't be sorted
+            return None
+        return hashlib.blake2b(data.encode("utf-8")).hexdigest()
+
+    def _resolve_steps(self) -> List[StepSpec]:
         self._check_old_yaml_format()
         self._check_infinite_flows(self.flow_config)
 
@@ -559,7 +823,10 @@ class FlowCoordinator:
             specs = self._visit_step(number, step_config, self.project_config)
             steps.extend(specs)
 
-        return sorted(steps, key=attrgetter("step_num"))
+        steps.sort(key=attrgetter("step_num"))
+        if any(any(d is not None for d in step.depends_on) for step in steps):
+            self._get_step_dependencies(steps)  # validates depends_on
+        return steps
 
     def _visit_step(
         self,
@@ -570,6 +837,7 @@ class FlowCoordinator:
         parent_options: Optional[dict] = None,
         parent_ui_options: Optional[dict] = None,
         from_flow: Optional[str] = None,
+        parent_depends_on: Tuple[Optional[Tuple[str, ...]], ...] = (),
     ) -> List[StepSpec]:
         """
         for each step (as defined in the flow YAML), _visit_step is called with only
@@ -584,6 +852,7 @@ class FlowCoordinator:
         :param parent_options: used when called recursively for nested steps, options from parent flow
         :param parent_ui_options: used when called recursively for nested steps, UI options from parent flow
         :param from_flow: used when called recursively for nested steps, name of parent flow
+        :param parent_depends_on: used when called recursively for nested steps, depends_on of parent flows
         :return: List[StepSpec] a list of all resolved steps including/under the one passed in
         """
         step_number = StepVersion(str(number))
@@ -599,6 +868,13 @@ class FlowCoordinator:
         # in core/utils/cleanup_old_flow_step_replace_syntax()
         assert step_config.keys() != {"task", "flow"}
 
+        depends_on = step_config.get("depends_on")
+        if depends_on is not None:
+            if not isinstance(depends_on, list):
+                depends_on = [depends_on]
+            depends_on = tuple(str(number) for number in depends_on)
+        depends_on = parent_depends_on + (depends_on,)
+
         # Skips
         # - either in YAML (with the None string)
         # - or by providing a skip list to the FlowRunner at initialization.
@@ -616,6 +892,7 @@ class FlowCoordinator:
                     project_config=project_config,
                     from_flow=from_flow,
                     skip=True,  # someday we could use different vals for why skipped
+                    depends_on=depends_on,
                 )
             )
             return visited_steps
@@ -667,6 +944,7 @@ class FlowCoordinator:
                     allow_failure=step_config.get("ignore_failure", False),
                     from_flow=from_flow,
                     when=step_config.get("when"),
+                    depends_on=depends_on,
                 )
             )
             return visited_steps
@@ -694,6 +972,7 @@ class FlowCoordinator:
                     parent_options=step_options,
                     parent_ui_options=step_ui_options,
                     from_flow=path,
+                    parent_depends_on=depends_on,
                 )
         return visited_steps
 
@@ -763,6 +1042,19 @@ class FlowCoordinator:
         raise NameError(f"Path not found: {path}")
 
 
+class StepLogFilter(logging.Filter):
+    """Labels the log messages of a step run in parallel with other steps."""
+
+    def __init__(self, label: str):
+        super().__init__()
+        self.label = label
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.msg:
+            record.msg = f"[{self.label}] {record.msg}"
+        return True
+
+
 class PreflightFlowCoordinator(FlowCoordinator):
     """Coordinates running preflight checks instead of the actual flow steps."""
 
@@ -786,12 +1078,14 @@ class PreflightFlowCoordinator(FlowCoordinator):
         self.preflight_results = defaultdict(list)
         # Expose for test access
         self._task_caches = {self.project_config: TaskCache(self, self.project_config)}
+        # Checks don't change the org, so its properties are fetched only once.
+        self._org_config_cache = OrgConfigCache(org_config)
         try:
             # flow-level checks
             jinja2_context = {
                 "tasks": self._task_caches[self.project_config],
                 "project_config": self.project_config,
-                "org_config": self.org_config,
+                "org_config": self._org_config_cache,
             }
             for check in self.flow_config.checks or []:
                 result = self.evaluate_check(check, jinja2_context)
@@ -820,7 +1114,7 @@ class PreflightFlowCoordinator(FlowCoordinator):
         self, check: dict, jinja2_context: Dict[str, Any]
     ) -> Optional[dict]:
         self.logger.info(f"Evaluating check: {check['when']}")
-        expr = jinja2_env.compile_expression(check["when"])
+        expr = compile_expression(check["when"])
         value = bool(expr(**jinja2_context))
         self.logger.info(f"Check result: {value}")
         if value:
@@ -883,3 +1177,54 @@ class CachedTaskRunner:
 
         self.cache.results[cache_key] = result
         return result.return_values
+
+
+class OrgConfigCache:
+    """Provides access to an org config and caches its properties.
+
+    Like TaskCache, this is intended for use in a jinja2 expression context,
+    so that expressions such as `org_config.installed_packages` or
+    `org_config.has_minimum_package_version(...)` in many `when` clauses
+    and checks query the org only once. Properties are fetched only when
+    an expression uses them.
+    """
+
+    org_config: OrgConfig
+    values: Dict[str, Any]
+
+    def __init__(self, org_config: OrgConfig):
+        self.org_config = org_config
+        self.values = {}
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self.values[name]
+        except KeyError:
+            pass
+        value = getattr(self.org_config, name)
+        if inspect.ismethod(value):
+            value = CachedOrgMethod(value)
+        self.values[name] = value
+        return value
+
+    def reset(self):
+        """Forget cached values after the org may have changed."""
+        self.values.clear()
+
+
+class CachedOrgMethod:
+    """Calls an org config method and caches the result for each set of arguments"""
+
+    def __init__(self, method: Callable[..., Any]):
+        self.method = method
+        self.results = {}
+
+    def __call__(self, *args, **kwargs) -> Any:
+        cache_key = (args, tuple(sorted(kwargs.items())))
+        try:
+            if cache_key in self.results:
+                return self.results[cache_key]
+        except TypeError:  # unhashable arguments
+            return self.method(*args, **kwargs)
+        result = self.results[cache_key] = self.method(*args, **kwargs)
+        return result
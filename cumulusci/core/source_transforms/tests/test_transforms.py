@@ -919,6 +919,71 @@ def test_xpath_replace_with_exp(task_context):
     zip_assert(builder, modified_zip_content)
 
 
+def test_find_replace_globs(task_context):
+    zip_content = {
+        Path("classes") / "Foo.cls": "System.debug('blah');",
+        Path("classes") / "Foo.cls-meta.xml": "<root>blah</root>",
+    }
+    patterns = [{"find": "bl", "replace": "ye", "globs": ["*.cls"]}]
+    builder = create_builder(task_context, zip_content, patterns)
+
+    modified_zip_content = {
+        Path("classes") / "Foo.cls": "System.debug('yeah');",
+        Path("classes") / "Foo.cls-meta.xml": "<root>blah</root>",
+    }
+    zip_assert(builder, modified_zip_content)
+
+
+def test_find_replace__unmatched_xml_not_rewritten(task_context):
+    zip_content = {
+        Path("Foo.xml"): "<?xml version='1.0'?><root><bl/></root>",
+        Path("Bar.xml"): '<?xml version="1.0"?><root><a/></root>',
+    }
+    patterns = [{"find": "bl", "replace": "ye"}, {"xpath": "/root/b", "replace": "x"}]
+    builder = create_builder(task_context, zip_content, patterns)
+
+    zip_assert(builder, zip_content)
+
+
+def test_find_replace__entity_escaped_xml(task_context):
+    zip_content = {
+        Path("Foo.xml"): "<root><b>R&amp;D</b></root>",
+    }
+    patterns = [{"find": "R&D", "replace": "Research"}]
+    builder = create_builder(task_context, zip_content, patterns)
+
+    modified_zip_content = {
+        Path("Foo.xml"): "<root><b>Research</b></root>",
+    }
+    zip_assert(builder, modified_zip_content)
+
+
+def test_find_replace_id__queried_once():
+    context = mock.Mock()
+    result = {"totalSize": 1, "records": [{"Id": "00D"}]}
+    context.org_config.salesforce_client.query.return_value = result
+    patterns = [
+        {
+            "find": "00Y",
+            "replace_record_id_query": "SELECT Id FROM Account WHERE name='Initech Corp.'",
+        },
+    ]
+    zip_content = {
+        Path("classes") / "Foo.cls": "System.debug('00Y');",
+        Path("classes") / "Bar.cls": "System.debug('00Y' + '00Y');",
+    }
+    create_builder(context, zip_content, patterns)
+
+    context.org_config.salesforce_client.query.assert_called_once()
+    context.logger.info.assert_any_call("Applied find-and-replace patterns:")
+    (message,) = [
+        c.args[0]
+        for c in context.logger.info.call_args_list
+        if c.args[0].startswith("    find")
+    ]
+    assert message.startswith("    find '00Y': 3 matches in 2 files (")
+
+
 def test_source_transform_parsing():
     tl = SourceTransformList.parse_obj(
         [
@@ -1,9 +1,11 @@
 import abc
+import fnmatch
 import functools
 import io
 import os
 import re
 import shutil
+import time
 import typing as T
 import zipfile
 from pathlib import Path
@@ -17,16 +19,18 @@ from cumulusci.core.enums import StrEnum
 from cumulusci.core.exceptions import CumulusCIException, TaskOptionsError
 from cumulusci.tasks.metadata.package import RemoveSourceComponents
 from cumulusci.utils import (
+    META_XML_CLEAN_DIRS,
     cd,
     inject_namespace,
     strip_namespace,
     temporary_dir,
     tokenize_namespace,
-    zip_clean_metaxml,
 )
-from cumulusci.utils.xml import metadata_tree
+from cumulusci.utils.xml import metadata_tree, remove_xml_element_string
 from cumulusci.utils.ziputils import process_text_in_zipfile
 
+FileProcessor = T.Callable[[str, str], T.Tuple[str, str]]
+
 
 class SourceTransform(abc.ABC):
     """Abstract base class for a transformation applied to a Metadata API deployment package"""
@@ -42,6 +46,41 @@ class SourceTransform(abc.ABC):
         ...
 
 
+class TextFileTransform(SourceTransform):
+    """Abstract base class for a transform that rewrites each text file on its own.
+
+    Subclasses return functions which accept a filename and content as text
+    and return a (possibly modified) filename and content. Consecutive
+    transforms of this kind can then be applied in a single pass over the
+    package, with each file decoded and compressed only once."""
+
+    @abc.abstractmethod
+    def get_file_processors(self, context: TaskContext) -> T.List[FileProcessor]:
+        ...
+
+    def finish(self, context: TaskContext):
+        """Called once the file processors have been applied to every file."""
+
+    def process(self, zf: ZipFile, context: TaskContext) -> ZipFile:
+        processors = self.get_file_processors(context)
+        if not processors:
+            return zf
+        zf = process_text_in_zipfile(zf, chain_file_processors(processors))
+        self.finish(context)
+        return zf
+
+
+def chain_file_processors(processors: T.List[FileProcessor]) -> FileProcessor:
+    """Combine file processors into one which applies each of them in order."""
+
+    def process_file(name: str, content: str) -> T.Tuple[str, str]:
+        for processor in processors:
+            name, content = processor(name, content)
+        return name, content
+
+    return process_file
+
+
 class SourceTransformSpec(BaseModel):
     transform: str
     options: T.Optional[dict]
@@ -100,7 +139,7 @@ class NamespaceInjectionOptions(BaseModel):
     namespaced_org: bool = False
 
 
-class NamespaceInjectionTransform(SourceTransform):
+class NamespaceInjectionTransform(TextFileTransform):
     """Source transform that applies namespace injection, stripping, and tokenization."""
 
     options_model = NamespaceInjectionOptions
@@ -111,18 +150,18 @@ class NamespaceInjectionTransform(SourceTransform):
     def __init__(self, options: NamespaceInjectionOptions):
         self.options = options
 
-    def process(self, zf: ZipFile, context: TaskContext) -> ZipFile:
+    def get_file_processors(self, context: TaskContext) -> T.List[FileProcessor]:
+        processors = []
         if self.options.namespace_tokenize:
             context.logger.info(
                 f"Tokenizing namespace prefix {self.options.namespace_tokenize}__"
             )
-            zf = process_text_in_zipfile(
-                zf,
+            processors.append(
                 functools.partial(
                     tokenize_namespace,
                     namespace=self.options.namespace_tokenize,
                     logger=context.logger,
-                ),
+                )
             )
         if self.options.namespace_inject:
             managed = not self.options.unmanaged
@@ -135,28 +174,26 @@ class NamespaceInjectionTransform(SourceTransform):
                 context.logger.info(
                     "Stripping namespace tokens from metadata for unmanaged deployment"
                 )
-            zf = process_text_in_zipfile(
-                zf,
+            processors.append(
                 functools.partial(
                     inject_namespace,
                     namespace=self.options.namespace_inject,
                     managed=managed,
                     namespaced_org=self.options.namespaced_org,
                     logger=context.logger,
-                ),
+                )
             )
         if self.options.namespace_strip:
             context.logger.info("Stripping namespace tokens from metadata")
-            zf = process_text_in_zipfile(
-                zf,
+            processors.append(
                 functools.partial(
                     strip_namespace,
                     namespace=self.options.namespace_strip,
                     logger=context.logger,
-                ),
+                )
             )
 
-        return zf
+        return processors
 
 
 class RemoveFeatureParametersTransform(SourceTransform):
@@ -198,18 +235,26 @@ class RemoveFeatureParametersTransform(SourceTransform):
         return zip_dest
 
 
-class CleanMetaXMLTransform(SourceTransform):
+class CleanMetaXMLTransform(TextFileTransform):
     """Source transform that cleans *-meta.xml files of references to specific package versions."""
 
     options_model = None
 
     identifier = "clean_meta_xml"
 
-    def process(self, zf: ZipFile, context: TaskContext) -> ZipFile:
+    def get_file_processors(self, context: TaskContext) -> T.List[FileProcessor]:
         context.logger.info(
             "Cleaning meta.xml files of packageVersion elements for deploy"
         )
-        return zip_clean_metaxml(zf)
+        return [self._clean_file]
+
+    @staticmethod
+    def _clean_file(name: str, content: str) -> T.Tuple[str, str]:
+        if name.startswith(META_XML_CLEAN_DIRS) and name.endswith("-meta.xml"):
+            content = remove_xml_element_string(
+                "packageVersions", content.encode("utf-8")
+            ).decode("utf-8")
+        return name, content
 
 
 class BundleStaticResourcesOptions(BaseModel):
@@ -293,6 +338,7 @@ class FindReplaceBaseSpec(BaseModel, abc.ABC):
     find: T.Optional[str]
     xpath: T.Optional[str]
     paths: T.Optional[T.List[Path]] = None
+    globs: T.Optional[T.List[str]] = None
 
     @root_validator
     def validate_find_xpath(cls, values):
@@ -404,7 +450,146 @@ class FindReplaceTransformOptions(BaseModel):
     ]
 
 
-class FindReplaceTransform(SourceTransform):
+def transform_xpath(expression: str) -> str:
+    """Rewrite an XPath so that each step matches elements by local name,
+    to handle XML with a default namespace."""
+    predicate_pattern = re.compile(r"\[.*?\]")
+    parts = expression.split("/")
+    transformed_parts = []
+
+    for part in parts:
+        if part:
+            predicates = predicate_pattern.findall(part)
+            tag = predicate_pattern.sub("", part)
+            transformed_part = '/*[local-name()="' + tag + '"]'
+            for predicate in predicates:
+                transformed_part += predicate
+            transformed_parts.append(transformed_part)
+    transformed_expression = "".join(transformed_parts)
+
+    return transformed_expression
+
+
+def _looks_like_xml(content: str) -> bool:
+    return content.lstrip("\ufeff \t\r\n").startswith("<")
+
+
+class CompiledFindReplaceSpec:
+    """A find-and-replace pattern prepared once to be applied to many files.
+
+    The xpath is compiled up front, files are filtered by path before their
+    content is examined, and XML is only parsed when the content could
+    contain a match. The replacement is looked up the first time it is
+    needed. Matches and the time spent are counted for reporting."""
+
+    def __init__(self, spec: FindReplaceBaseSpec, context: TaskContext):
+        self.spec = spec
+        self.context = context
+        self.paths = set(spec.paths or ())
+        self.glob_re = (
+            re.compile("|".join(fnmatch.translate(glob) for glob in spec.globs))
+            if spec.globs
+            else None
+        )
+        self.xpath = None
+        self.xpath_tag = None
+        if spec.xpath:
+            try:
+                self.xpath = ET.XPath(transform_xpath(spec.xpath))
+            except ET.XPathError as e:
+                raise ET.XPathError(
+                    f"An exception of type {type(e).__name__} occurred: {e} \nKindly check the xpath given"
+                )
+            # Files which never mention the last step's tag cannot match
+            tag = re.sub(r"\[.*?\]", "", spec.xpath.rstrip("/").split("/")[-1])
+            if re.fullmatch(r"[A-Za-z_][\w.-]*", tag):
+                self.xpath_tag = tag
+        self._replacement = None
+        self.matches = 0
+        self.files = 0
+        self.seconds = 0.0
+
+    @property
+    def replacement(self) -> str:
+        if self._replacement is None:
+            self._replacement = self.spec.get_replace_string(self.context)
+        return self._replacement
+
+    def applies_to(self, filename: str) -> bool:
+        if self.paths and self.paths.isdisjoint(Path(filename).parents):
+            return False
+        if self.glob_re and not self.glob_re.match(filename):
+            return False
+        return True
+
+    def apply(self, content: str) -> str:
+        start = time.perf_counter()
+        try:
+            return self._apply(content)
+        finally:
+            self.seconds += time.perf_counter() - start
+
+    def _count(self, matches: int):
+        if matches:
+            self.matches += matches
+            self.files += 1
+
+    def _apply(self, content: str) -> str:
+        find = self.spec.find
+        if find:
+            if not _looks_like_xml(content):
+                self._count(content.count(find))
+                return content.replace(find, self.replacement)
+            # Entity references can spell out a match that the raw text lacks
+            if find not in content and "&" not in content:
+                return content
+        elif self.xpath_tag and self.xpath_tag not in content:
+            return content
+
+        try:
+            root = ET.fromstring(content.encode("utf-8"))
+        except ET.XMLSyntaxError:
+            if find:
+                self._count(content.count(find))
+                return content.replace(find, self.replacement)
+            return content
+
+        # If find, we do not want to modify the tags in xml file, only the content
+        matches = 0
+        if find:
+            for element in root.iter():
+                if element.text and find in element.text:
+                    matches += element.text.count(find)
+                    element.text = element.text.replace(find, self.replacement)
+        # Modify the elements given by xpath
+        else:
+            try:
+                elements = self.xpath(root)
+            except ET.XPathError as e:
+                raise ET.XPathError(
+                    f"An exception of type {type(e).__name__} occurred: {e} \nKindly check the xpath given"
+                )
+            for element in elements:
+                element.text = self.replacement
+            matches = len(elements)
+        if not matches:
+            return content
+        self._count(matches)
+
+        # Add xml declaration back to file, if it initally had xml declaration
+        has_xml_declaration = content.strip().startswith("<?xml")
+        return ET.tostring(
+            root, encoding="utf-8", xml_declaration=has_xml_declaration
+        ).decode("utf-8")
+
+    def describe(self) -> str:
+        pattern = (
+            f"find {self.spec.find!r}" if self.spec.find else f"xpath {self.spec.xpath}"
+        )
+        return f"{pattern}: {self.matches} matches in {self.files} files ({self.seconds:.2f}s)"
+
+
+class FindReplaceTransform(TextFileTransform):
     """Source transform that applies one or more find-and-replace patterns."""
 
     options_model = FindReplaceTransformOptions
@@ -414,77 +599,26 @@ class FindReplaceTransform(SourceTransform):
 
     def __init__(self, options: FindReplaceTransformOptions):
         self.options = options
+        self.compiled_specs: T.List[CompiledFindReplaceSpec] = []
 
-    def process(self, zf: ZipFile, context: TaskContext) -> ZipFile:
-        # To handle xpath with namespaces, without
-        def transform_xpath(expression):
-            predicate_pattern = re.compile(r"\[.*?\]")
-            parts = expression.split("/")
-            transformed_parts = []
-
-            for part in parts:
-                if part:
-                    predicates = predicate_pattern.findall(part)
-                    tag = predicate_pattern.sub("", part)
-                    transformed_part = '/*[local-name()="' + tag + '"]'
-                    for predicate in predicates:
-                        transformed_part += predicate
-                    transformed_parts.append(transformed_part)
-            transformed_expression = "".join(transformed_parts)
-
-            return transformed_expression
+    def get_file_processors(self, context: TaskContext) -> T.List[FileProcessor]:
+        specs = [
+            CompiledFindReplaceSpec(spec, context) for spec in self.options.patterns
+        ]
+        self.compiled_specs = specs
 
         def process_file(filename: str, content: str) -> T.Tuple[str, str]:
-            path = Path(filename)
-            for spec in self.options.patterns:
-                if not spec.paths or any(
-                    parent in path.parents for parent in spec.paths
-                ):
-                    try:
-                        # See if the content is an xml file
-                        content_bytes = content.encode("utf-8")
-                        root = ET.fromstring(content_bytes)
-
-                        # See if content has an xml declaration
-                        has_xml_declaration = content.strip().startswith("<?xml")
-
-                        # If find, we do not want to modify the tags in xml file, only the content
-                        if spec.find:
-                            stack = [root]
-                            while stack:
-                                element = stack.pop()
-                                if element.text and spec.find in element.text:
-                                    element.text = element.text.replace(
-                                        spec.find, spec.get_replace_string(context)
-                                    )
-                                stack.extend(element)
-                        # Modify the element given by xpath
-                        elif spec.xpath:
-                            transformed_xpath = transform_xpath(spec.xpath)
-                            elements_to_replace = root.xpath(transformed_xpath)
-                            for element in elements_to_replace:
-                                element.text = spec.get_replace_string(context)
-
-                        # Add xml declaration back to file, if it initally had xml declaration
-                        content = ET.tostring(
-                            root, encoding="utf-8", xml_declaration=has_xml_declaration
-                        ).decode("utf-8")
-
-                    except ET.XMLSyntaxError:
-                        if spec.find:
-                            content = content.replace(
-                                spec.find, spec.get_replace_string(context)
-                            )
-                        else:
-                            continue
-                    except ET.XPathError as e:
-                        raise ET.XPathError(
-                            f"An exception of type {type(e).__name__} occurred: {e} \nKindly check the xpath given"
-                        )
-
+            for spec in specs:
+                if spec.applies_to(filename):
+                    content = spec.apply(content)
             return (filename, content)
 
-        return process_text_in_zipfile(zf, process_file)
+        return [process_file]
+
+    def finish(self, context: TaskContext):
+        context.logger.info("Applied find-and-replace patterns:")
+        for spec in self.compiled_specs:
+            context.logger.info(f"    {spec.describe()}")
 
 
 class StripUnwantedComponentsOptions(BaseModel):
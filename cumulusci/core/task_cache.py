@@ -0,0 +1,157 @@
+"""Memoization of task results across flow runs.
+
+A task opts in with the `cache` key of its configuration in cumulusci.yml.
+Its result and return values are saved in the org's cache directory,
+keyed by the task class, its options, the org id and (unless disabled)
+a hash of the project's metadata source. Later runs of the task with the same
+key reuse them instead of running the task, until they are older than the
+policy's `ttl` or the org is changed by a deployment or package install.
+
+Only tasks whose sole effect is their result and return values should be
+cached, because a cached task does not run at all.
+"""
+import hashlib
+import json
+import os
+import time
+import typing as T
+from pathlib import Path
+
+from cumulusci.core.exceptions import ConfigError
+
+TASK_CACHE_NAME = "task_results"
+DEFAULT_TASK_CACHE_TTL = 24 * 60 * 60
+
+# Metadata which isn't part of the package, relative to the repo root
+UNPACKAGED_PATH = "unpackaged"
+
+
+class TaskCachePolicy(T.NamedTuple):
+    # Seconds for which a result is reused
+    ttl: float = DEFAULT_TASK_CACHE_TTL
+    # Whether a change to the project's source invalidates results
+    source: bool = True
+
+
+def get_cache_policy(task_config: dict) -> T.Optional[TaskCachePolicy]:
+    """The cache policy from the `cache` key of a task's configuration:
+    True for the defaults, or a dict with `ttl` and `source` keys."""
+    policy = task_config.get("cache")
+    if not policy:
+        return None
+    if policy is True:
+        return TaskCachePolicy()
+    if not isinstance(policy, dict) or set(policy) - set(TaskCachePolicy._fields):
+        raise ConfigError(
+            f"Invalid task cache policy {policy!r}. "
+            "Use True, or a mapping with the keys ttl and source."
+        )
+    try:
+        ttl = float(policy.get("ttl", DEFAULT_TASK_CACHE_TTL))
+    except (TypeError, ValueError):
+        raise ConfigError(f"Invalid task cache ttl {policy['ttl']!r}")
+    return TaskCachePolicy(ttl=ttl, source=bool(policy.get("source", True)))
+
+
+def source_paths(project_config) -> T.List[Path]:
+    """The project's package source and unpackaged metadata directories."""
+    repo_root = Path(project_config.repo_root)
+    paths = [repo_root / UNPACKAGED_PATH]
+    try:
+        paths.insert(0, project_config.default_package_path)
+    except OSError:
+        pass  # an sfdx project without its sfdx-project.json
+    return paths
+
+
+def source_tree_hash(project_config) -> str:
+    """A hash of the path and contents of each file in the project's
+    metadata source, which changes whenever one is added, removed or edited.
+
+    Files elsewhere in the repository, including those that tasks write,
+    don't affect it."""
+    h = hashlib.blake2b()
+    if not project_config.repo_root:
+        return h.hexdigest()
+    for source in source_paths(project_config):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                try:
+                    with open(path, "rb") as f:
+                        digest = hashlib.file_digest(f, "blake2b").hexdigest()
+                except OSError:
+                    continue
+                relpath = os.path.relpath(path, project_config.repo_root)
+                h.update(f"{relpath}\0{digest}\0".encode())
+    return h.hexdigest()
+
+
+def task_cache_key(
+    task_class: type,
+    options: dict,
+    org_id: T.Optional[str],
+    source_hash: T.Optional[str] = None,
+) -> str:
+    h = hashlib.blake2b()
+    for part in (
+        f"{task_class.__module__}.{task_class.__qualname__}",
+        json.dumps(options, sort_keys=True, default=repr),
+        str(org_id),
+        str(source_hash),
+    ):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class TaskResultCache:
+    """Task results saved to a directory, one JSON file per cache key."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str, ttl: float) -> T.Optional[dict]:
+        """The saved entry for `key`, with the task's `result`,
+        `return_values` and the `timestamp` when it ran, if it
+        is younger than `ttl` seconds."""
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # An unreadable entry is as good as a missing one
+            path.unlink(missing_ok=True)
+            return None
+        if time.time() - entry["timestamp"] > ttl:
+            path.unlink(missing_ok=True)
+            return None
+        return entry
+
+    def set(self, key: str, result: T.Any, return_values: T.Any) -> bool:
+        """Save a task's result. Returns False if JSON can't represent it
+        exactly."""
+        entry = {
+            "timestamp": time.time(),
+            "result": result,
+            "return_values": return_values,
+        }
+        try:
+            data = json.dumps(entry)
+        except (TypeError, ValueError):
+            return False
+        # e.g. tuples and non-string keys don't survive a round trip
+        if json.loads(data) != entry:
+            return False
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._path(key).write_text(data, encoding="utf-8")
+        return True
+
+    def clear(self):
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
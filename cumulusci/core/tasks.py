@@ -31,6 +31,9 @@ from cumulusci.utils.metaprogramming import classproperty
 from cumulusci.utils.options import CCIOptions, ReadOnlyOptions
 
 CURRENT_TASK = threading.local()
+# Flow steps run in parallel may share an org, so its credentials are
+# refreshed and saved by one task at a time.
+CREDENTIALS_LOCK = threading.Lock()
 
 PROJECT_CONFIG_RE = re.compile(r"\$project_config.(\w+)")
 CAPTURE_TASK_OUTPUT = os.environ.get("CAPTURE_TASK_OUTPUT")
@@ -57,6 +60,9 @@ class BaseTask:
     task_docs: str = ""
     Options: Optional[Type[CCIOptions]] = None
     salesforce_task: bool = False  # Does this task require a salesforce org?
+    # Tasks which don't use the process's working directory or output streams
+    # can run alongside other flow steps. Other tasks run on their own.
+    thread_safe: bool = False
     name: Optional[str]
     stepnum: Optional[StepVersion]
     result: Any
@@ -210,16 +216,19 @@ class BaseTask:
                 "Use org default <name> to set a default org "
                 "or pass the org name with the --org option"
             )
-        self._update_credentials()
+        with CREDENTIALS_LOCK:
+            self._update_credentials()
         self._init_task()
 
         with stacked_task(self):
             self.working_path = os.getcwd()
             path = self.project_config.repo_root if self.project_config else None
+            if self.thread_safe:
+                path = None
             with cd(path):
                 with (
                     redirect_output_to_logger(self.logger)
-                    if CAPTURE_TASK_OUTPUT
+                    if CAPTURE_TASK_OUTPUT and not self.thread_safe
                     else nullcontext()
                 ):
                     self._log_begin()
@@ -327,6 +336,16 @@ class BaseSalesforceTask(BaseTask):
 
     name = "BaseSalesforceTask"
     salesforce_task = True
+    # Tasks which insert, update or delete records discard the record counts
+    # cached for the org when they finish.
+    changes_records: bool = False
+
+    def __call__(self) -> dict:
+        try:
+            return super().__call__()
+        finally:
+            if self.changes_records and self.org_config:
+                self.org_config.records_changed()
 
     def _get_client_name(self):
         try:
@@ -351,8 +370,7 @@ class BaseSalesforceTask(BaseTask):
         """Perform namespace injection and ensure that we can successfully access all of the selected objects."""
 
         global_describe = {
-            entry["name"]: entry
-            for entry in self.org_config.salesforce_client.describe()["sobjects"]
+            entry["name"]: entry for entry in self.org_config.describe()["sobjects"]
         }
 
         # Namespace injection
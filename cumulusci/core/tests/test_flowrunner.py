@@ -1,4 +1,5 @@
 import logging
+import threading
 from pathlib import Path
 from unittest import mock
 
@@ -16,15 +17,19 @@ from cumulusci.core.exceptions import (
     TaskNotFoundError,
 )
 from cumulusci.core.flowrunner import (
+    FlowCallback,
     FlowCoordinator,
     PreflightFlowCoordinator,
     StepSpec,
     TaskRunner,
+    compile_expression,
 )
 from cumulusci.core.source.local_folder import LocalFolderSource
+from cumulusci.core.task_cache import TaskResultCache
 from cumulusci.core.tasks import BaseTask
 from cumulusci.core.tests.utils import MockLoggingHandler
 from cumulusci.tests.util import create_project_config
+from cumulusci.utils import temporary_dir
 from cumulusci.utils.yaml.cumulusci_yml import LocalFolderSourceModel
 
 ORG_ID = "00D000000000001"
@@ -52,6 +57,35 @@ class _TaskRaisesException(BaseTask):
         raise self.options["exception"](self.options["message"])
 
 
+class _TaskChangesDirectory(BaseTask):
+    changed = threading.Event()
+    read = threading.Event()
+
+    def _run_task(self):
+        with temporary_dir():
+            Path("marker").touch()
+            self.changed.set()
+            # Give a step running alongside this one the chance to look
+            self.read.wait(timeout=0.2)
+            return Path("marker").exists()
+
+
+class _TaskReadsRelativePath(BaseTask):
+    def _run_task(self):
+        _TaskChangesDirectory.changed.wait(timeout=0.2)
+        exists = Path("cumulusci.yml").exists()
+        _TaskChangesDirectory.read.set()
+        return exists
+
+
+class _ThreadSafeTask(BaseTask):
+    thread_safe = True
+    barrier = threading.Barrier(2, timeout=5)
+
+    def _run_task(self):
+        return self.barrier.wait()
+
+
 class _SfdcTask(BaseTask):
     salesforce_task = True
 
@@ -399,6 +433,43 @@ class TestSimpleTestFlowCoordinator(AbstractFlowCoordinatorTest):
         flow_config = self.project_config.get_flow("grandparent_flow")
         FlowCoordinator(self.project_config, flow_config, name="grandparent_flow")
 
+    def test_init__cached_plan(self):
+        flow_config = FlowConfig(
+            {"steps": {1: {"task": "name_response", "options": {"response": "one"}}}}
+        )
+        # Config built in memory is never cached
+        flow = FlowCoordinator(self.project_config, flow_config)
+        assert not flow.plan_cached
+        flow = FlowCoordinator(self.project_config, flow_config)
+        assert not flow.plan_cached
+
+        self.project_config.config_digest = "digest"
+        flow = FlowCoordinator(self.project_config, flow_config, name="f")
+        assert not flow.plan_cached
+        flow.steps[0].task_config["options"]["response"] = "changed"
+
+        flow = FlowCoordinator(self.project_config, flow_config, name="f")
+        assert flow.plan_cached
+        assert flow.steps[0].task_config["options"]["response"] == "one"
+
+        flow = FlowCoordinator(
+            self.project_config, flow_config, name="f", skip=["name_response"]
+        )
+        assert not flow.plan_cached
+        assert flow.steps[0].skip
+
+        flow = FlowCoordinator(
+            self.project_config, flow_config, name="f", options={"x": {"y": 1}}
+        )
+        assert not flow.plan_cached
+
+        # Loading changed configuration files changes the digest
+        self.project_config.config["tasks"]["name_response"]["options"] = {"x": 1}
+        self.project_config.config_digest = "changed"
+        flow = FlowCoordinator(self.project_config, flow_config, name="f")
+        assert not flow.plan_cached
+        assert flow.steps[0].task_config["options"] == {"x": 1, "response": "one"}
+
     def test_from_steps(self):
         steps = [StepSpec("1", "test", {}, _TaskReturnsStuff, None)]
         flow = FlowCoordinator.from_steps(self.project_config, steps)
@@ -415,6 +486,7 @@ class TestSimpleTestFlowCoordinator(AbstractFlowCoordinatorTest):
         flow.run(self.org_config)
 
         assert any(flow_config.description in s for s in self.flow_log["info"])
+        assert any("Resolved steps in" in s for s in self.flow_log["info"])
         assert {"name": "supername"} == flow.results[0].return_values
 
     def test_run__nested_flow(self):
@@ -569,6 +641,214 @@ class TestSimpleTestFlowCoordinator(AbstractFlowCoordinatorTest):
         assert 2 == len(flow.results)
         assert flow.results[0].exception is not None
 
+    def test_get_step_dependencies(self):
+        self.project_config.config["flows"]["test"] = {
+            "steps": {
+                1: {"task": "pass_name"},
+                2: {"task": "pass_name", "depends_on": [1]},
+                3: {"task": "pass_name", "depends_on": []},
+                4: {"flow": "nested_flow_2", "depends_on": 3},
+                5: {"task": "pass_name"},
+            }
+        }
+        flow_config = self.project_config.get_flow("test")
+        flow = FlowCoordinator(self.project_config, flow_config)
+
+        assert [str(step.step_num) for step in flow.steps] == [
+            "1",
+            "2",
+            "3",
+            "4/1",
+            "4/2/1",
+            "5",
+        ]
+        assert flow._get_step_dependencies(flow.steps) == [
+            set(),
+            {0},
+            set(),
+            {2},
+            {2, 3},
+            {0, 1, 2, 3, 4},
+        ]
+
+    def test_init__bad_depends_on(self):
+        flow_config = FlowConfig(
+            {
+                "steps": {
+                    1: {"task": "pass_name", "depends_on": [2]},
+                    2: {"task": "pass_name"},
+                }
+            }
+        )
+        with pytest.raises(FlowConfigError, match="Step 1 depends on step 2"):
+            FlowCoordinator(self.project_config, flow_config)
+
+    def test_run__parallel_steps(self):
+        flow_config = FlowConfig(
+            {
+                "description": "Run steps in parallel",
+                "steps": {
+                    1: {"task": "pass_name", "depends_on": []},
+                    2: {"task": "name_response", "options": {"response": "two"}},
+                    3: {
+                        "task": "name_response",
+                        "options": {"response": "^^pass_name.name"},
+                        "depends_on": [1],
+                    },
+                },
+            }
+        )
+        flow = FlowCoordinator(self.project_config, flow_config)
+        flow.run(self.org_config)
+
+        assert [str(result.step_num) for result in flow.results] == ["1", "2", "3"]
+        assert flow.results[2].result == "supername"
+        assert "[3:name_response] Running task: name_response" in self.flow_log["info"]
+
+    def test_run__parallel_steps_fail(self):
+        flow_config = FlowConfig(
+            {
+                "steps": {
+                    1: {"task": "raise_exception", "depends_on": []},
+                    2: {"task": "pass_name", "depends_on": [1]},
+                },
+            }
+        )
+        flow = FlowCoordinator(self.project_config, flow_config)
+        with pytest.raises(Exception, match="Test raised exception as expected"):
+            flow.run(self.org_config)
+        assert [result.task_name for result in flow.results] == ["raise_exception"]
+
+    def test_run__parallel_steps_share_working_directory(self):
+        self.project_config.config["tasks"].update(
+            {
+                "changes_directory": {
+                    "class_path": "cumulusci.core.tests.test_flowrunner._TaskChangesDirectory"
+                },
+                "reads_relative_path": {
+                    "class_path": "cumulusci.core.tests.test_flowrunner._TaskReadsRelativePath"
+                },
+            }
+        )
+        flow_config = FlowConfig(
+            {
+                "steps": {
+                    1: {"task": "changes_directory", "depends_on": []},
+                    2: {"task": "reads_relative_path", "depends_on": []},
+                },
+            }
+        )
+        _TaskChangesDirectory.changed.clear()
+        _TaskChangesDirectory.read.clear()
+        flow = FlowCoordinator(self.project_config, flow_config)
+        flow.run(self.org_config)
+
+        assert [result.result for result in flow.results] == [True, True]
+
+    def test_run__parallel_steps_thread_safe(self):
+        self.project_config.config["tasks"]["thread_safe"] = {
+            "class_path": "cumulusci.core.tests.test_flowrunner._ThreadSafeTask"
+        }
+        flow_config = FlowConfig(
+            {
+                "steps": {
+                    1: {"task": "thread_safe", "depends_on": []},
+                    2: {"task": "thread_safe", "depends_on": []},
+                },
+            }
+        )
+        flow = FlowCoordinator(self.project_config, flow_config)
+        flow.run(self.org_config)
+
+        # Each step waited for the other at the barrier, so they ran together
+        assert {result.result for result in flow.results} == {0, 1}
+
+    def test_run__parallel_steps_serialize_callbacks(self):
+        self.project_config.config["tasks"]["thread_safe"] = {
+            "class_path": "cumulusci.core.tests.test_flowrunner._ThreadSafeTask"
+        }
+
+        class Callbacks(FlowCallback):
+            active = 0
+            most_active = 0
+            other_entered = threading.Event()
+
+            def _enter(self):
+                self.active += 1
+                self.most_active = max(self.most_active, self.active)
+                if self.active > 1:
+                    self.other_entered.set()
+                # Give the other step the chance to call a callback too
+                self.other_entered.wait(timeout=0.2)
+                self.active -= 1
+
+            def pre_task(self, step):
+                self._enter()
+
+            def post_task(self, step, result):
+                self._enter()
+
+        flow_config = FlowConfig(
+            {
+                "steps": {
+                    1: {"task": "thread_safe", "depends_on": []},
+                    2: {"task": "thread_safe", "depends_on": []},
+                },
+            }
+        )
+        callbacks = Callbacks()
+        flow = FlowCoordinator(self.project_config, flow_config, callbacks=callbacks)
+        flow.run(self.org_config)
+
+        assert {result.result for result in flow.results} == {0, 1}
+        assert callbacks.most_active == 1
+
+    def test_run__cached_task(self, tmp_path):
+        self.project_config.config["tasks"]["cached_name"] = {
+            "class_path": "cumulusci.core.tests.test_flowrunner._TaskReturnsStuff",
+            "cache": {"ttl": 60, "source": False},
+        }
+        flow_config = FlowConfig({"steps": {1: {"task": "cached_name"}}})
+        with mock.patch.object(
+            OrgConfig, "task_result_cache", return_value=TaskResultCache(tmp_path)
+        ), mock.patch.object(
+            _TaskReturnsStuff,
+            "_run_task",
+            autospec=True,
+            side_effect=_TaskReturnsStuff._run_task,
+        ) as run_task:
+            for _ in range(2):
+                flow = FlowCoordinator(self.project_config, flow_config)
+                flow.run(self.org_config)
+                assert flow.results[0].return_values == {"name": "supername"}
+
+        run_task.assert_called_once()
+        assert any(
+            "Using the result of cached_name" in s for s in self.flow_log["info"]
+        )
+
+    def test_run__when_caches_org_config(self):
+        flow_config = FlowConfig(
+            {
+                "steps": {
+                    1: {"task": "pass_name", "when": "org_config.installed_packages"},
+                    2: {"task": "pass_name", "when": "org_config.installed_packages"},
+                    3: {"task": "pass_name"},
+                    4: {"task": "pass_name", "when": "org_config.installed_packages"},
+                }
+            }
+        )
+        flow = FlowCoordinator(self.project_config, flow_config)
+        with mock.patch.object(
+            OrgConfig, "installed_packages", new_callable=mock.PropertyMock
+        ) as installed_packages:
+            installed_packages.return_value = {}
+            flow.run(self.org_config)
+
+        assert [str(result.step_num) for result in flow.results] == ["3"]
+        # Fetched again after step 3 ran
+        assert installed_packages.call_count == 2
+
     def test_run__no_steps(self):
         """A flow with no tasks will have no results."""
         flow_config = FlowConfig({"description": "Run no tasks", "steps": {}})
@@ -690,6 +970,36 @@ class TestPreflightFlowCoordinatorTest(AbstractFlowCoordinatorTest):
             "1/1": [{"status": "error", "message": None}],
         } == flow.preflight_results
 
+    def test_run__checks_cache_org_config(self):
+        check = "org_config.has_minimum_package_version('foo', '1.0')"
+        flow_config = FlowConfig(
+            {
+                "checks": [{"when": check, "action": "error"}],
+                "steps": {
+                    1: {
+                        "task": "log",
+                        "checks": [{"when": f"not {check}", "action": "error"}],
+                    }
+                },
+            }
+        )
+        flow = PreflightFlowCoordinator(self.project_config, flow_config)
+        with mock.patch.object(
+            OrgConfig, "has_minimum_package_version", autospec=True
+        ) as has_minimum_package_version:
+            has_minimum_package_version.return_value = True
+            flow.run(self.org_config)
+
+        assert {None: [{"status": "error", "message": None}]} == flow.preflight_results
+        has_minimum_package_version.assert_called_once_with(
+            self.org_config, "foo", "1.0"
+        )
+
+
+def test_compile_expression__cached():
+    assert compile_expression("1 + 1") is compile_expression("1 + 1")
+    assert compile_expression("1 + 1")() == 2
+
 
 @pytest.fixture
 def task_runner():
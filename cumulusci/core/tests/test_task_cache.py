@@ -0,0 +1,127 @@
+import os
+import threading
+from unittest import mock
+
+import pytest
+
+from cumulusci.core.exceptions import ConfigError
+from cumulusci.core.task_cache import (
+    DEFAULT_TASK_CACHE_TTL,
+    TaskCachePolicy,
+    TaskResultCache,
+    get_cache_policy,
+    source_tree_hash,
+    task_cache_key,
+)
+
+
+class TestGetCachePolicy:
+    def test_not_cached(self):
+        assert get_cache_policy({}) is None
+        assert get_cache_policy({"cache": False}) is None
+
+    def test_defaults(self):
+        assert get_cache_policy({"cache": True}) == TaskCachePolicy(
+            ttl=DEFAULT_TASK_CACHE_TTL, source=True
+        )
+
+    def test_mapping(self):
+        assert get_cache_policy(
+            {"cache": {"ttl": "60", "source": False}}
+        ) == TaskCachePolicy(ttl=60, source=False)
+
+    @pytest.mark.parametrize(
+        "policy", ["yes", {"expires": 60}, {"ttl": "an hour"}, {"ttl": None}]
+    )
+    def test_invalid(self, policy):
+        with pytest.raises(ConfigError):
+            get_cache_policy({"cache": policy})
+
+
+def test_source_tree_hash(tmp_path):
+    project_config = mock.Mock(
+        repo_root=str(tmp_path), default_package_path=tmp_path / "src"
+    )
+    (tmp_path / "src").mkdir()
+    source = tmp_path / "src" / "Foo.cls"
+    source.write_text("public class Foo {}")
+    (tmp_path / "unpackaged" / "pre").mkdir(parents=True)
+    unpackaged = tmp_path / "unpackaged" / "pre" / "package.xml"
+    unpackaged.write_text("<Package/>")
+    original = source_tree_hash(project_config)
+
+    # Files outside the metadata source, such as task output, don't count
+    (tmp_path / "test_results.json").write_text("[]")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "index").write_text("changed")
+    assert source_tree_hash(project_config) == original
+
+    # Neither do modification times
+    os.utime(source, (0, 0))
+    assert source_tree_hash(project_config) == original
+
+    source.write_text("public class Foo { }")
+    changed = source_tree_hash(project_config)
+    assert changed != original
+
+    unpackaged.write_text("<Package></Package>")
+    assert source_tree_hash(project_config) != changed
+
+
+def test_source_tree_hash__no_sfdx_project(tmp_path):
+    project_config = mock.Mock(repo_root=str(tmp_path))
+    type(project_config).default_package_path = mock.PropertyMock(
+        side_effect=FileNotFoundError
+    )
+    (tmp_path / "unpackaged").mkdir()
+    (tmp_path / "unpackaged" / "package.xml").write_text("<Package/>")
+    assert source_tree_hash(project_config) != source_tree_hash(
+        mock.Mock(repo_root=None)
+    )
+
+
+def test_task_cache_key():
+    key = task_cache_key(TaskResultCache, {"a": 1, "b": 2}, "00D", "abc")
+    assert key == task_cache_key(TaskResultCache, {"b": 2, "a": 1}, "00D", "abc")
+    assert key != task_cache_key(TaskResultCache, {"a": 1, "b": 2}, "00E", "abc")
+    assert key != task_cache_key(TaskResultCache, {"a": 1, "b": 2}, "00D", "def")
+
+
+class TestTaskResultCache:
+    def test_get_set(self, tmp_path):
+        cache = TaskResultCache(tmp_path / "results")
+        assert cache.get("key", 60) is None
+
+        assert cache.set("key", "result", {"name": "value"})
+        entry = cache.get("key", 60)
+        assert entry["result"] == "result"
+        assert entry["return_values"] == {"name": "value"}
+
+    def test_get__expired(self, tmp_path):
+        cache = TaskResultCache(tmp_path)
+        cache.set("key", "result", {})
+        with mock.patch("time.time", return_value=entry_time(cache) + 61):
+            assert cache.get("key", 60) is None
+        assert not os.listdir(tmp_path)
+
+    def test_get__corrupt(self, tmp_path):
+        cache = TaskResultCache(tmp_path)
+        (tmp_path / "key.json").write_text("not JSON")
+        assert cache.get("key", 60) is None
+        assert not os.listdir(tmp_path)
+
+    @pytest.mark.parametrize("result", [threading.Lock(), ("a", "b"), {1: "one"}])
+    def test_set__not_json(self, tmp_path, result):
+        cache = TaskResultCache(tmp_path)
+        assert not cache.set("key", result, {})
+        assert cache.get("key", 60) is None
+
+    def test_clear(self, tmp_path):
+        cache = TaskResultCache(tmp_path)
+        cache.set("key", "result", {})
+        cache.clear()
+        assert cache.get("key", 60) is None
+
+
+def entry_time(cache):
+    return cache.get("key", DEFAULT_TASK_CACHE_TTL)["timestamp"]
@@ -0,0 +1,230 @@
+import asyncio
+import logging
+import re
+import threading
+import time
+import typing as T
+from collections.abc import Mapping
+
+from requests.adapters import HTTPAdapter
+
+from cumulusci.core.exceptions import ConfigError
+from cumulusci.salesforce_api.exceptions import ApiLimitExceeded
+
+LIMIT_INFO_HEADER = "Sforce-Limit-Info"
+API_USAGE_RE = re.compile(r"(?<![\w-])api-usage=(\d+)/(\d+)")
+
+logger = logging.getLogger(__name__)
+
+
+class ApiUsage(T.NamedTuple):
+    """Org-wide consumption of the daily API request allocation"""
+
+    used: int
+    limit: int
+
+    @property
+    def remaining(self) -> int:
+        return max(self.limit - self.used, 0)
+
+    @property
+    def fraction(self) -> float:
+        return self.used / self.limit if self.limit else 0.0
+
+
+def parse_limit_info(header: T.Optional[str]) -> T.Optional[ApiUsage]:
+    """Parse a Sforce-Limit-Info header like `api-usage=25/15000`"""
+    match = API_USAGE_RE.search(header or "")
+    if match:
+        return ApiUsage(int(match.group(1)), int(match.group(2)))
+
+
+def _parse_fraction(api_limits: Mapping, name: str) -> T.Optional[float]:
+    value = api_limits.get(name)
+    if value is None:
+        return None
+    try:
+        fraction = float(value)
+    except (TypeError, ValueError):
+        fraction = None
+    if fraction is None or not 0 < fraction <= 1:
+        raise ConfigError(
+            f"project__api_limits__{name} must be a fraction between 0 and 1, not {value}"
+        )
+    return fraction
+
+
+class ApiLimitGovernor:
+    """Tracks an org's API consumption and keeps CumulusCI within a budget.
+
+    Every Salesforce REST response reports org-wide usage in the
+    Sforce-Limit-Info header. The governor records it from the connections
+    it is installed on. Once usage crosses the `budget` (a fraction of the
+    org's daily allocation), each request waits before it is sent, longer
+    the closer usage gets to the `ceiling`. Usage at or past the `ceiling`
+    raises ApiLimitExceeded from `check()`, which callers make in their own
+    thread before they send requests. This leaves headroom for other users
+    of a shared org.
+    """
+
+    warning_threshold = 0.8
+    max_throttle_delay = 10.0
+
+    def __init__(
+        self, budget: T.Optional[float] = None, ceiling: T.Optional[float] = None
+    ):
+        self.budget = budget
+        self.ceiling = ceiling
+        self.requests_made = 0
+        self.throttled_seconds = 0.0
+        self.usage: T.Optional[ApiUsage] = None
+        self._warned = False
+        self._lock = threading.Lock()
+
+    def configure(self, api_limits: T.Optional[Mapping]):
+        """Apply a project's `api_limits` settings."""
+        if api_limits is None:
+            api_limits = {}
+        if not isinstance(api_limits, Mapping):
+            raise ConfigError("project__api_limits must be a mapping")
+        self.budget = _parse_fraction(api_limits, "budget")
+        self.ceiling = _parse_fraction(api_limits, "ceiling")
+
+    @property
+    def configured(self) -> bool:
+        return self.budget is not None or self.ceiling is not None
+
+    def install(self, session, raise_at_ceiling: bool = True, **adapter_kwargs):
+        """Throttle and record every request sent through a requests Session.
+
+        Requests sent from worker threads (such as a FuturesSession's)
+        should not raise, so those callers pass `raise_at_ceiling=False`
+        and call `check()` themselves before they submit requests."""
+        adapter = GovernedHTTPAdapter(
+            self, raise_at_ceiling=raise_at_ceiling, **adapter_kwargs
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+    def record_response(self, response):
+        """Record the usage reported by a response"""
+        self.record_headers(response.headers)
+
+    def record_headers(self, headers: T.Mapping[str, str]):
+        usage = parse_limit_info(headers.get(LIMIT_INFO_HEADER))
+        with self._lock:
+            self.requests_made += 1
+            if usage:
+                self.usage = usage
+        self._warn()
+
+    def count_request(self):
+        """Count a request whose response doesn't report usage"""
+        with self._lock:
+            self.requests_made += 1
+
+    def record_limits(self, limits: dict):
+        """Record usage from a response of the REST `limits` resource"""
+        daily = limits.get("DailyApiRequests")
+        if daily:
+            with self._lock:
+                self.usage = ApiUsage(daily["Max"] - daily["Remaining"], daily["Max"])
+        self._warn()
+
+    def refresh(self, sf):
+        """Fetch current usage from the org's `limits` resource"""
+        self.record_limits(sf.restful("limits/"))
+        return self.usage
+
+    def delay(self) -> float:
+        """How long to wait before the next request, given the latest usage"""
+        usage = self.usage
+        if self.budget is None or not usage or not usage.limit:
+            return 0.0
+        if usage.fraction < self.budget:
+            return 0.0
+        top = self.ceiling or 1.0
+        overage = (
+            (usage.fraction - self.budget) / (top - self.budget)
+            if top > self.budget
+            else 1.0
+        )
+        return self.max_throttle_delay * min(max(overage, 0.1), 1.0)
+
+    def throttle(self):
+        """Wait before sending a request while usage is over budget."""
+        delay = self.delay()
+        if delay:
+            logger.debug(f"API usage is over budget; waiting {delay:.1f}s")
+            time.sleep(delay)
+            with self._lock:
+                self.throttled_seconds += delay
+
+    async def async_throttle(self):
+        """Like throttle(), but waits without blocking an event loop."""
+        delay = self.delay()
+        if delay:
+            logger.debug(f"API usage is over budget; waiting {delay:.1f}s")
+            await asyncio.sleep(delay)
+            with self._lock:
+                self.throttled_seconds += delay
+
+    def check(self):
+        """Raise ApiLimitExceeded if the org's usage has reached the ceiling"""
+        usage = self.usage
+        if self.ceiling is None or not usage or not usage.limit:
+            return
+        if usage.fraction >= self.ceiling:
+            raise ApiLimitExceeded(
+                f"The org has used {usage.used} of {usage.limit} daily API requests, "
+                f"which reaches the configured ceiling of {self.ceiling:.0%}."
+            )
+
+    def _warn(self):
+        usage = self.usage
+        if not usage or not usage.limit or self._warned:
+            return
+        if usage.fraction >= self.warning_threshold:
+            self._warned = True
+            logger.warning(
+                f"The org has used {usage.used} of {usage.limit} daily API requests."
+            )
+
+    def as_dict(self) -> dict:
+        usage = self.usage
+        return {
+            "requests_made": self.requests_made,
+            "api_usage": usage.used if usage else None,
+            "api_limit": usage.limit if usage else None,
+            "budget": self.budget,
+            "ceiling": self.ceiling,
+            "throttled_seconds": round(self.throttled_seconds, 1),
+        }
+
+
+class GovernedHTTPAdapter(HTTPAdapter):
+    """A transport adapter that throttles requests and records API usage."""
+
+    def __init__(
+        self, governor: ApiLimitGovernor, *args, raise_at_ceiling: bool = True, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.governor = governor
+        self.raise_at_ceiling = raise_at_ceiling
+
+    def send(self, request, *args, **kwargs):
+        if self.raise_at_ceiling:
+            self.governor.check()
+        self.governor.throttle()
+        response = super().send(request, *args, **kwargs)
+        self.governor.record_response(response)
+        return response
+
+
+def governor_for_session(session) -> T.Optional[ApiLimitGovernor]:
+    """The governor installed on a requests Session, if any"""
+    adapters = getattr(session, "adapters", None)
+    if isinstance(adapters, dict):
+        for adapter in adapters.values():
+            if isinstance(adapter, GovernedHTTPAdapter):
+                return adapter.governor
@@ -0,0 +1,100 @@
+import hashlib
+import json
+import time
+import typing as T
+
+# Metadata types whose components are directories of files, all of which are deployed together
+BUNDLE_DIRS = ("aura", "experiences", "lwc", "waveTemplates")
+
+
+def deploy_hash(package_hash: str, api_version: str, transforms: T.Any = None) -> str:
+    """Identify a deployment by its package contents, API version and transforms."""
+    h = hashlib.blake2b()
+    for part in (package_hash, str(api_version), repr(transforms)):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class DeployLedger:
+    """Successful deployments to an org saved to a JSON file, keyed by source path.
+
+    Only the most recent deployment from each path is kept, so a package is
+    unchanged if its hash matches the entry for its path."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def _load(self) -> dict:
+        if not self.path.exists():
+            return {}
+        try:
+            with self.path.open("r") as f:
+                data = json.load(f)
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save(self, data: dict):
+        with self.path.open("w") as f:
+            json.dump(data, f, indent=2)
+
+    def get(self, key: str) -> T.Optional[dict]:
+        return self._load().get(key)
+
+    def is_unchanged(self, key: str, package_hash: str, org_id: str) -> bool:
+        "Was `package_hash` the last package deployed from `key` to this org?"
+        entry = self.get(key)
+        return bool(
+            entry and entry["hash"] == package_hash and entry.get("org_id") == org_id
+        )
+
+    def record(self, key: str, package_hash: str, org_id: str, **extra):
+        data = self._load()
+        data[key] = {
+            "hash": package_hash,
+            "org_id": org_id,
+            "timestamp": time.time(),
+            **extra,
+        }
+        self._save(data)
+
+    def forget(self, key: str):
+        data = self._load()
+        if data.pop(key, None) is not None:
+            self._save(data)
+
+
+def component_key(name: str) -> str:
+    """The component a package member belongs to, so that members which
+    must be deployed together (a file and its -meta.xml, or the files
+    of a bundle) have the same key."""
+    parts = name.split("/")
+    if parts[0] in BUNDLE_DIRS and len(parts) > 2:
+        return "/".join(parts[:2])
+    if name.endswith("-meta.xml"):
+        return name[: -len("-meta.xml")]
+    return name
+
+
+def delta_members(
+    files: T.Dict[str, str], previous_files: T.Dict[str, str]
+) -> T.Tuple[T.Set[str], T.Set[str]]:
+    """Select the package members to deploy given the hashes of each member
+    now and at the last deployment.
+
+    Returns the members of every added or changed component, along with
+    the -meta.xml of any folder that contains them, and the members which
+    have been removed since the last deployment."""
+    changed = {
+        component_key(name)
+        for name, file_hash in files.items()
+        if name != "package.xml" and previous_files.get(name) != file_hash
+    }
+    members = {name for name in files if component_key(name) in changed}
+    for name in list(members):
+        folder = name.rsplit("/", 1)[0]
+        if folder.count("/") and f"{folder}-meta.xml" in files:
+            members.add(f"{folder}-meta.xml")
+    removed = set(previous_files) - set(files)
+    return members, removed
@@ -0,0 +1,59 @@
+import os
+import threading
+import time
+import typing as T
+
+DEFAULT_DESCRIBE_TTL = 3600
+
+
+def describe_cache_ttl() -> float:
+    """TTL in seconds from CUMULUSCI_DESCRIBE_CACHE_TTL. 0 disables caching."""
+    ttl = os.environ.get("CUMULUSCI_DESCRIBE_CACHE_TTL")
+    try:
+        return float(ttl) if ttl is not None else DEFAULT_DESCRIBE_TTL
+    except ValueError:
+        return DEFAULT_DESCRIBE_TTL
+
+
+class DescribeCache:
+    """In-memory cache of describe responses for a single org.
+
+    Keys should include the org id and API version so that responses are
+    never shared between orgs or API versions. Entries expire after `ttl`
+    seconds and are dropped wholesale by `invalidate()`, which callers use
+    after anything that can change the org's schema (deploys, installs).
+
+    Cached values are shared between callers and must not be modified.
+    """
+
+    def __init__(self, ttl: T.Optional[float] = None, clock=time.monotonic):
+        self.ttl = describe_cache_ttl() if ttl is None else ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: T.Dict[tuple, T.Tuple[float, T.Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, fetch: T.Callable[[], T.Any]):
+        """Return the cached value for `key`, calling `fetch` to populate it
+        if it is missing or expired. Exceptions from `fetch` are not cached."""
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = fetch()
+        if self.ttl > 0:
+            with self._lock:
+                self._entries[key] = (now + self.ttl, value)
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
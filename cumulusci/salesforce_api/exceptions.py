@@ -21,3 +21,9 @@ class MissingOAuthError(CumulusCIException):
 
 class MissingOrgCredentialsError(CumulusCIException):
     pass
+
+
+class ApiLimitExceeded(CumulusCIFailure):
+    """Raise when an org's API usage exceeds the configured budget"""
+
+    pass
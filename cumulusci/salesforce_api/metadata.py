@@ -7,9 +7,7 @@ based on mrbelvedere/mpinstaller/mdapi.py
 #   - add docstrings
 #   - look at https://github.com/rholder/retrying
 
-import base64
 import http.client
-import io
 import re
 import time
 from collections import defaultdict
@@ -28,6 +26,13 @@ from cumulusci.salesforce_api.exceptions import (
     MetadataComponentFailure,
     MetadataParseError,
 )
+from cumulusci.salesforce_api.polling import DEPLOY_PROGRESS_FIELDS, PollingPolicy
+from cumulusci.salesforce_api.streaming import (
+    build_body,
+    extract_base64_element,
+    file_contains,
+    spool_response,
+)
 from cumulusci.utils import parse_api_datetime, zip_subfolder
 
 # If pyOpenSSL is installed, make sure it's not used for requests
@@ -40,6 +45,7 @@ else:
     pyopenssl.extract_from_urllib3()
 
 INVALID_CROSS_REF_ERROR = "INVALID_CROSS_REFERENCE_KEY: No package named"
+PACKAGE_ZIP_PLACEHOLDER = "###PACKAGE_ZIP###"
 
 retry_policy = Retry(backoff_factor=0.3)
 
@@ -52,12 +58,17 @@ class BaseMetadataApiCall(object):
     soap_action_start = None
     soap_action_status = None
     soap_action_result = None
+    # Stream the result response to a file instead of reading it into memory
+    stream_result = False
 
     def __init__(self, task, api_version=None):
         # the cumulusci context object contains logger, oauth, ID, secret, etc
         self.task = task
         self.status = None
         self.check_num = 1
+        self.polling = PollingPolicy()
+        self.state_detail = None
+        self.next_check_interval = None
         self.api_version = (
             api_version
             if api_version
@@ -67,15 +78,18 @@ class BaseMetadataApiCall(object):
     def __call__(self):
         self.task.logger.info("Pending")
         response = self._get_response()
-        if self.status != "Failed":
-            try:
-                return self._process_response(response)
-            except Exception as e:
-                raise MetadataParseError(
-                    f"Could not process MDAPI response: {str(e)}", response=response
-                )
-        else:
-            raise MetadataApiError(response.text, response)
+        # Streamed responses hold their connection until they are closed
+        with response:
+            if self.status != "Failed":
+                try:
+                    return self._process_response(response)
+                except Exception as e:
+                    raise MetadataParseError(
+                        f"Could not process MDAPI response: {str(e)}",
+                        response=response,
+                    )
+            else:
+                raise MetadataApiError(response.text, response)
 
     def _build_endpoint_url(self):
         org_id = self.task.org_config.org_id
@@ -102,33 +116,64 @@ class BaseMetadataApiCall(object):
             "SOAPAction": action,
         }
 
-    def _call_mdapi(self, headers, envelope, refresh=None):
+    def _call_mdapi(self, headers, envelope, refresh=None, stream=False):
         # Insert the session id
         session_id = self.task.org_config.access_token
         auth_envelope = envelope.replace("###SESSION_ID###", session_id)
         session = requests.Session()
         http_adapter = HTTPAdapter(max_retries=retry_policy)
         session.mount("https://", http_adapter)
-        response = session.post(
-            self._build_endpoint_url(),
-            headers=headers,
-            data=auth_envelope.encode("utf-8"),
-        )
+        body = self._encode_envelope(auth_envelope)
+        try:
+            response = session.post(
+                self._build_endpoint_url(),
+                headers=headers,
+                data=body,
+                stream=stream,
+            )
+        finally:
+            # Large bodies are built in a temporary file
+            if hasattr(body, "close"):
+                body.close()
+        # SOAP faults are returned with an error status, so a successful
+        # streamed response is left for the caller to read and close.
+        if stream and response.status_code == http.client.OK:
+            return response
         faultcode = parseString(response.content).getElementsByTagName("faultcode")
         # refresh = False can be passed to prevent a loop if refresh fails
         if refresh is None:
             refresh = True
         if faultcode:
-            return self._handle_soap_error(headers, envelope, refresh, response)
+            return self._handle_soap_error(
+                headers, envelope, refresh, response, stream=stream
+            )
         return response
 
+    def _encode_envelope(self, envelope):
+        return envelope.encode("utf-8")
+
+    def _get_zipfile(self, body):
+        """Decode the zipFile element of a retrieve result in chunks,
+        returning None if there is none."""
+        zip_fp = extract_base64_element(body, "zipFile")
+        return ZipFile(zip_fp, "r") if zip_fp else None
+
     def _get_element_value(self, dom, tag):
         result = dom.getElementsByTagName(tag)
         if result and result[0].firstChild:
             return result[0].firstChild.nodeValue
 
     def _get_check_interval(self):
-        return self.check_interval * ((self.check_num // 3) + 1)
+        return self.polling.next_interval(
+            self.check_interval * ((self.check_num // 3) + 1), self.check_interval
+        )
+
+    def _record_progress(self, resp_xml):
+        """Record progress reported by a status response with the polling policy.
+
+        Returns a description of the progress, or None if the response
+        does not report any."""
+        return None
 
     def _get_response(self):
         if not self.soap_envelope_start:
@@ -150,10 +195,12 @@ class BaseMetadataApiCall(object):
                 envelope = self._build_envelope_status()
                 headers = self._build_headers(self.soap_action_status, envelope)
                 response = self._call_mdapi(headers, envelope)
+                self.next_check_interval = None
                 response = self._process_response_status(response)
 
                 # start increasing the check interval progressively to handle long pending jobs
-                check_interval = self._get_check_interval()
+                # and wait as long as the status message said
+                check_interval = self.next_check_interval or self._get_check_interval()
                 self.check_num += 1
 
                 time.sleep(check_interval)
@@ -161,12 +208,14 @@ class BaseMetadataApiCall(object):
             if self.soap_envelope_result:
                 envelope = self._build_envelope_result()
                 headers = self._build_headers(self.soap_action_result, envelope)
-                response = self._call_mdapi(headers, envelope)
+                response = self._call_mdapi(
+                    headers, envelope, stream=self.stream_result
+                )
             else:
                 return response
         return response
 
-    def _handle_soap_error(self, headers, envelope, refresh, response):
+    def _handle_soap_error(self, headers, envelope, refresh, response, stream=False):
         resp_xml = parseString(response.content)
         faultcode = resp_xml.getElementsByTagName("faultcode")
         if faultcode:
@@ -186,7 +235,7 @@ class BaseMetadataApiCall(object):
                 self.task.org_config.refresh_oauth_token(
                     self.task.project_config.keychain
                 )
-                return self._call_mdapi(headers, envelope, refresh=False)
+                return self._call_mdapi(headers, envelope, refresh=False, stream=stream)
         # Log the error
         message = f"{faultcode}: {faultstring}"
         self._set_status("Failed", message)
@@ -225,21 +274,30 @@ class BaseMetadataApiCall(object):
                 else:
                     self._set_status("Done")
             else:
-                state_detail = resp_xml.getElementsByTagName("stateDetail")
+                progress = self._record_progress(resp_xml)
+                state_detail = self._get_element_value(resp_xml, "stateDetail")
+                # Check frequently whenever the operation moves to a new
+                # stage, and without progress to predict completion from,
+                # while it is running.
+                if (state_detail and state_detail != self.state_detail) or (
+                    not progress and (state_detail or self.status == "InProgress")
+                ):
+                    self.check_num = 1
+                self.state_detail = state_detail
+                self.next_check_interval = self._get_check_interval()
+                next_check = f"next check in {self.next_check_interval:.3g} seconds"
                 if state_detail:
-                    log = state_detail[0].firstChild.nodeValue
+                    log = state_detail
+                    if progress:
+                        log = f"{log} ({progress}; {next_check})"
+                    self._set_status("InProgress", log)
+                elif self.status == "InProgress" or progress:
+                    log = next_check
+                    if progress:
+                        log = f"{progress}; {log}"
                     self._set_status("InProgress", log)
-                    self.check_num = 1
-                elif self.status == "InProgress":
-                    self.check_num = 1
-                    self._set_status(
-                        "InProgress",
-                        f"next check in {self._get_check_interval()} seconds",
-                    )
                 else:
-                    self._set_status(
-                        "Pending", f"next check in {self._get_check_interval()} seconds"
-                    )
+                    self._set_status("Pending", next_check)
         else:
             # If no done element was in the xml, fail logging the entire SOAP
             # envelope as the log
@@ -267,6 +325,7 @@ class ApiRetrieveUnpackaged(BaseMetadataApiCall):
     soap_action_start = "retrieve"
     soap_action_status = "checkStatus"
     soap_action_result = "checkRetrieveStatus"
+    stream_result = True
 
     def __init__(self, task, package_xml, api_version):
         super(ApiRetrieveUnpackaged, self).__init__(task, api_version)
@@ -287,11 +346,8 @@ class ApiRetrieveUnpackaged(BaseMetadataApiCall):
 
     def _process_response(self, response):
         # Parse the metadata zip file from the response
-        zipstr = parseString(response.content).getElementsByTagName("zipFile")
-        if zipstr:
-            zipstr = zipstr[0].firstChild.nodeValue
-        zipstringio = io.BytesIO(base64.b64decode(zipstr))
-        zipfile = ZipFile(zipstringio, "r")
+        with spool_response(response) as body:
+            zipfile = self._get_zipfile(body)
         zipfile = zip_subfolder(zipfile, "unpackaged")
         return zipfile
 
@@ -304,6 +360,7 @@ class ApiRetrieveInstalledPackages(BaseMetadataApiCall):
     soap_action_start = "retrieve"
     soap_action_status = "checkStatus"
     soap_action_result = "checkRetrieveStatus"
+    stream_result = True
 
     def __init__(self, task, api_version=None):
         super(ApiRetrieveInstalledPackages, self).__init__(task, api_version)
@@ -311,13 +368,10 @@ class ApiRetrieveInstalledPackages(BaseMetadataApiCall):
 
     def _process_response(self, response):
         # Parse the metadata zip file from the response
-        zipstr = parseString(response.content).getElementsByTagName("zipFile")
-        if zipstr:
-            zipstr = zipstr[0].firstChild.nodeValue
-        else:
+        with spool_response(response) as body:
+            zipfile = self._get_zipfile(body)
+        if zipfile is None:
             return self.packages
-        zipstringio = io.BytesIO(base64.b64decode(zipstr))
-        zipfile = ZipFile(zipstringio, "r")
         # Loop through all files in the zip skipping anything other than
         # InstalledPackages
         for path in zipfile.namelist():
@@ -341,6 +395,7 @@ class ApiRetrievePackaged(BaseMetadataApiCall):
     soap_action_start = "retrieve"
     soap_action_status = "checkStatus"
     soap_action_result = "checkRetrieveStatus"
+    stream_result = True
 
     def __init__(self, task, package_name, api_version):
         super(ApiRetrievePackaged, self).__init__(task, api_version)
@@ -352,18 +407,14 @@ class ApiRetrievePackaged(BaseMetadataApiCall):
         )
 
     def _process_response(self, response):
-        if INVALID_CROSS_REF_ERROR in response.content.decode("utf-8"):
-            raise CumulusCIException(
-                f"No package found in org with name: {self.package_name}"
-            )
+        with spool_response(response) as body:
+            if file_contains(body, INVALID_CROSS_REF_ERROR.encode("utf-8")):
+                raise CumulusCIException(
+                    f"No package found in org with name: {self.package_name}"
+                )
 
-        # Parse the metadata zip file from the response
-        zipstr = parseString(response.content).getElementsByTagName("zipFile")
-        if zipstr:
-            zipstr = zipstr[0].firstChild.nodeValue
-        zipstringio = io.BytesIO(base64.b64decode(zipstr))
-        zipfile = ZipFile(zipstringio, "r")
-        return zipfile
+            # Parse the metadata zip file from the response
+            return self._get_zipfile(body)
 
 
 class ApiDeploy(BaseMetadataApiCall):
@@ -413,8 +464,9 @@ class ApiDeploy(BaseMetadataApiCall):
             if self.test_level == "RunSpecifiedTests"
             else ""
         )
+        # The package is copied into the request body by _encode_envelope
         return self.soap_envelope_start.format(
-            package_zip=self.package_zip,
+            package_zip=PACKAGE_ZIP_PLACEHOLDER,
             check_only=self.check_only,
             purge_on_delete=self.purge_on_delete,
             test_level=test_level,
@@ -422,6 +474,9 @@ class ApiDeploy(BaseMetadataApiCall):
             api_version=self.api_version,
         )
 
+    def _encode_envelope(self, envelope):
+        return build_body(envelope, PACKAGE_ZIP_PLACEHOLDER, self.package_zip)
+
     def _process_response(self, response):
         resp_xml = parseString(response.content)
         status = resp_xml.getElementsByTagName("status")
@@ -436,6 +491,8 @@ class ApiDeploy(BaseMetadataApiCall):
         # related to done
         if status in ["Succeeded", "SucceededPartial"]:
             self._set_status("Success", status)
+            if self.check_only != "true":
+                self.task.org_config.org_changed()
         else:
             # If failed, parse out the problem text and raise appropriate exception
             messages = []
@@ -545,6 +602,14 @@ class ApiDeploy(BaseMetadataApiCall):
 
         return self.status
 
+    def _record_progress(self, resp_xml):
+        return self.polling.record_deploy_progress(
+            {
+                field: self._get_element_value(resp_xml, field)
+                for field in DEPLOY_PROGRESS_FIELDS
+            }
+        )
+
     def _get_action(self, created, deleted):
         if created:
             return "Create"
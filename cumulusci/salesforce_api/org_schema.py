@@ -21,11 +21,12 @@ from cumulusci.salesforce_api.org_schema_models import (
     SObject,
 )
 from cumulusci.utils.fileutils import FSResource
-from cumulusci.utils.http.multi_request import (
-    RECOVERABLE_ERRORS,
-    CompositeParallelSalesforce,
+from cumulusci.utils.http.async_request import composite_salesforce_session
+from cumulusci.utils.http.multi_request import RECOVERABLE_ERRORS
+from cumulusci.utils.salesforce.count_sobjects import (
+    RecordCountCache,
+    count_sobjects_fast,
 )
-from cumulusci.utils.salesforce.count_sobjects import count_sobjects
 
 y2k = "Sat, 1 Jan 2000 00:00:01 GMT"
 
@@ -181,6 +182,8 @@ class Schema:
         logger=None,
         *,
         include_counts: bool = False,
+        counts_cache: T.Optional[RecordCountCache] = None,
+        verify_empty: bool = False,
     ) -> T.Union[T.Dict[str, int], T.Dict[str, None]]:
         """Populate a schema cache from the API, using last_modified_date
         to pull down only new schema"""
@@ -219,7 +222,9 @@ class Schema:
 
         self._populate_cache_from_describe(changes)
         if include_counts:
-            results = populate_counts(sf, self, sobj_names, logger)
+            results = populate_counts(
+                sf, self, sobj_names, logger, counts_cache, verify_empty=verify_empty
+            )
         else:
             results = {name: None for name in sobj_names}
         return results
@@ -374,11 +379,19 @@ def get_org_schema(
     with org_config.get_orginfo_cache_dir(Schema.__module__) as directory:
         directory.mkdir(exist_ok=True, parents=True)
         schema_path = directory / "org_schema.db.gz"
+        counts_cache = org_config.record_count_cache()
 
-        if force_recache and schema_path.exists():
-            schema_path.unlink()
+        if force_recache:
+            if schema_path.exists():
+                schema_path.unlink()
+            counts_cache.clear()
 
+        verify_empty = False
         if Filters.populated in filters:
+            # Counts decide which objects are included, so they must be current:
+            # don't use cached counts, and recount objects reported as empty.
+            counts_cache = None
+            verify_empty = True
             filters.add(Filters.queryable)
             filters.add(Filters.retrieveable)
             # experiment with removing this limitation by using limit 1 query instead
@@ -434,6 +447,8 @@ def get_org_schema(
                 patterns_to_ignore,
                 logger,
                 include_counts=include_counts,
+                counts_cache=counts_cache,
+                verify_empty=verify_empty,
             )
 
             if Filters.populated in filters:
@@ -478,9 +493,13 @@ class ZippableTempDb:
         return create_engine(f"sqlite:///{str(self.tempfile)}")
 
 
-def populate_counts(sf, schema, objs_cached, logger) -> T.Dict[str, int]:
+def populate_counts(
+    sf, schema, objs_cached, logger, counts_cache=None, *, verify_empty=False
+) -> T.Dict[str, int]:
     objects_to_count = [objname for objname in objs_cached]
-    counts, transports_errors, salesforce_errors = count_sobjects(sf, objects_to_count)
+    counts, transports_errors, salesforce_errors = count_sobjects_fast(
+        sf, objects_to_count, counts_cache, verify_empty=verify_empty
+    )
     errors = transports_errors + salesforce_errors
     for error in errors[0:10]:
         logger.warning(f"Error counting SObjects: {error}")
@@ -517,7 +536,7 @@ def deep_describe(sf, objs: Dict[str, lm_date], logger) -> Iterable[DescribeUpda
     proto format) and yield each object as a DescribeResponse object."""
 
     logger = logger or getLogger(__name__)
-    with CompositeParallelSalesforce(sf, max_workers=8) as cpsf:
+    with composite_salesforce_session(sf, max_workers=8) as cpsf:
         responses, errors = cpsf.do_composite_requests(
             (
                 {
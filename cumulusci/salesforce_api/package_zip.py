@@ -6,6 +6,8 @@ import pathlib
 import typing as T
 import zipfile
 from base64 import b64encode
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from xml.sax.saxutils import escape
 
 from cumulusci.core.dependencies.utils import TaskContext
@@ -13,12 +15,19 @@ from cumulusci.core.source_transforms.transforms import (
     BundleStaticResourcesOptions,
     BundleStaticResourcesTransform,
     CleanMetaXMLTransform,
+    FileProcessor,
     NamespaceInjectionOptions,
     NamespaceInjectionTransform,
     RemoveFeatureParametersTransform,
     SourceTransform,
+    TextFileTransform,
+    chain_file_processors,
+)
+from cumulusci.utils.ziputils import (
+    compress_zipfile,
+    hash_zipfile_contents,
+    process_text_in_zipfile,
 )
-from cumulusci.utils.ziputils import hash_zipfile_contents
 
 INSTALLED_PACKAGE_PACKAGE_XML = """<?xml version="1.0" encoding="utf-8"?>
 <Package xmlns="http://soap.sforce.com/2006/04/metadata">
@@ -50,15 +59,19 @@ INSTALLED_PACKAGE = """<?xml version="1.0" encoding="UTF-8"?>
 
 DEFAULT_LOGGER = logging.getLogger(__name__)
 
+# Files are read on a small pool; at most this many are read ahead of the
+# file being written, so large packages are not held in memory all at once.
+READ_AHEAD = 32
+
 
 class BasePackageZipBuilder(object):
     def __init__(self):
         self._open_zip()
 
-    def _open_zip(self):
+    def _open_zip(self, compression=zipfile.ZIP_DEFLATED):
         """Start a new, empty zipfile"""
         self.buffer = io.BytesIO()
-        self.zf = zipfile.ZipFile(self.buffer, "w", zipfile.ZIP_DEFLATED)
+        self.zf = zipfile.ZipFile(self.buffer, "w", compression)
 
     def _write_package_xml(self, package_xml):
         self.zf.writestr("package.xml", package_xml)
@@ -105,9 +118,12 @@ class MetadataPackageZipBuilder(BasePackageZipBuilder):
         self.logger = logger or DEFAULT_LOGGER
         self.context = context
         self.zf = zf
+        # Files are stored uncompressed while the package is built and
+        # transformed, and then compressed once at the end of _process.
+        self._needs_compression = self.zf is None
 
         if self.zf is None:
-            self._open_zip()
+            self._open_zip(zipfile.ZIP_STORED)
         if path is not None:
             self._add_files_to_package(path)
         if transforms:
@@ -137,9 +153,23 @@ class MetadataPackageZipBuilder(BasePackageZipBuilder):
         )
 
     def _add_files_to_package(self, path):
-        for file_path in self._find_files_to_package(path):
+        def read_file(file_path):
             relpath = str(file_path.relative_to(path)).replace(os.sep, "/")
-            self.zf.write(file_path, arcname=relpath)
+            return zipfile.ZipInfo.from_file(file_path, relpath), file_path.read_bytes()
+
+        def write_file(future):
+            zinfo, content = future.result()
+            zinfo.compress_type = self.zf.compression
+            self.zf.writestr(zinfo, content)
+
+        pending = deque()
+        with ThreadPoolExecutor() as executor:
+            for file_path in self._find_files_to_package(path):
+                pending.append(executor.submit(read_file, file_path))
+                if len(pending) >= READ_AHEAD:
+                    write_file(pending.popleft())
+            while pending:
+                write_file(pending.popleft())
 
     def _find_files_to_package(self, path):
         """Generator of paths to include in the package.
@@ -201,20 +231,58 @@ class MetadataPackageZipBuilder(BasePackageZipBuilder):
         if self.options.get("package_type") == "Unlocked":
             transforms.append(RemoveFeatureParametersTransform())
 
+        # Consecutive per-file transforms are fused into one pass over the package,
+        # so that each file is decoded and transformed only once.
+        text_transforms: T.List[TextFileTransform] = []
+        for t in transforms:
+            if isinstance(t, TextFileTransform):
+                text_transforms.append(t)
+            else:
+                self._apply_text_transforms(text_transforms)
+                text_transforms = []
+                self._apply(lambda zf: t.process(zf, self.context))
+        self._apply_text_transforms(text_transforms)
+
+        if self._needs_compression:
+            compresslevel = self.options.get("compression_level")
+            if compresslevel is not None:
+                compresslevel = int(compresslevel)
+            self._apply(lambda zf: compress_zipfile(zf, compresslevel), compressed=True)
+
+    def _apply_text_transforms(self, transforms: T.List[TextFileTransform]):
+        file_processors: T.List[FileProcessor] = []
+        for t in transforms:
+            file_processors.extend(t.get_file_processors(self.context))
+        if file_processors:
+            process_file = chain_file_processors(file_processors)
+            self._apply(
+                lambda zf: process_text_in_zipfile(
+                    zf, process_file, compression=zipfile.ZIP_STORED
+                ),
+                compressed=False,
+            )
         for t in transforms:
-            # We have to close the existing zipfile and reopen it before processing;
-            # otherwise we hit a bug in Windows where ZipInfo objects have the wrong path separators.
-            fp = self.zf.fp
-            self.zf.close()
-            self.zf = zipfile.ZipFile(fp, "r")
-            new_zipfile = t.process(self.zf, self.context)
-            if new_zipfile != self.zf:
-                # Ensure that zipfiles are closed (in case they're filesystem resources)
-                try:
-                    self.zf.close()
-                except ValueError:  # Attempt to close a closed ZF (on Windows)
-                    pass
-                self.zf = new_zipfile
+            t.finish(self.context)
+
+    def _apply(
+        self,
+        process: T.Callable[[zipfile.ZipFile], zipfile.ZipFile],
+        compressed: bool = True,
+    ):
+        # We have to close the existing zipfile and reopen it before processing;
+        # otherwise we hit a bug in Windows where ZipInfo objects have the wrong path separators.
+        fp = self.zf.fp
+        self.zf.close()
+        self.zf = zipfile.ZipFile(fp, "r")
+        new_zipfile = process(self.zf)
+        if new_zipfile != self.zf:
+            # Ensure that zipfiles are closed (in case they're filesystem resources)
+            try:
+                self.zf.close()
+            except ValueError:  # Attempt to close a closed ZF (on Windows)
+                pass
+            self.zf = new_zipfile
+            self._needs_compression = not compressed
 
 
 class CreatePackageZipBuilder(BasePackageZipBuilder):
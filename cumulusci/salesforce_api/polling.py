@@ -0,0 +1,123 @@
+import time
+import typing as T
+
+# Never wait longer than this between checks of a Metadata API operation
+MAX_CHECK_INTERVAL = 30
+
+# Counts reported by a DeployResult while a deployment is in progress
+DEPLOY_PROGRESS_FIELDS = (
+    "numberComponentsDeployed",
+    "numberComponentErrors",
+    "numberComponentsTotal",
+    "numberTestsCompleted",
+    "numberTestErrors",
+    "numberTestsTotal",
+)
+
+
+class PollingPolicy:
+    """Decides how long to wait between status checks of a long-running
+    Metadata API operation.
+
+    Callers pass their default wait to `next_interval`, which caps it at
+    `max_interval`. Once the operation reports how much of its work is done
+    (see `record_progress`), the policy estimates throughput and the time
+    remaining, and shortens the wait to about half of that time so that
+    completion is noticed soon after it happens.
+
+    Work of different kinds (such as components and tests) proceeds at
+    different rates, so progress is recorded and estimated for each kind
+    of unit separately.
+    """
+
+    def __init__(self, max_interval: float = MAX_CHECK_INTERVAL, clock=time.monotonic):
+        self.max_interval = max_interval
+        self.clock = clock
+        self._first: T.Dict[str, T.Tuple[float, int]] = {}
+        self._last: T.Dict[str, T.Tuple[float, int, int]] = {}
+
+    def record_progress(self, done: int, total: int, unit: str = "units"):
+        """Record that `done` of `total` units of work are complete."""
+        if total <= 0:
+            return
+        now = self.clock()
+        first = self._first.get(unit)
+        # Measure throughput from when the work started moving
+        if first is None or done <= first[1]:
+            self._first[unit] = (now, done)
+        self._last[unit] = (now, done, total)
+
+    def record_deploy_progress(self, deploy_result: T.Mapping) -> T.Optional[str]:
+        """Record progress from the counts in a DeployResult.
+
+        Returns a description of the progress, or None if it reports none."""
+        counts = {
+            field: int(deploy_result.get(field) or 0)
+            for field in DEPLOY_PROGRESS_FIELDS
+        }
+        components_done = (
+            counts["numberComponentsDeployed"] + counts["numberComponentErrors"]
+        )
+        tests_done = counts["numberTestsCompleted"] + counts["numberTestErrors"]
+        if not counts["numberComponentsTotal"] and not counts["numberTestsTotal"]:
+            return None
+        self.record_progress(
+            components_done, counts["numberComponentsTotal"], "components"
+        )
+        self.record_progress(tests_done, counts["numberTestsTotal"], "tests")
+
+        progress = f"{components_done}/{counts['numberComponentsTotal']} components"
+        if counts["numberTestsTotal"]:
+            progress += f", {tests_done}/{counts['numberTestsTotal']} tests"
+        rate = self.describe_progress()
+        return f"{progress}: {rate}" if rate else progress
+
+    def throughput(self, unit: str = "units") -> T.Optional[float]:
+        """Units of work completed per second since they started moving."""
+        if unit not in self._first or unit not in self._last:
+            return None
+        elapsed = self._last[unit][0] - self._first[unit][0]
+        completed = self._last[unit][1] - self._first[unit][1]
+        if elapsed <= 0 or completed <= 0:
+            return None
+        return completed / elapsed
+
+    @property
+    def eta(self) -> T.Optional[float]:
+        """Estimated seconds until the operation is complete.
+
+        None until the throughput of every kind of unfinished work is known."""
+        if not self._last:
+            return None
+        remaining = 0.0
+        for unit, (_, done, total) in self._last.items():
+            if done >= total:
+                continue
+            throughput = self.throughput(unit)
+            if throughput is None:
+                return None
+            remaining += (total - done) / throughput
+        recorded_at = max(recorded_at for recorded_at, _, _ in self._last.values())
+        return max(remaining - (self.clock() - recorded_at), 0)
+
+    def next_interval(self, interval: float, min_interval: float = 1) -> float:
+        """Seconds to wait before the next check, given the caller's default."""
+        interval = min(interval, self.max_interval)
+        eta = self.eta
+        if eta is not None:
+            interval = min(interval, max(eta / 2, min_interval))
+        return interval
+
+    def describe_progress(self) -> T.Optional[str]:
+        """Summarize the rate of progress and time remaining, if known."""
+        rates = [
+            f"{throughput:.1f} {unit} per second"
+            for unit, throughput in (
+                (unit, self.throughput(unit)) for unit in self._last
+            )
+            if throughput is not None
+        ]
+        eta = self.eta
+        if eta is not None and rates:
+            rates.append(f"about {eta:.0f} seconds remaining")
+        return ", ".join(rates) or None
@@ -13,6 +13,7 @@ from cumulusci.salesforce_api.exceptions import (
     MetadataApiError,
     MetadataComponentFailure,
 )
+from cumulusci.salesforce_api.polling import PollingPolicy
 
 PARENT_DIR_NAME = "metadata"
 
@@ -38,6 +39,7 @@ class RestDeploy:
         self.test_level = test_level
         self.package_zip = package_zip
         self.run_tests = run_tests or []
+        self.polling = PollingPolicy()
 
     def __call__(self):
         self._boundary = str(uuid.uuid4())
@@ -111,8 +113,12 @@ class RestDeploy:
         while True:
             response = requests.get(url, headers=headers)
             response_json = response.json()
+            progress = self.polling.record_deploy_progress(
+                response_json["deployResult"]
+            )
             self.task.logger.info(
                 f"Deployment {response_json['deployResult']['status']}"
+                + (f": {progress}" if progress else "")
             )
 
             if response_json["deployResult"]["status"] not in ["InProgress", "Pending"]:
@@ -126,8 +132,10 @@ class RestDeploy:
                         self.task.logger.error(error_message)
                         error_log += error_message + "\n"
                     raise MetadataComponentFailure(error_log, response)
+                if self.check_only != "true":
+                    self.task.org_config.org_changed()
                 return
-            time.sleep(5)
+            time.sleep(self.polling.next_interval(5))
 
     # Reformat the package zip file to include parent directory
     def _reformat_zip(self, package_zip):
@@ -0,0 +1,278 @@
+"""Retrieve a large package.xml as several smaller retrieves run concurrently.
+
+The members of the package are split into shards of similar size, each of
+which is retrieved with ApiRetrieveUnpackaged, and the resulting zip files
+are merged. Members which Salesforce writes into the same file (such as an
+object and its fields) are kept in the same shard where possible. Types
+whose contents depend on the other components in the retrieve (such as
+profiles) are included in every shard, and files which appear in more than
+one shard are merged element by element.
+"""
+import math
+import re
+import typing as T
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from lxml import etree
+
+from cumulusci.core.exceptions import CumulusCIException
+from cumulusci.salesforce_api.metadata import ApiRetrieveUnpackaged
+from cumulusci.salesforce_api.streaming import spooled_file
+from cumulusci.tasks.metadata.package import metadata_sort_key
+from cumulusci.utils.xml import lxml_parse_string
+from cumulusci.utils.xml.metadata_tree import fromstring, parse_package_xml_types
+
+# The Metadata API retrieves at most this many components in one request
+MAX_RETRIEVE_COMPONENTS = 10000
+
+# Types whose files include permissions or translations for the
+# other components retrieved with them
+CONTEXTUAL_TYPES = ("Profile", "PermissionSet", "Translations")
+
+# Types which Salesforce retrieves into the file of a parent component.
+# The parent is named by the member name up to the first "." (or "-" for
+# CustomObjectTranslation).
+PARENT_TYPES = {
+    "BusinessProcess": "CustomObject",
+    "CompactLayout": "CustomObject",
+    "CustomField": "CustomObject",
+    "CustomObjectTranslation": "CustomObject",
+    "FieldSet": "CustomObject",
+    "Index": "CustomObject",
+    "ListView": "CustomObject",
+    "RecordType": "CustomObject",
+    "SharingReason": "CustomObject",
+    "ValidationRule": "CustomObject",
+    "WebLink": "CustomObject",
+    "WorkflowAlert": "Workflow",
+    "WorkflowFieldUpdate": "Workflow",
+    "WorkflowKnowledgePublish": "Workflow",
+    "WorkflowOutboundMessage": "Workflow",
+    "WorkflowRule": "Workflow",
+    "WorkflowSend": "Workflow",
+    "WorkflowTask": "Workflow",
+    "SharingCriteriaRule": "SharingRules",
+    "SharingGuestRule": "SharingRules",
+    "SharingOwnerRule": "SharingRules",
+    "SharingTerritoryRule": "SharingRules",
+    "AssignmentRule": "AssignmentRules",
+    "AutoResponseRule": "AutoResponseRules",
+    "EscalationRule": "EscalationRules",
+    "MatchingRule": "MatchingRules",
+    "CustomLabel": "CustomLabels",
+}
+# Parent types whose members are all written to a single file
+SINGLE_FILE_TYPES = ("CustomLabels",)
+
+PackageTypes = T.Dict[str, T.List[str]]
+
+
+def parse_package_xml(package_xml: str) -> T.Tuple[PackageTypes, T.Optional[str]]:
+    """Returns the members of each type in a package.xml, and its version."""
+    package = fromstring(package_xml.encode("utf-8"))
+    version = package.find("version")
+    return (
+        parse_package_xml_types("name", package),
+        version.text if version is not None else None,
+    )
+
+
+def render_package_xml(types: PackageTypes, api_version: str) -> str:
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<Package xmlns="http://soap.sforce.com/2006/04/metadata">',
+    ]
+    for name in sorted(types):
+        lines.append("    <types>")
+        for member in sorted(set(types[name]), key=metadata_sort_key):
+            lines.append(f"        <members>{escape(member)}</members>")
+        lines.append(f"        <name>{name}</name>")
+        lines.append("    </types>")
+    lines.append(f"    <version>{api_version}</version>")
+    lines.append("</Package>")
+    return "\n".join(lines) + "\n"
+
+
+def _group_key(mdtype: str, member: str, wildcard_families: T.Set[str]):
+    family = PARENT_TYPES.get(mdtype, mdtype)
+    if family in SINGLE_FILE_TYPES or family in wildcard_families:
+        return (family,)
+    if mdtype in PARENT_TYPES:
+        separator = r"[.-]" if mdtype == "CustomObjectTranslation" else r"\."
+        return (family, re.split(separator, member)[0])
+    return (family, member)
+
+
+def shard_package(
+    types: PackageTypes,
+    shard_count: int = 1,
+    max_components: int = MAX_RETRIEVE_COMPONENTS,
+) -> T.List[PackageTypes]:
+    """Split the members of a package into shards.
+
+    At least `shard_count` shards are made if there are enough groups of
+    members to fill them, and more if needed to keep each shard within
+    `max_components`. Shards are balanced by number of members."""
+    contextual = {name: types[name] for name in CONTEXTUAL_TYPES if types.get(name)}
+    capacity = max_components - sum(len(members) for members in contextual.values())
+    if capacity <= 0:
+        raise CumulusCIException(
+            f"Cannot retrieve {', '.join(contextual)} with other components "
+            f"in shards of at most {max_components} components."
+        )
+
+    # A wildcard for any type in a family of parent and child types
+    # means every member of the family must be retrieved together.
+    wildcard_families = {
+        PARENT_TYPES.get(name, name)
+        for name, members in types.items()
+        if "*" in members and name not in contextual
+    }
+    groups = defaultdict(list)
+    for name, members in types.items():
+        if name in contextual:
+            continue
+        for member in members:
+            groups[_group_key(name, member, wildcard_families)].append((name, member))
+
+    # Groups too large for one shard are split; merging reconciles their files.
+    pieces = []
+    for group in groups.values():
+        pieces.extend(group[i : i + capacity] for i in range(0, len(group), capacity))
+    total = sum(len(piece) for piece in pieces)
+    shard_count = max(
+        1, min(len(pieces), max(shard_count, math.ceil(total / capacity)))
+    )
+
+    shards = [[] for _ in range(shard_count)]
+    loads = [0] * shard_count
+    for piece in sorted(pieces, key=len, reverse=True):
+        i = min(range(len(shards)), key=loads.__getitem__)
+        if loads[i] + len(piece) > capacity:
+            shards.append([])
+            loads.append(0)
+            i = len(shards) - 1
+        shards[i].extend(piece)
+        loads[i] += len(piece)
+
+    result = []
+    for shard in shards:
+        shard_types = defaultdict(list)
+        for name, member in shard:
+            shard_types[name].append(member)
+        shard_types.update(contextual)
+        result.append(dict(shard_types))
+    return result
+
+
+def merge_xml(contents: T.List[bytes]) -> bytes:
+    """Merge metadata XML files retrieved in different shards.
+
+    The root elements' children are combined without duplicates and
+    grouped by tag in alphabetical order, as Salesforce writes them."""
+    roots = [lxml_parse_string(content).getroot() for content in contents]
+    merged = roots[0]
+    seen = set()
+    children = []
+    for root in roots:
+        for child in root:
+            if not isinstance(child.tag, str):
+                continue  # comments
+            child.tail = None
+            key = etree.tostring(child)
+            if key not in seen:
+                seen.add(key)
+                children.append(child)
+    children.sort(key=lambda child: etree.QName(child).localname)
+    for child in list(merged):
+        merged.remove(child)
+    merged.text = "\n    "
+    for child in children:
+        child.tail = "\n    "
+        merged.append(child)
+    if children:
+        children[-1].tail = "\n"
+    return (
+        b'<?xml version="1.0" encoding="UTF-8"?>\n'
+        + etree.tostring(merged, encoding="UTF-8", xml_declaration=False)
+        + b"\n"
+    )
+
+
+def merge_zipfiles(zipfiles: T.List[ZipFile], api_version: str) -> ZipFile:
+    """Merge the zip files retrieved for each shard into one."""
+    locations = defaultdict(list)
+    for zf in zipfiles:
+        for name in zf.namelist():
+            if not name.endswith("/"):
+                locations[name].append(zf)
+
+    merged = ZipFile(spooled_file(), "w", ZIP_DEFLATED)
+    for name, sources in locations.items():
+        if name == "package.xml":
+            types = defaultdict(list)
+            for zf in sources:
+                for mdtype, members in parse_package_xml(zf.read(name).decode("utf-8"))[
+                    0
+                ].items():
+                    types[mdtype].extend(members)
+            merged.writestr(name, render_package_xml(types, api_version))
+            continue
+        contents = [zf.read(name) for zf in sources]
+        if len(set(contents)) > 1:
+            try:
+                contents = [merge_xml(contents)]
+            except etree.XMLSyntaxError:
+                pass  # Not XML; keep the first copy
+        merged.writestr(name, contents[0])
+    return merged
+
+
+class ShardedRetrieveUnpackaged:
+    """Retrieve a package.xml in shards of at most `max_components`
+    components, running up to `concurrency` retrieves at once.
+
+    Can be used in place of ApiRetrieveUnpackaged, which is used for
+    each retrieve unless another `api_class` is given."""
+
+    def __init__(
+        self,
+        task,
+        package_xml: str,
+        api_version: T.Optional[str] = None,
+        concurrency: int = 1,
+        max_components: int = MAX_RETRIEVE_COMPONENTS,
+        api_class=ApiRetrieveUnpackaged,
+    ):
+        self.task = task
+        self.api_class = api_class
+        self.package_xml = package_xml
+        self.concurrency = concurrency
+        self.max_components = max_components
+        self.types, version = parse_package_xml(package_xml)
+        self.api_version = (
+            api_version or version or task.project_config.project__package__api_version
+        )
+
+    def __call__(self) -> ZipFile:
+        shards = shard_package(self.types, self.concurrency, self.max_components)
+        if len(shards) == 1:
+            return self.api_class(self.task, self.package_xml, self.api_version)()
+
+        self.task.logger.info(
+            f"Retrieving {sum(len(m) for m in self.types.values())} components "
+            f"in {len(shards)} shards"
+        )
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            zipfiles = list(executor.map(self._retrieve_shard, shards))
+        merged = merge_zipfiles(zipfiles, self.api_version)
+        for zf in zipfiles:
+            zf.close()
+        return merged
+
+    def _retrieve_shard(self, types: PackageTypes) -> ZipFile:
+        package_xml = render_package_xml(types, self.api_version)
+        return self.api_class(self.task, package_xml, self.api_version)()
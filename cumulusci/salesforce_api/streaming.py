@@ -0,0 +1,122 @@
+"""Streaming base64 for Metadata API payloads.
+
+Zip files are sent and received base64-encoded inside SOAP envelopes.
+Responses are copied to spooled temporary files in chunks and decoded
+as they are parsed, so that large retrieve results are never held in
+memory as a single string.
+
+Deploy packages are only partly streamed: ApiDeploy is given the whole
+package as a base64 string, the interface it shares with RestDeploy and
+dependency installs, and only the copy of that string into the request
+body is made in chunks.
+"""
+import base64
+import tempfile
+import typing as T
+from xml.sax.handler import ContentHandler
+
+from defusedxml.sax import parse as parse_sax
+
+# Spooled files larger than this are moved from memory to disk
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+# A multiple of 4, so that chunks of base64 text decode independently
+CHUNK_SIZE = 256 * 1024
+
+
+def spooled_file() -> tempfile.SpooledTemporaryFile:
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+
+
+def spool_response(response) -> tempfile.SpooledTemporaryFile:
+    """Copy the body of a requests Response to a spooled file.
+
+    If the request was made with `stream=True`, the body is never read
+    into memory all at once."""
+    fp = spooled_file()
+    for chunk in response.iter_content(CHUNK_SIZE):
+        fp.write(chunk)
+    fp.seek(0)
+    return fp
+
+
+def build_body(
+    envelope: str, placeholder: str, payload: str
+) -> T.Union[bytes, T.IO[bytes]]:
+    """Build a request body from a SOAP envelope with the base64 `payload`
+    copied in place of `placeholder`.
+
+    Large bodies are written to a temporary file in chunks, which requests
+    streams to the server, rather than built as a second copy of the
+    payload in memory. Smaller ones are returned as bytes."""
+    if placeholder not in envelope:
+        return envelope.encode("utf-8")
+    before, after = (part.encode("utf-8") for part in envelope.split(placeholder, 1))
+    if len(before) + len(payload) + len(after) <= SPOOL_MAX_SIZE:
+        return before + payload.encode("ascii") + after
+    fp = tempfile.TemporaryFile()
+    fp.write(before)
+    for start in range(0, len(payload), CHUNK_SIZE):
+        fp.write(payload[start : start + CHUNK_SIZE].encode("ascii"))
+    fp.write(after)
+    fp.seek(0)
+    return fp
+
+
+def file_contains(fp: T.IO[bytes], needle: bytes) -> bool:
+    """Search a file for `needle` in chunks. Leaves the file at its start."""
+    found = False
+    tail = b""
+    fp.seek(0)
+    while not found:
+        chunk = fp.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        found = needle in tail + chunk
+        tail = chunk[-len(needle) :]
+    fp.seek(0)
+    return found
+
+
+class Base64ElementHandler(ContentHandler):
+    """SAX handler which decodes the base64 text of an element to a file
+    as it is parsed."""
+
+    def __init__(self, tag: str, dest: T.IO[bytes]):
+        super().__init__()
+        self.tag = tag
+        self.dest = dest
+        self.found = False
+        self._in_element = False
+        self._pending = ""
+
+    def startElement(self, name, attrs):
+        if name.split(":")[-1] == self.tag and not self.found:
+            self.found = self._in_element = True
+
+    def characters(self, content):
+        if self._in_element:
+            text = self._pending + "".join(content.split())
+            end = len(text) - len(text) % 4
+            self.dest.write(base64.b64decode(text[:end]))
+            self._pending = text[end:]
+
+    def endElement(self, name):
+        if self._in_element and name.split(":")[-1] == self.tag:
+            self._in_element = False
+            self.dest.write(base64.b64decode(self._pending))
+            self._pending = ""
+
+
+def extract_base64_element(
+    fp: T.IO[bytes], tag: str
+) -> T.Optional[tempfile.SpooledTemporaryFile]:
+    """Decode the base64 content of the first `tag` element in an XML file
+    to a spooled file, or return None if there is no such element."""
+    dest = spooled_file()
+    handler = Base64ElementHandler(tag, dest)
+    parse_sax(fp, handler)
+    if not handler.found:
+        dest.close()
+        return None
+    dest.seek(0)
+    return dest
@@ -0,0 +1,174 @@
+from unittest import mock
+
+import pytest
+import requests
+import responses
+
+from cumulusci.core.config import OrgConfig
+from cumulusci.core.exceptions import ConfigError
+from cumulusci.salesforce_api.api_limits import (
+    ApiLimitGovernor,
+    ApiUsage,
+    governor_for_session,
+    parse_limit_info,
+)
+from cumulusci.salesforce_api.exceptions import ApiLimitExceeded
+from cumulusci.salesforce_api.utils import get_simple_salesforce_connection
+from cumulusci.utils.http.multi_request import ParallelSalesforce
+
+
+def fake_response(limit_info=None):
+    response = requests.Response()
+    if limit_info:
+        response.headers["Sforce-Limit-Info"] = limit_info
+    return response
+
+
+def test_parse_limit_info():
+    assert parse_limit_info("api-usage=25/15000") == ApiUsage(25, 15000)
+    assert parse_limit_info("per-app-api-usage=1/2, api-usage=3/4") == ApiUsage(3, 4)
+    assert parse_limit_info("") is None
+    assert parse_limit_info(None) is None
+
+
+def test_api_usage():
+    usage = ApiUsage(9000, 10000)
+    assert usage.remaining == 1000
+    assert usage.fraction == 0.9
+    assert ApiUsage(5, 0).fraction == 0.0
+
+
+class TestApiLimitGovernor:
+    def test_record_response(self):
+        governor = ApiLimitGovernor()
+        governor.record_response(fake_response("api-usage=25/15000"))
+        governor.record_response(fake_response())
+        assert governor.requests_made == 2
+        assert governor.usage == ApiUsage(25, 15000)
+        assert governor.as_dict() == {
+            "requests_made": 2,
+            "api_usage": 25,
+            "api_limit": 15000,
+            "budget": None,
+            "ceiling": None,
+            "throttled_seconds": 0.0,
+        }
+
+    def test_configure(self):
+        governor = ApiLimitGovernor()
+        governor.configure({"budget": "0.5", "ceiling": 0.9})
+        assert (governor.budget, governor.ceiling) == (0.5, 0.9)
+        assert governor.configured
+        governor.configure(None)
+        assert not governor.configured
+
+    @pytest.mark.parametrize(
+        "api_limits", [{"budget": "most"}, {"ceiling": 2}, {"budget": 0}, "0.5"]
+    )
+    def test_configure__invalid(self, api_limits):
+        with pytest.raises(ConfigError):
+            ApiLimitGovernor().configure(api_limits)
+
+    def test_throttle(self):
+        governor = ApiLimitGovernor(budget=0.5, ceiling=0.9)
+        governor.record_response(fake_response("api-usage=4999/10000"))
+        assert governor.delay() == 0
+
+        governor.record_response(fake_response("api-usage=7000/10000"))
+        assert governor.delay() == pytest.approx(5.0)
+        with mock.patch("time.sleep") as sleep:
+            governor.throttle()
+        sleep.assert_called_once_with(pytest.approx(5.0))
+        assert governor.throttled_seconds == pytest.approx(5.0)
+
+        # Throttling starts gently and never raises
+        governor.record_response(fake_response("api-usage=5000/10000"))
+        assert governor.delay() == pytest.approx(1.0)
+        governor.record_response(fake_response("api-usage=9500/10000"))
+        assert governor.delay() == governor.max_throttle_delay
+
+    def test_ceiling(self):
+        governor = ApiLimitGovernor(ceiling=0.5)
+        governor.record_response(fake_response("api-usage=4999/10000"))
+        governor.check()
+        governor.record_response(fake_response("api-usage=5000/10000"))
+        with pytest.raises(ApiLimitExceeded, match="5000 of 10000"):
+            governor.check()
+
+    def test_warning(self, caplog):
+        governor = ApiLimitGovernor()
+        governor.record_response(fake_response("api-usage=9000/10000"))
+        governor.record_response(fake_response("api-usage=9001/10000"))
+        warnings = [r for r in caplog.records if "daily API requests" in r.message]
+        assert len(warnings) == 1
+
+    def test_refresh(self):
+        sf = mock.Mock()
+        sf.restful.return_value = {
+            "DailyApiRequests": {"Max": 15000, "Remaining": 14000}
+        }
+        governor = ApiLimitGovernor()
+        assert governor.refresh(sf) == ApiUsage(1000, 15000)
+        sf.restful.assert_called_once_with("limits/")
+
+    def test_as_dict__no_usage(self):
+        assert ApiLimitGovernor().as_dict()["api_usage"] is None
+
+    @responses.activate
+    def test_installed_on_connection(self):
+        org_config = OrgConfig(
+            {
+                "instance_url": "https://orgname.my.salesforce.com",
+                "access_token": "BOGUS",
+            },
+            "test",
+        )
+        proj_config = mock.Mock()
+        proj_config.project__package__api_version = "51.0"
+        proj_config.project__api_limits = {"budget": 0.9}
+        sf = get_simple_salesforce_connection(proj_config, org_config)
+        # a second connection shares the governor without double-counting
+        get_simple_salesforce_connection(proj_config, org_config)
+
+        responses.add(
+            "GET",
+            "https://orgname.my.salesforce.com/services/data/v51.0/limits/",
+            json={},
+            headers={"Sforce-Limit-Info": "api-usage=10/100"},
+        )
+        sf.restful("limits/")
+        governor = org_config.api_governor
+        assert governor.budget == 0.9
+        assert governor.requests_made == 1
+        assert governor.usage == ApiUsage(10, 100)
+
+    @responses.activate
+    def test_installed_on_parallel_session(self):
+        governor = ApiLimitGovernor()
+        org_config = mock.Mock(
+            instance_url="https://orgname.my.salesforce.com",
+            access_token="BOGUS",
+            api_governor=governor,
+        )
+        proj_config = mock.Mock(project__api_limits={"ceiling": 0.5})
+        proj_config.project__package__api_version = "51.0"
+        sf = get_simple_salesforce_connection(proj_config, org_config)
+        assert governor_for_session(sf.session) is governor
+
+        responses.add(
+            "GET",
+            "https://orgname.my.salesforce.com/services/data/v51.0/limits/",
+            json={},
+            headers={"Sforce-Limit-Info": "api-usage=60/100"},
+        )
+        with ParallelSalesforce(sf, 2) as psf:
+            successes, errors = psf.do_requests([{"url": "limits/", "method": "GET"}])
+            assert len(list(successes)) == 1
+            assert governor.requests_made == 1
+            # Over the ceiling, the calling thread stops sending requests
+            with pytest.raises(ApiLimitExceeded):
+                psf.do_requests([{"url": "limits/", "method": "GET"}])
+
+    def test_governor_for_session__none(self):
+        assert governor_for_session(requests.Session()) is None
+        assert governor_for_session(mock.Mock()) is None
@@ -0,0 +1,88 @@
+from cumulusci.salesforce_api.deploy_ledger import (
+    DeployLedger,
+    component_key,
+    delta_members,
+    deploy_hash,
+)
+
+
+def test_deploy_hash():
+    assert deploy_hash("abc", "62.0") == deploy_hash("abc", "62.0")
+    assert deploy_hash("abc", "62.0") != deploy_hash("abc", "61.0")
+    assert deploy_hash("abc", "62.0") != deploy_hash("abd", "62.0")
+    assert deploy_hash("abc", "62.0") != deploy_hash("abc", "62.0", ["clean_meta_xml"])
+
+
+class TestDeployLedger:
+    def test_record(self, tmp_path):
+        ledger = DeployLedger(tmp_path / "deploy_ledger.json")
+        assert not ledger.is_unchanged("src", "hash1", org_id="00D1")
+
+        ledger.record("src", "hash1", org_id="00D1")
+
+        assert ledger.is_unchanged("src", "hash1", org_id="00D1")
+        assert not ledger.is_unchanged("src", "hash2", org_id="00D1")
+        assert not ledger.is_unchanged("src", "hash1", org_id="00D2")
+        assert not ledger.is_unchanged("unpackaged/pre", "hash1", org_id="00D1")
+
+    def test_forget(self, tmp_path):
+        ledger = DeployLedger(tmp_path / "deploy_ledger.json")
+        ledger.record("src", "hash1", org_id="00D1")
+        ledger.forget("src")
+        ledger.forget("src")
+
+        assert ledger.get("src") is None
+
+    def test_corrupt_file(self, tmp_path):
+        path = tmp_path / "deploy_ledger.json"
+        path.write_text("not json")
+        ledger = DeployLedger(path)
+
+        assert ledger.get("src") is None
+        ledger.record("src", "hash1", org_id="00D1")
+        assert ledger.get("src")["hash"] == "hash1"
+
+
+def test_component_key():
+    assert component_key("classes/Foo.cls") == "classes/Foo.cls"
+    assert component_key("classes/Foo.cls-meta.xml") == "classes/Foo.cls"
+    assert component_key("lwc/myComponent/myComponent.js") == "lwc/myComponent"
+    assert component_key("aura/Cmp/Cmp.cmp-meta.xml") == "aura/Cmp"
+    assert component_key("reports/Folder-meta.xml") == "reports/Folder"
+
+
+def test_delta_members():
+    previous = {
+        "package.xml": "p1",
+        "classes/Foo.cls": "a",
+        "classes/Foo.cls-meta.xml": "b",
+        "classes/Bar.cls": "c",
+        "classes/Bar.cls-meta.xml": "d",
+        "lwc/cmp/cmp.js": "e",
+        "lwc/cmp/cmp.html": "f",
+        "reports/Folder-meta.xml": "g",
+        "reports/Folder/Report.report": "h",
+        "classes/Gone.cls": "i",
+    }
+    files = {
+        **previous,
+        "package.xml": "p2",
+        "classes/Foo.cls-meta.xml": "changed",
+        "lwc/cmp/cmp.html": "changed",
+        "reports/Folder/Report.report": "changed",
+        "objects/New__c.object": "new",
+    }
+    del files["classes/Gone.cls"]
+
+    members, removed = delta_members(files, previous)
+
+    assert members == {
+        "classes/Foo.cls",
+        "classes/Foo.cls-meta.xml",
+        "lwc/cmp/cmp.js",
+        "lwc/cmp/cmp.html",
+        "reports/Folder-meta.xml",
+        "reports/Folder/Report.report",
+        "objects/New__c.object",
+    }
+    assert removed == {"classes/Gone.cls"}
@@ -0,0 +1,81 @@
+from unittest import mock
+
+import pytest
+
+from cumulusci.salesforce_api.describe_cache import (
+    DEFAULT_DESCRIBE_TTL,
+    DescribeCache,
+    describe_cache_ttl,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDescribeCache:
+    def test_get__caches(self):
+        cache = DescribeCache(ttl=10)
+        fetch = mock.Mock(return_value={"sobjects": []})
+
+        assert cache.get(("00D", "62.0", "describe", None), fetch) == {"sobjects": []}
+        assert cache.get(("00D", "62.0", "describe", None), fetch) == {"sobjects": []}
+
+        fetch.assert_called_once()
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert len(cache) == 1
+
+    def test_get__keys_are_separate(self):
+        cache = DescribeCache(ttl=10)
+        cache.get(("00D", "62.0", "describe", None), lambda: "a")
+        assert cache.get(("00D", "61.0", "describe", None), lambda: "b") == "b"
+        assert cache.get(("00E", "62.0", "describe", None), lambda: "c") == "c"
+
+    def test_get__expires(self):
+        clock = FakeClock()
+        cache = DescribeCache(ttl=10, clock=clock)
+        fetch = mock.Mock(side_effect=["old", "new"])
+
+        assert cache.get(("key",), fetch) == "old"
+        clock.now = 11
+        assert cache.get(("key",), fetch) == "new"
+
+    def test_get__errors_not_cached(self):
+        cache = DescribeCache(ttl=10)
+        fetch = mock.Mock(side_effect=[Exception("Not found"), "found"])
+
+        with pytest.raises(Exception):
+            cache.get(("key",), fetch)
+        assert cache.get(("key",), fetch) == "found"
+
+    def test_get__disabled(self):
+        cache = DescribeCache(ttl=0)
+        fetch = mock.Mock(return_value="value")
+
+        cache.get(("key",), fetch)
+        cache.get(("key",), fetch)
+
+        assert fetch.call_count == 2
+
+    def test_invalidate(self):
+        cache = DescribeCache(ttl=10)
+        fetch = mock.Mock(side_effect=["old", "new"])
+
+        cache.get(("key",), fetch)
+        cache.invalidate()
+        assert cache.get(("key",), fetch) == "new"
+
+
+def test_describe_cache_ttl(monkeypatch):
+    monkeypatch.delenv("CUMULUSCI_DESCRIBE_CACHE_TTL", raising=False)
+    assert describe_cache_ttl() == DEFAULT_DESCRIBE_TTL
+
+    monkeypatch.setenv("CUMULUSCI_DESCRIBE_CACHE_TTL", "0")
+    assert describe_cache_ttl() == 0
+
+    monkeypatch.setenv("CUMULUSCI_DESCRIBE_CACHE_TTL", "bogus")
+    assert describe_cache_ttl() == DEFAULT_DESCRIBE_TTL
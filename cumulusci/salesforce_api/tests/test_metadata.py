@@ -2,6 +2,7 @@ import datetime
 import http.client
 import io
 from collections import defaultdict
+from unittest import mock
 from xml.dom.minidom import parseString
 
 import pytest
@@ -17,6 +18,7 @@ from cumulusci.salesforce_api.exceptions import (
     MetadataParseError,
 )
 from cumulusci.salesforce_api.metadata import (
+    PACKAGE_ZIP_PLACEHOLDER,
     ApiDeploy,
     ApiListMetadata,
     ApiListMetadataTypes,
@@ -30,6 +32,7 @@ from cumulusci.salesforce_api.package_zip import (
     CreatePackageZipBuilder,
     InstallPackageZipBuilder,
 )
+from cumulusci.salesforce_api.polling import PollingPolicy
 from cumulusci.salesforce_api.tests.metadata_test_strings import (
     deploy_result,
     deploy_result_failure,
@@ -576,7 +579,7 @@ class TestApiDeploy(TestBaseTestMetadataApi):
 
     def _expected_envelope_start(self):
         return self.envelope_start.format(
-            package_zip=self.package_zip,
+            package_zip=PACKAGE_ZIP_PLACEHOLDER,
             check_only="false",
             purge_on_delete="false",
             test_level="",
@@ -638,6 +641,92 @@ class TestApiDeploy(TestBaseTestMetadataApi):
         api = self._create_instance(task)
         assert api.run_tests == []
 
+    def test_encode_envelope(self):
+        task = self._create_task()
+        api = self._create_instance(task)
+        body = api._encode_envelope(api._build_envelope_start())
+        assert body == self.envelope_start.format(
+            package_zip=self.package_zip,
+            check_only="false",
+            purge_on_delete="false",
+            test_level="",
+            run_tests="",
+        ).encode("utf-8")
+
+    @responses.activate
+    def test_call_mdapi__closes_body(self):
+        org_config = {
+            "instance_url": "https://na12.salesforce.com",
+            "id": "https://login.salesforce.com/id/00D000000000000ABC/005000000000000ABC",
+            "access_token": "0123456789",
+        }
+        task = self._create_task(org_config=org_config)
+        api = self._create_instance(task)
+        self._mock_call_mdapi(api, '<?xml version="1.0" encoding="UTF-8"?><id>1</id>')
+        body = io.BytesIO(b"<envelope/>")
+
+        with mock.patch(
+            "cumulusci.salesforce_api.metadata.build_body", return_value=body
+        ):
+            api._call_mdapi({}, "###SESSION_ID###")
+        assert body.closed
+
+    def test_call__closes_response(self):
+        task = self._create_task()
+        api = self._create_instance(task)
+        response = Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(b"<result/>")
+        api._get_response = mock.Mock(return_value=response)
+        api._process_response = mock.Mock(return_value="processed")
+
+        assert api() == "processed"
+        assert response.raw.closed
+
+    def test_process_response_status__progress(self):
+        clock = mock.Mock(return_value=0)
+        task = self._create_task()
+        api = self._create_instance(task)
+        api.polling = PollingPolicy(clock=clock)
+        api.status = "InProgress"
+        api.state_detail = "Processing Type: CustomObject"
+        api.check_num = 30
+
+        def status_response(deployed, state_detail=b"CustomObject"):
+            response = Response()
+            response.status_code = 200
+            response.raw = io.BytesIO(
+                b'<?xml version="1.0" encoding="UTF-8"?><result><done>false</done>'
+                b"<stateDetail>Processing Type: %s</stateDetail>"
+                b"<numberComponentsDeployed>%d</numberComponentsDeployed>"
+                b"<numberComponentsTotal>100</numberComponentsTotal>"
+                b"<numberTestsTotal>0</numberTestsTotal></result>"
+                % (state_detail, deployed)
+            )
+            return response
+
+        with mock.patch.object(api, "_set_status") as set_status:
+            api._process_response_status(status_response(10))
+            clock.return_value = 10
+            api._process_response_status(status_response(60))
+
+        set_status.assert_called_with(
+            "InProgress",
+            "Processing Type: CustomObject (60/100 components: "
+            "5.0 components per second, about 8 seconds remaining; "
+            "next check in 4 seconds)",
+        )
+        # With progress to go on, the schedule is not reset,
+        # and the next check is at about half the time remaining.
+        assert api.check_num == 30
+        assert api.next_check_interval == 4
+
+        # A new stage starts the schedule over
+        with mock.patch.object(api, "_set_status"):
+            api._process_response_status(status_response(70, b"ApexClass"))
+        assert api.check_num == 1
+        assert api.next_check_interval == 1
+
     def test_init_run_tests(self):
         task = self._create_task()
         api = self._create_instance(task, run_tests=["TestA", "TestB"])
@@ -656,6 +745,28 @@ class TestApiDeploy(TestBaseTestMetadataApi):
         assert "<runTests>TestB</runTests>" in envelope
         assert "RunSpecifiedTests" in envelope
 
+    def test_process_response_resets_describe_cache(self):
+        task = self._create_task()
+        task.org_config.describe_cache.get(("key",), lambda: "stale")
+        api = self._create_instance(task)
+        response = Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(self._response_call_success_result(None))
+
+        assert api._process_response(response) == "Success"
+        assert len(task.org_config.describe_cache) == 0
+
+    def test_process_response_check_only_keeps_describe_cache(self):
+        task = self._create_task()
+        task.org_config.describe_cache.get(("key",), lambda: "fresh")
+        api = self._create_instance(task, check_only=True)
+        response = Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(self._response_call_success_result(None))
+
+        assert api._process_response(response) == "Success"
+        assert len(task.org_config.describe_cache) == 1
+
     def test_process_response_metadata_failure(self):
         task = self._create_task()
         api = self._create_instance(task)
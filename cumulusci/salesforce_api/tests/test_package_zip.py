@@ -3,9 +3,11 @@ import io
 import os
 import pathlib
 import zipfile
+from unittest import mock
 
 import pytest
 
+from cumulusci.salesforce_api import package_zip
 from cumulusci.salesforce_api.package_zip import (
     BasePackageZipBuilder,
     CreatePackageZipBuilder,
@@ -259,6 +261,21 @@ class TestMetadataPackageZipBuilder:
             actual_set = set(builder.zf.namelist())
             assert expected_set == actual_set
 
+    def test_add_files_to_package__bounded_read_ahead(self, task_context):
+        with temporary_dir() as path:
+            for i in range(5):
+                pathlib.Path(path, f"file{i}.txt").write_text(str(i))
+
+            builder = MetadataPackageZipBuilder(context=task_context)
+            with mock.patch.object(package_zip, "READ_AHEAD", 2):
+                builder._add_files_to_package(path)
+
+            files = sorted(builder.zf.namelist())
+            assert files == [f"file{i}.txt" for i in range(5)]
+            assert [builder.zf.read(name) for name in files] == [
+                str(i).encode() for i in range(5)
+            ]
+
     def test_include_directory(self, task_context):
         builder = MetadataPackageZipBuilder(context=task_context)
 
@@ -341,6 +358,72 @@ class TestMetadataPackageZipBuilder:
             package_xml = builder.zf.read("package.xml")
             assert b"FeatureParameterInteger" not in package_xml
 
+    def test_transforms_applied_in_single_pass(self, task_context):
+        with temporary_dir() as path:
+            pathlib.Path(path, "classes").mkdir()
+            pathlib.Path(path, "classes", "ns__Foo.cls").write_text(
+                "ns__Bar %%%NAMESPACE%%%Baz"
+            )
+            pathlib.Path(path, "classes", "ns__Foo.cls-meta.xml").write_text(
+                """<?xml version="1.0" encoding="UTF-8"?>
+<ApexClass xmlns="http://soap.sforce.com/2006/04/metadata">
+    <packageVersions><namespace>ns</namespace></packageVersions>
+</ApexClass>"""
+            )
+
+            with mock.patch.object(
+                package_zip,
+                "process_text_in_zipfile",
+                wraps=package_zip.process_text_in_zipfile,
+            ) as process_text:
+                builder = MetadataPackageZipBuilder(
+                    path=path,
+                    options={
+                        "namespace_tokenize": "ns",
+                        "namespace_inject": "other",
+                        "unmanaged": False,
+                    },
+                    context=task_context,
+                )
+
+            process_text.assert_called_once()
+            assert builder.zf.namelist() == [
+                "classes/other__Foo.cls",
+                "classes/other__Foo.cls-meta.xml",
+            ]
+            assert builder.zf.read("classes/other__Foo.cls") == (
+                b"other__Bar other__Baz"
+            )
+            assert b"packageVersions" not in builder.zf.read(
+                "classes/other__Foo.cls-meta.xml"
+            )
+
+    def test_files_compressed(self, task_context):
+        with temporary_dir() as path:
+            pathlib.Path(path, "package.xml").write_text("<Package/>")
+            builder = MetadataPackageZipBuilder(
+                path=path, options={"clean_meta_xml": False}, context=task_context
+            )
+
+            zf = zipfile.ZipFile(io.BytesIO(builder.as_bytes()), "r")
+            assert zf.getinfo("package.xml").compress_type == zipfile.ZIP_DEFLATED
+
+    def test_files_compressed__level_0(self, task_context):
+        with temporary_dir() as path:
+            pathlib.Path(path, "package.xml").write_text("<Package/>")
+            pathlib.Path(path, "classes").mkdir()
+            pathlib.Path(path, "classes", "Foo.cls").write_text("public class Foo {}")
+            builder = MetadataPackageZipBuilder(
+                path=path,
+                options={"clean_meta_xml": False, "compression_level": 0},
+                context=task_context,
+            )
+
+            zf = zipfile.ZipFile(io.BytesIO(builder.as_bytes()), "r")
+            assert zf.testzip() is None
+            assert zf.getinfo("package.xml").compress_type == zipfile.ZIP_STORED
+            assert zf.read("classes/Foo.cls") == b"public class Foo {}"
+
 
 class TestCreatePackageZipBuilder:
     def test_init__missing_name(self):
@@ -0,0 +1,90 @@
+from cumulusci.salesforce_api.polling import MAX_CHECK_INTERVAL, PollingPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPollingPolicy:
+    def test_next_interval__no_progress(self):
+        policy = PollingPolicy(clock=FakeClock())
+        assert policy.eta is None
+        assert policy.next_interval(4) == 4
+        assert policy.next_interval(120) == MAX_CHECK_INTERVAL
+
+    def test_next_interval__progress(self):
+        clock = FakeClock()
+        policy = PollingPolicy(clock=clock)
+        policy.record_progress(0, 100)
+        assert policy.throughput() is None
+
+        clock.now = 20
+        policy.record_progress(50, 100)
+        assert policy.throughput() == 2.5
+        assert policy.eta == 20
+        assert policy.next_interval(25) == 10
+
+        # Completion is near, so check again soon
+        clock.now = 38
+        assert policy.eta == 2
+        assert policy.next_interval(25) == 1
+        assert policy.next_interval(25, min_interval=0) == 1
+
+    def test_record_progress__no_total(self):
+        policy = PollingPolicy(clock=FakeClock())
+        policy.record_progress(0, 0)
+        assert policy.describe_progress() is None
+
+    def test_record_deploy_progress(self):
+        clock = FakeClock()
+        policy = PollingPolicy(clock=clock)
+        assert policy.record_deploy_progress({"numberComponentsTotal": 0}) is None
+
+        result = {
+            "numberComponentsDeployed": "8",
+            "numberComponentErrors": "2",
+            "numberComponentsTotal": "10",
+            "numberTestsCompleted": 0,
+            "numberTestErrors": 0,
+            "numberTestsTotal": 10,
+        }
+        assert policy.record_deploy_progress(result) == "10/10 components, 0/10 tests"
+
+        clock.now = 10
+        result.update(numberTestsCompleted=4, numberTestErrors=1)
+        assert (
+            policy.record_deploy_progress(result)
+            == "10/10 components, 5/10 tests: 0.5 tests per second, about 10 seconds remaining"
+        )
+
+    def test_eta__components_and_tests(self):
+        clock = FakeClock()
+        policy = PollingPolicy(clock=clock)
+        result = {
+            "numberComponentsDeployed": 0,
+            "numberComponentsTotal": 100,
+            "numberTestsCompleted": 0,
+            "numberTestsTotal": 10,
+        }
+        policy.record_deploy_progress(result)
+
+        # Tests haven't started, so their duration is unknown
+        clock.now = 10
+        result.update(numberComponentsDeployed=50)
+        policy.record_deploy_progress(result)
+        assert policy.throughput("components") == 5
+        assert policy.eta is None
+
+        # Tests run at their own rate, measured from when they started
+        clock.now = 20
+        result.update(numberComponentsDeployed=100)
+        policy.record_deploy_progress(result)
+        clock.now = 60
+        result.update(numberTestsCompleted=2)
+        policy.record_deploy_progress(result)
+        assert policy.throughput("tests") == 0.05
+        assert policy.eta == 160
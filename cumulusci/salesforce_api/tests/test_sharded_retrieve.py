@@ -0,0 +1,216 @@
+import io
+import zipfile
+from unittest import mock
+
+import pytest
+
+from cumulusci.core.exceptions import CumulusCIException
+from cumulusci.salesforce_api.sharded_retrieve import (
+    ShardedRetrieveUnpackaged,
+    merge_xml,
+    merge_zipfiles,
+    parse_package_xml,
+    render_package_xml,
+    shard_package,
+)
+
+PROFILE_A = b"""<?xml version="1.0" encoding="UTF-8"?>
+<Profile xmlns="http://soap.sforce.com/2006/04/metadata">
+    <fieldPermissions>
+        <field>Account.A__c</field>
+    </fieldPermissions>
+    <custom>false</custom>
+</Profile>
+"""
+PROFILE_B = b"""<?xml version="1.0" encoding="UTF-8"?>
+<Profile xmlns="http://soap.sforce.com/2006/04/metadata">
+    <classAccesses>
+        <apexClass>Foo</apexClass>
+    </classAccesses>
+    <custom>false</custom>
+</Profile>
+"""
+
+
+def make_zip(files):
+    zf = zipfile.ZipFile(io.BytesIO(), "w")
+    for name, content in files.items():
+        zf.writestr(name, content)
+    return zf
+
+
+def members(shards):
+    return sorted(
+        (name, member)
+        for shard in shards
+        for name, values in shard.items()
+        for member in values
+    )
+
+
+def test_render_package_xml__roundtrip():
+    types = {"ApexClass": ["B", "A&B"], "CustomObject": ["Account"]}
+    package_xml = render_package_xml(types, "58.0")
+    assert "<members>A&amp;B</members>" in package_xml
+    assert parse_package_xml(package_xml) == (
+        {"ApexClass": ["A&B", "B"], "CustomObject": ["Account"]},
+        "58.0",
+    )
+
+
+def test_shard_package__balanced():
+    types = {"ApexClass": [f"Class{i}" for i in range(10)]}
+    shards = shard_package(types, 3)
+    assert len(shards) == 3
+    assert sorted(len(shard["ApexClass"]) for shard in shards) == [3, 3, 4]
+    assert members(shards) == members([types])
+
+
+def test_shard_package__max_components():
+    types = {"ApexClass": [f"Class{i}" for i in range(25)]}
+    shards = shard_package(types, 1, max_components=10)
+    assert len(shards) == 3
+    assert all(len(shard["ApexClass"]) <= 10 for shard in shards)
+
+
+def test_shard_package__keeps_children_with_parent():
+    types = {
+        "CustomObject": ["Account", "Contact"],
+        "CustomField": ["Account.A__c", "Account.B__c", "Contact.C__c"],
+        "CustomObjectTranslation": ["Account-en_US"],
+        "CustomLabel": ["One", "Two"],
+    }
+    shards = shard_package(types, 4)
+    for shard in shards:
+        if "Account" in shard.get("CustomObject", []):
+            assert shard["CustomField"] == ["Account.A__c", "Account.B__c"]
+            assert shard["CustomObjectTranslation"] == ["Account-en_US"]
+        if "CustomLabel" in shard:
+            assert shard["CustomLabel"] == ["One", "Two"]
+    assert members(shards) == members([types])
+
+
+def test_shard_package__wildcard_family():
+    types = {
+        "CustomObject": ["*"],
+        "CustomField": ["Account.A__c"],
+        "ApexClass": ["Foo"],
+    }
+    shards = shard_package(types, 2)
+    assert {"CustomObject": ["*"], "CustomField": ["Account.A__c"]} in shards
+    assert {"ApexClass": ["Foo"]} in shards
+
+
+def test_shard_package__contextual_types_in_every_shard():
+    types = {"ApexClass": ["Foo", "Bar"], "Profile": ["Admin"]}
+    shards = shard_package(types, 2)
+    assert len(shards) == 2
+    assert all(shard["Profile"] == ["Admin"] for shard in shards)
+
+
+def test_shard_package__no_room():
+    with pytest.raises(CumulusCIException):
+        shard_package({"Profile": ["Admin", "Standard"]}, 1, max_components=2)
+
+
+def test_merge_xml():
+    merged = merge_xml([PROFILE_A, PROFILE_B])
+    assert merged == (
+        b'<?xml version="1.0" encoding="UTF-8"?>\n'
+        b'<Profile xmlns="http://soap.sforce.com/2006/04/metadata">\n'
+        b"    <classAccesses>\n        <apexClass>Foo</apexClass>\n    </classAccesses>\n"
+        b"    <custom>false</custom>\n"
+        b"    <fieldPermissions>\n        <field>Account.A__c</field>\n    </fieldPermissions>\n"
+        b"</Profile>\n"
+    )
+
+
+def test_merge_zipfiles():
+    zipfiles = [
+        make_zip(
+            {
+                "package.xml": render_package_xml(
+                    {"ApexClass": ["Foo"], "Profile": ["Admin"]}, "58.0"
+                ),
+                "classes/Foo.cls": "Foo",
+                "profiles/Admin.profile": PROFILE_A,
+                "static/logo.png": b"\x89one",
+            }
+        ),
+        make_zip(
+            {
+                "package.xml": render_package_xml(
+                    {"ApexClass": ["Bar"], "Profile": ["Admin"]}, "58.0"
+                ),
+                "classes/Bar.cls": "Bar",
+                "profiles/Admin.profile": PROFILE_B,
+                "static/logo.png": b"\x89two",
+            }
+        ),
+    ]
+    merged = merge_zipfiles(zipfiles, "58.0")
+    assert sorted(merged.namelist()) == [
+        "classes/Bar.cls",
+        "classes/Foo.cls",
+        "package.xml",
+        "profiles/Admin.profile",
+        "static/logo.png",
+    ]
+    assert parse_package_xml(merged.read("package.xml").decode("utf-8"))[0] == {
+        "ApexClass": ["Bar", "Foo"],
+        "Profile": ["Admin"],
+    }
+    assert b"classAccesses" in merged.read("profiles/Admin.profile")
+    assert b"fieldPermissions" in merged.read("profiles/Admin.profile")
+    assert merged.read("static/logo.png") == b"\x89one"
+
+
+class TestShardedRetrieveUnpackaged:
+    def test_call__single_shard(self):
+        package_xml = render_package_xml({"ApexClass": ["Foo"]}, "58.0")
+        api_class = mock.Mock()
+        retrieve = ShardedRetrieveUnpackaged(
+            mock.Mock(), package_xml, concurrency=4, api_class=api_class
+        )
+        assert retrieve() is api_class.return_value.return_value
+        api_class.assert_called_once_with(retrieve.task, package_xml, "58.0")
+
+    def test_call__shards(self):
+        package_xml = render_package_xml(
+            {"ApexClass": ["Foo", "Bar"], "Profile": ["Admin"]}, "58.0"
+        )
+
+        def retrieve_shard(task, shard_xml, api_version):
+            types = parse_package_xml(shard_xml)[0]
+            (name,) = types["ApexClass"]
+            zf = make_zip(
+                {
+                    "package.xml": shard_xml,
+                    f"classes/{name}.cls": name,
+                    "profiles/Admin.profile": PROFILE_A if name == "Foo" else PROFILE_B,
+                }
+            )
+            return mock.Mock(return_value=zf)
+
+        task = mock.Mock()
+        retrieve = ShardedRetrieveUnpackaged(
+            task, package_xml, concurrency=2, api_class=retrieve_shard
+        )
+        zf = retrieve()
+        assert sorted(zf.namelist()) == [
+            "classes/Bar.cls",
+            "classes/Foo.cls",
+            "package.xml",
+            "profiles/Admin.profile",
+        ]
+        assert zf.read("package.xml").decode("utf-8") == package_xml
+        task.logger.info.assert_called_once_with("Retrieving 3 components in 2 shards")
+
+    def test_api_version__from_project(self):
+        task = mock.Mock()
+        task.project_config.project__package__api_version = "57.0"
+        package_xml = render_package_xml({"ApexClass": ["Foo"]}, "58.0").replace(
+            "    <version>58.0</version>\n", ""
+        )
+        retrieve = ShardedRetrieveUnpackaged(task, package_xml)
+        assert retrieve.api_version == "57.0"
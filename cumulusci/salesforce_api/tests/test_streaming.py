@@ -0,0 +1,93 @@
+import base64
+import io
+import os
+import zipfile
+
+import pytest
+import requests
+import responses
+from requests import Response
+
+from cumulusci.salesforce_api import streaming
+from cumulusci.salesforce_api.streaming import (
+    build_body,
+    extract_base64_element,
+    file_contains,
+    spool_response,
+)
+
+
+def make_zip(size):
+    fp = io.BytesIO()
+    with zipfile.ZipFile(fp, "w", zipfile.ZIP_STORED) as zf:
+        zf.writestr("unpackaged/random.bin", os.urandom(size))
+    return fp.getvalue()
+
+
+def retrieve_result(zip_bytes, wrap=76):
+    encoded = base64.b64encode(zip_bytes).decode("ascii")
+    # Line breaks in the base64 text are ignored
+    lines = "\n".join(encoded[i : i + wrap] for i in range(0, len(encoded), wrap))
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/">'
+        "<soapenv:Body><checkRetrieveStatusResponse><result>"
+        f"<done>true</done><zipFile>{lines}</zipFile>"
+        "</result></checkRetrieveStatusResponse></soapenv:Body></soapenv:Envelope>"
+    ).encode("utf-8")
+
+
+@pytest.mark.parametrize("wrap", [76, 1000003])
+def test_extract_base64_element(wrap):
+    zip_bytes = make_zip(300000)
+    zip_fp = extract_base64_element(
+        io.BytesIO(retrieve_result(zip_bytes, wrap)), "zipFile"
+    )
+    assert zip_fp.read() == zip_bytes
+
+
+def test_extract_base64_element__missing():
+    assert extract_base64_element(io.BytesIO(b"<result/>"), "zipFile") is None
+
+
+@responses.activate
+def test_spool_response(monkeypatch):
+    monkeypatch.setattr(streaming, "SPOOL_MAX_SIZE", 1000)
+    body = retrieve_result(make_zip(10000))
+    responses.add(responses.POST, "https://example.com", body=body)
+
+    response = requests.post("https://example.com", stream=True)
+    with spool_response(response) as fp:
+        assert fp._rolled  # moved to disk
+        assert fp.read() == body
+
+
+def test_build_body(monkeypatch):
+    envelope = "<deploy><zipFile>###ZIP###</zipFile><name>é</name></deploy>"
+    assert build_body(envelope, "###ZIP###", "UEsD") == (
+        "<deploy><zipFile>UEsD</zipFile><name>é</name></deploy>".encode("utf-8")
+    )
+
+    monkeypatch.setattr(streaming, "SPOOL_MAX_SIZE", 10)
+    monkeypatch.setattr(streaming, "CHUNK_SIZE", 4)
+    with build_body(envelope, "###ZIP###", "UEsDBBQAAAAI") as fp:
+        assert fp.read() == (
+            "<deploy><zipFile>UEsDBBQAAAAI</zipFile><name>é</name></deploy>".encode()
+        )
+
+    assert build_body("<listMetadata/>", "###ZIP###", "UEsD") == b"<listMetadata/>"
+
+
+def test_file_contains(monkeypatch):
+    monkeypatch.setattr(streaming, "CHUNK_SIZE", 4)
+    fp = io.BytesIO(b"abcdefghij")
+    assert file_contains(fp, b"def")
+    assert fp.tell() == 0
+    assert not file_contains(fp, b"xyz")
+
+
+def test_spool_response__not_streamed():
+    response = Response()
+    response.raw = io.BytesIO(b"<result/>")
+    with spool_response(response) as fp:
+        assert fp.read() == b"<result/>"
@@ -15,7 +15,7 @@ def test_connection():
         },
         "test",
     )
-    proj_config = Mock()
+    proj_config = Mock(project__api_limits=None)
     service_mock = Mock()
     service_mock.client_id = "TEST"
     proj_config.keychain.get_service.return_value = service_mock
@@ -35,7 +35,7 @@ def test_connection__explicit_api_version():
         },
         "test",
     )
-    proj_config = Mock()
+    proj_config = Mock(project__api_limits=None)
     service_mock = Mock()
     service_mock.client_id = "TEST"
     proj_config.keychain.get_service.return_value = service_mock
@@ -52,7 +52,7 @@ def test_connection__no_connected_app():
         },
         "test",
     )
-    proj_config = Mock()
+    proj_config = Mock(project__api_limits=None)
     proj_config.keychain.get_service.side_effect = ServiceNotConfigured
 
     sf = get_simple_salesforce_connection(proj_config, org_config)
@@ -67,7 +67,7 @@ def test_connection__with_port():
         },
         "test",
     )
-    proj_config = Mock()
+    proj_config = Mock(project__api_limits=None)
     service_mock = Mock()
     service_mock.client_id = "TEST"
     proj_config.keychain.get_service.return_value = service_mock
@@ -79,7 +79,7 @@ def test_connection__with_port():
 
 def test_sf_api_retries(mock_http_response):
     org_config = Mock()
-    proj_config = Mock()
+    proj_config = Mock(project__api_limits=None)
     service_mock = Mock()
     service_mock.client_id = "TEST"
     proj_config.keychain.get_service.return_value = service_mock
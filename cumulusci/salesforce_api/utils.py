@@ -1,11 +1,11 @@
 from urllib.parse import urlparse
 
 import simple_salesforce
-from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 
 from cumulusci import __version__
 from cumulusci.core.exceptions import ServiceNotConfigured, ServiceNotValid
+from cumulusci.salesforce_api.api_limits import GovernedHTTPAdapter
 
 CALL_OPTS_HEADER_KEY = "Sforce-Call-Options"
 
@@ -16,7 +16,6 @@ def get_simple_salesforce_connection(
 
     # Retry on long-running metadeploy jobs
     retries = Retry(total=5, status_forcelist=(502, 503, 504), backoff_factor=0.3)
-    adapter = HTTPAdapter(max_retries=retries)
     instance = org_config.instance_url
 
     # Attempt to get the host and port from the URL
@@ -39,6 +38,8 @@ def get_simple_salesforce_connection(
         client_name = "CumulusCI/{}".format(__version__)
 
     sf.headers.setdefault(CALL_OPTS_HEADER_KEY, "client={}".format(client_name))
+    org_config.api_governor.configure(project_config.project__api_limits)
+    adapter = GovernedHTTPAdapter(org_config.api_governor, max_retries=retries)
     sf.session.mount("http://", adapter)
     sf.session.mount("https://", adapter)
 
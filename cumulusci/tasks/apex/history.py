@@ -0,0 +1,203 @@
+"""A local database of Apex test results from previous test runs.
+
+RunApexTests records the outcome and runtime of each test method here,
+in the project's cache directory. The history is used to balance test
+classes between shards, to run classes which failed last time before
+the rest, and to flag tests which have become much slower. It also
+keeps the Apex classes and triggers covered by each test class, so that
+only the tests affected by a change need to run.
+"""
+import sqlite3
+import statistics
+import time
+import typing as T
+from contextlib import closing
+from pathlib import Path
+
+# The number of test runs kept for each org
+MAX_RUNS = 20
+# Slowdowns smaller than this are ignored as noise
+MIN_REGRESSION_MS = 1000
+
+FAILED_OUTCOMES = ("Fail", "CompileFail")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id TEXT,
+    run_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    class_name TEXT NOT NULL,
+    method_name TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    runtime INTEGER
+);
+CREATE INDEX IF NOT EXISTS results_by_method
+    ON results (class_name, method_name, run_id);
+CREATE TABLE IF NOT EXISTS coverage (
+    org_id TEXT NOT NULL,
+    test_class TEXT NOT NULL,
+    covered TEXT NOT NULL,
+    PRIMARY KEY (org_id, test_class, covered)
+);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value
+);
+"""
+
+
+class ApexTestHistory:
+    """Results of previous Apex test runs, saved in a SQLite database."""
+
+    def __init__(self, path: T.Union[str, Path]):
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(str(self.path))
+        connection.executescript(SCHEMA)
+        return connection
+
+    def record(self, test_results: T.List[dict], org_id: T.Optional[str] = None):
+        """Save the results of a test run, as reported by RunApexTests,
+        and forget the oldest runs in the same org beyond MAX_RUNS."""
+        with closing(self._connect()) as connection, connection:
+            run_id = connection.execute(
+                "INSERT INTO runs (org_id, run_at) VALUES (?, ?)",
+                (org_id, time.time()),
+            ).lastrowid
+            connection.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id,
+                        result["ClassName"],
+                        result["Method"],
+                        result["Outcome"],
+                        (result.get("Stats") or {}).get("duration"),
+                    )
+                    for result in test_results
+                ],
+            )
+            old_runs = [
+                (row[0],)
+                for row in connection.execute(
+                    "SELECT id FROM runs WHERE org_id IS ? ORDER BY id DESC LIMIT -1 OFFSET ?",
+                    (org_id, MAX_RUNS),
+                )
+            ]
+            connection.executemany("DELETE FROM results WHERE run_id = ?", old_runs)
+            connection.executemany("DELETE FROM runs WHERE id = ?", old_runs)
+
+    def class_runtimes(self) -> T.Dict[str, int]:
+        """Runtime in milliseconds of each test class, from the most recent
+        runtime of each of its methods."""
+        runtimes = {}
+        with closing(self._connect()) as connection:
+            # SQLite takes the other columns from the row with the maximum run_id
+            for class_name, runtime, _ in connection.execute(
+                "SELECT class_name, runtime, MAX(run_id) FROM results "
+                "WHERE runtime IS NOT NULL GROUP BY class_name, method_name"
+            ):
+                runtimes[class_name] = runtimes.get(class_name, 0) + runtime
+        return runtimes
+
+    def failed_classes(self, org_id: T.Optional[str] = None) -> T.Set[str]:
+        """Test classes with a method which failed the last time it ran in the org."""
+        with closing(self._connect()) as connection:
+            return {
+                class_name
+                for class_name, outcome, _ in connection.execute(
+                    "SELECT class_name, outcome, MAX(run_id) FROM results "
+                    "JOIN runs ON runs.id = results.run_id WHERE org_id IS ? "
+                    "GROUP BY class_name, method_name",
+                    (org_id,),
+                )
+                if outcome in FAILED_OUTCOMES
+            }
+
+    def find_regressions(
+        self, test_results: T.List[dict], threshold: float
+    ) -> T.List[T.Tuple[str, str, int, float]]:
+        """Find passing tests whose runtime is more than `threshold` percent
+        above their median runtime in previous runs.
+
+        Returns the class name, method name, runtime and median runtime
+        of each."""
+        previous = {}
+        with closing(self._connect()) as connection:
+            for class_name, method_name, runtime in connection.execute(
+                "SELECT class_name, method_name, runtime FROM results "
+                "WHERE outcome = 'Pass' AND runtime IS NOT NULL"
+            ):
+                previous.setdefault((class_name, method_name), []).append(runtime)
+
+        regressions = []
+        for result in test_results:
+            runtimes = previous.get((result["ClassName"], result["Method"]))
+            runtime = (result.get("Stats") or {}).get("duration")
+            if result["Outcome"] != "Pass" or not runtimes or runtime is None:
+                continue
+            median = statistics.median(runtimes)
+            if (
+                runtime > median * (1 + threshold / 100)
+                and runtime - median >= MIN_REGRESSION_MS
+            ):
+                regressions.append(
+                    (result["ClassName"], result["Method"], runtime, median)
+                )
+        return regressions
+
+    def record_coverage(
+        self,
+        coverage: T.Dict[str, T.Set[str]],
+        org_id: T.Optional[str] = None,
+        full: bool = False,
+    ):
+        """Save the classes and triggers covered by each test class in the org.
+
+        If `full`, the coverage of every test class was collected, and
+        replaces all of the coverage saved before for the org."""
+        org_id = org_id or ""
+        with closing(self._connect()) as connection, connection:
+            if full:
+                connection.execute("DELETE FROM coverage WHERE org_id = ?", (org_id,))
+                connection.execute(
+                    "INSERT OR REPLACE INTO metadata VALUES (?, ?)",
+                    (f"full_coverage_at:{org_id}", time.time()),
+                )
+            else:
+                connection.executemany(
+                    "DELETE FROM coverage WHERE org_id = ? AND test_class = ?",
+                    [(org_id, test_class) for test_class in coverage],
+                )
+            connection.executemany(
+                "INSERT OR IGNORE INTO coverage VALUES (?, ?, ?)",
+                [
+                    (org_id, test_class, covered)
+                    for test_class, names in coverage.items()
+                    for covered in names
+                ],
+            )
+
+    def coverage(self, org_id: T.Optional[str] = None) -> T.Dict[str, T.Set[str]]:
+        """The classes and triggers covered by each test class in the org."""
+        coverage = {}
+        with closing(self._connect()) as connection:
+            for test_class, covered in connection.execute(
+                "SELECT test_class, covered FROM coverage WHERE org_id = ?",
+                (org_id or "",),
+            ):
+                coverage.setdefault(test_class, set()).add(covered)
+        return coverage
+
+    def full_coverage_at(self, org_id: T.Optional[str] = None) -> T.Optional[float]:
+        """When the coverage of every test class in the org was last saved."""
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT value FROM metadata WHERE key = ?",
+                (f"full_coverage_at:{org_id or ''}",),
+            ).fetchone()
+        return row[0] if row else None
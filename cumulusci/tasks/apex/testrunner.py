@@ -4,6 +4,8 @@ import html
 import io
 import json
 import re
+import statistics
+import time
 
 from cumulusci.core.exceptions import (
     ApexTestException,
@@ -11,7 +13,9 @@ from cumulusci.core.exceptions import (
     TaskOptionsError,
 )
 from cumulusci.core.utils import decode_to_unicode, process_bool_arg, process_list_arg
+from cumulusci.tasks.apex.history import ApexTestHistory
 from cumulusci.tasks.salesforce import BaseSalesforceApiTask
+from cumulusci.utils.git import changed_files
 from cumulusci.utils.http.requests_utils import safe_json_from_response
 
 APEX_LIMITS = {
@@ -77,6 +81,47 @@ FROM ApexTestResult
 WHERE AsyncApexJobId='{}'
 """
 
+# Statuses of test queue items which have not finished running
+UNFINISHED_STATUSES = ("Holding", "Queued", "Preparing", "Processing")
+# The number of test classes whose results are fetched in one query
+RESULT_QUERY_CLASSES = 100
+# The most records an sObject Collections request can update
+COLLECTION_SIZE = 200
+
+# Runtimes of test classes in recent test runs in the org, used to balance
+# test classes between shards. The org returns one row for each class.
+TEST_RUNTIME_QUERY = """
+SELECT ApexClassId, AVG(RunTime) runtime, COUNT_DISTINCT(MethodName) methods
+FROM ApexTestResult
+WHERE TestTimestamp = LAST_N_DAYS:{} AND ApexClassId IN ({})
+GROUP BY ApexClassId
+"""
+TEST_RUNTIME_DAYS = 14
+
+TEST_HISTORY_FILENAME = "apex_test_history.db"
+
+# The Apex classes and triggers covered by each test class in its last run
+TEST_COVERAGE_QUERY = """
+SELECT ApexTestClass.Name, ApexClassOrTrigger.Name
+FROM ApexCodeCoverage
+WHERE NumLinesCovered > 0
+"""
+APEX_SOURCE_SUFFIXES = (".cls", ".trigger")
+
+
+def partition_by_runtime(runtimes, count):
+    """Split items into `count` groups with similar total runtimes.
+
+    `runtimes` maps each item to its expected runtime. The longest items
+    are placed first, each in the group with the least runtime so far."""
+    groups = [[] for _ in range(min(count, len(runtimes)))]
+    totals = [0] * len(groups)
+    for item in sorted(runtimes, key=lambda item: runtimes[item], reverse=True):
+        i = totals.index(min(totals))
+        groups[i].append(item)
+        totals[i] += runtimes[item]
+    return groups
+
 
 class RunApexTests(BaseSalesforceApiTask):
     """Task to run Apex tests with the Tooling API and report results.
@@ -108,7 +153,36 @@ class RunApexTests(BaseSalesforceApiTask):
 
     Some projects' unit tests produce so many concurrency errors that
     it's faster to execute the entire run in serial mode than to use retries.
-    Serial and parallel mode are configured in the scratch org definition file."""
+    Serial and parallel mode are configured in the scratch org definition file.
+
+    Large suites can be split into several test runs with the ``shards``
+    option. Test classes are divided between the runs so that each takes
+    about the same time, based on the classes' runtimes in recent test
+    runs in the org. All of the runs are enqueued at once and their
+    results are reported together.
+
+    If ``test_history`` is True, the outcome and runtime of each test are
+    kept in a database in the project's ``.cci`` directory. It supplies
+    the runtimes used for sharding (each shard lists its slowest classes
+    first), and supports the ``failed_first``,
+    ``runtime_regression_threshold`` and ``changed_since`` options, which
+    turn it on unless it is set to False.
+
+    The ``changed_since`` option runs only the test classes affected by
+    the Apex classes and triggers changed since a git commit, using the
+    coverage of each test class in the org, which is saved in the history
+    after every run.
+    Test classes which have themselves changed, or have no saved coverage,
+    are always run. The whole suite runs instead when no coverage has been
+    saved yet or the last full run is older than ``full_run_interval``
+    days. Coverage is read from ``ApexCodeCoverage``, so the org must not
+    be set to store only aggregated code coverage.
+
+    With ``stream_results``, each poll asks only for the test classes which
+    have not finished yet, and the results of each class are fetched as
+    soon as it finishes, so failures are logged while the tests run. The
+    ``fail_fast`` option builds on this to abort the test run at the first
+    failure which will not be retried."""
 
     api_version = "38.0"
     name = "RunApexTests"
@@ -173,6 +247,47 @@ class RunApexTests(BaseSalesforceApiTask):
         "test_suite_names": {
             "description": "Accepts a comma-separated list of test suite names. Only runs test classes that are part of the test suites specified."
         },
+        "shards": {
+            "description": "The number of test runs to split the test classes between, "
+            "balanced by the classes' recent runtimes. The runs are enqueued at once. Defaults to 1."
+        },
+        "batch_retries": {
+            "description": "If True, failed tests are retried together in one test run "
+            "instead of one at a time. Defaults to True if shards is more than 1."
+        },
+        "test_history": {
+            "description": "If True, the outcome and runtime of each test are saved in the "
+            "project's .cci directory. The history is used to balance shards and by "
+            "failed_first, runtime_regression_threshold and changed_since. Defaults to "
+            "True if one of those options is set, and False otherwise."
+        },
+        "failed_first": {
+            "description": "If True, test classes which failed in the last test run in "
+            "the org are run before the rest. Requires test_history. Defaults to False."
+        },
+        "runtime_regression_threshold": {
+            "description": "If set, warn about tests whose runtime is more than this "
+            "percentage above their median runtime in the test history.",
+            "usage": "--runtime_regression_threshold PERCENTAGE",
+        },
+        "changed_since": {
+            "description": "A git commit, branch or tag. If set, only test classes which "
+            "cover the Apex classes and triggers changed since that commit are run, "
+            "according to the coverage saved in the test history. Requires test_history."
+        },
+        "stream_results": {
+            "description": "If True, fetch the results of each test class as soon as it "
+            "finishes and log failures while the tests run, and poll only for the test "
+            "classes which have not finished. Defaults to False."
+        },
+        "fail_fast": {
+            "description": "If True, abort the test run at the first failure which does "
+            "not match retry_failures. Implies stream_results. Defaults to False."
+        },
+        "full_run_interval": {
+            "description": "With changed_since, the number of days after which all of "
+            "the tests are run again to refresh the saved coverage. Defaults to 7."
+        },
     }
 
     def _init_options(self, kwargs):
@@ -226,6 +341,57 @@ class RunApexTests(BaseSalesforceApiTask):
 
         self.verbose = process_bool_arg(self.options.get("verbose") or False)
 
+        try:
+            self.options["shards"] = int(self.options.get("shards") or 1)
+        except ValueError:
+            self.options["shards"] = 0
+        if self.options["shards"] < 1:
+            raise TaskOptionsError("The shards option must be a positive integer.")
+        self.options["failed_first"] = process_bool_arg(
+            self.options.get("failed_first") or False
+        )
+        threshold = self.options.get("runtime_regression_threshold")
+        if threshold is not None:
+            try:
+                threshold = float(str(threshold).rstrip("%"))
+            except ValueError:
+                raise TaskOptionsError(
+                    f"Invalid runtime regression threshold {threshold}"
+                )
+        self.options["runtime_regression_threshold"] = threshold
+        self.options["test_history"] = process_bool_arg(
+            self.options.get(
+                "test_history",
+                bool(
+                    self.options["failed_first"]
+                    or threshold is not None
+                    or self.options.get("changed_since")
+                ),
+            )
+        )
+        self.options["fail_fast"] = process_bool_arg(
+            self.options.get("fail_fast") or False
+        )
+        self.options["stream_results"] = self.options["fail_fast"] or process_bool_arg(
+            self.options.get("stream_results") or False
+        )
+        if self.options.get("changed_since") and not self.options["test_history"]:
+            raise TaskOptionsError("The changed_since option requires test_history.")
+        try:
+            self.options["full_run_interval"] = float(
+                self.options.get("full_run_interval", 7)
+            )
+        except ValueError:
+            raise TaskOptionsError(
+                f"Invalid full run interval {self.options['full_run_interval']}"
+            )
+        batch_retries = self.options.get("batch_retries")
+        self.options["batch_retries"] = (
+            process_bool_arg(batch_retries)
+            if batch_retries is not None
+            else self.options["shards"] > 1
+        )
+
         self.counts = {}
 
         if "required_org_code_coverage_percent" in self.options:
@@ -257,6 +423,13 @@ class RunApexTests(BaseSalesforceApiTask):
         self.classes_by_id = {}
         self.classes_by_name = {}
         self.job_id = None
+        self.job_ids = []
+        self.history = None
+        self._history_runtimes = None
+        self.full_run = True
+        self.failed_fast = False
+        self.unfinished_items = None
+        self.queued_count = 0
         self.results_by_class_name = {}
         self.result = None
         self.retry_details = None
@@ -423,17 +596,13 @@ class RunApexTests(BaseSalesforceApiTask):
             for each_class in test_classes["records"]
         }
 
-        result = self.tooling.query_all(TEST_RESULT_QUERY.format(self.job_id))
-
         if allow_retries:
             self.retry_details = {}
 
-        for test_result in result["records"]:
-            class_name = self.classes_by_id[test_result["ApexClassId"]]
-            self.results_by_class_name[class_name][
-                test_result["MethodName"]
-            ] = test_result
-            self.counts[test_result["Outcome"]] += 1
+        # Streamed results were collected while polling.
+        if not self.options["stream_results"]:
+            result = self.tooling.query_all(TEST_RESULT_QUERY.format(self.job_id))
+            self._add_test_results(result["records"])
 
         # If we have class-level failures that did not come with line-level
         # failure details, report those as well.
@@ -489,6 +658,14 @@ class RunApexTests(BaseSalesforceApiTask):
                                 test_result["ApexClassId"], []
                             ).append(test_result["MethodName"])
 
+    def _add_test_results(self, records):
+        for test_result in records:
+            class_name = self.classes_by_id[test_result["ApexClassId"]]
+            self.results_by_class_name[class_name][
+                test_result["MethodName"]
+            ] = test_result
+            self.counts[test_result["Outcome"]] += 1
+
     def _process_test_results(self):
         test_results = []
         class_names = list(self.results_by_class_name.keys())
@@ -634,12 +811,13 @@ class RunApexTests(BaseSalesforceApiTask):
             "Skip": 0,
             "Retriable": 0,
         }
-        self.job_id = self._enqueue_test_run(
-            (str(id) for id in self.classes_by_id.keys())
-        )
-
-        self._wait_for_tests()
-        self._get_test_results()
+        self.history = self._get_test_history()
+        if self.options.get("changed_since") and self.history:
+            self._select_changed_tests()
+            if not self.classes_by_id:
+                self.logger.info("No test classes cover the changed Apex code.")
+                return
+        self._run_test_phases(self._plan_test_phases())
 
         # Did we get back retriable test results? Check our retry policy,
         # then enqueue new runs individually, until either (a) all retriable
@@ -654,6 +832,11 @@ class RunApexTests(BaseSalesforceApiTask):
 
         test_results = self._process_test_results()
         self._write_output(test_results)
+        if self.history:
+            if self.options["runtime_regression_threshold"] is not None:
+                self._report_runtime_regressions(test_results)
+            self.history.record(test_results, self.org_config.org_id)
+            self._record_coverage()
 
         if self.counts.get("Fail") or self.counts.get("CompileFail"):
             raise ApexTestException(
@@ -674,6 +857,170 @@ class RunApexTests(BaseSalesforceApiTask):
                 "No code coverage level specified; not checking code coverage."
             )
 
+    def _get_test_history(self):
+        if not self.options["test_history"] or not self.project_config.repo_root:
+            return None
+        return ApexTestHistory(self.project_config.cache_dir / TEST_HISTORY_FILENAME)
+
+    def _get_history_runtimes(self):
+        if self._history_runtimes is None:
+            self._history_runtimes = self.history.class_runtimes()
+        return self._history_runtimes
+
+    def _get_class_runtimes(self, class_ids=None):
+        """Expected runtime in milliseconds of each test class.
+
+        Runtimes come from the local test history if it has them, or else
+        from the average runtime of the class's methods in recent test runs
+        in the org. Classes with neither are given the median runtime."""
+        if class_ids is None:
+            class_ids = list(self.classes_by_id)
+        runtimes = {}
+        if self.history:
+            by_name = self._get_history_runtimes()
+            for class_id in class_ids:
+                if self.classes_by_id[class_id] in by_name:
+                    runtimes[class_id] = by_name[self.classes_by_id[class_id]]
+        missing = [class_id for class_id in class_ids if class_id not in runtimes]
+        for start in range(0, len(missing), RESULT_QUERY_CLASSES):
+            ids = ", ".join(
+                f"'{class_id}'"
+                for class_id in missing[start : start + RESULT_QUERY_CLASSES]
+            )
+            result = self.tooling.query_all(
+                TEST_RUNTIME_QUERY.format(TEST_RUNTIME_DAYS, ids)
+            )
+            for record in result["records"]:
+                runtimes[record["ApexClassId"]] = (record["runtime"] or 0) * (
+                    record["methods"] or 0
+                )
+        default = statistics.median(runtimes.values()) if runtimes else 1
+        return {class_id: runtimes.get(class_id, default) for class_id in class_ids}
+
+    def _plan_test_phases(self):
+        """Group the test classes into the test runs to enqueue.
+
+        Each phase is a list of test runs, which are enqueued together once
+        the runs of the previous phase have finished."""
+        class_ids = list(self.classes_by_id)
+        phases = []
+        if self.options["failed_first"] and self.history:
+            failed = self.history.failed_classes(self.org_config.org_id)
+            first = [id for id in class_ids if self.classes_by_id[id] in failed]
+            if first:
+                self.logger.info(
+                    f"Running {len(first)} test classes which failed in the last run first"
+                )
+                phases.append([first])
+                class_ids = [id for id in class_ids if id not in first]
+        if self.options["shards"] > 1:
+            shards = partition_by_runtime(
+                self._get_class_runtimes(class_ids), self.options["shards"]
+            )
+            self.logger.info(f"Running tests in {len(shards)} shards")
+            phases.append(shards)
+        else:
+            phases.append([class_ids])
+        return [[ids for ids in phase if ids] for phase in phases if any(phase)]
+
+    def _run_test_phases(self, phases):
+        self.job_ids = []
+        for i, phase in enumerate(phases):
+            job_ids = [self._enqueue_test_run([str(id) for id in ids]) for ids in phase]
+            self.job_ids.extend(job_ids)
+            # The runs execute together in the org, so waiting for each in turn
+            # takes about as long as the slowest one.
+            for j, job_id in enumerate(job_ids):
+                self.job_id = job_id
+                already_failed = self.failed_fast
+                self._wait_for_tests()
+                if self.failed_fast and not already_failed:
+                    self._abort_test_runs(job_ids[j + 1 :])
+                # Retriable failures are found once all of the results are in.
+                last = i == len(phases) - 1 and j == len(job_ids) - 1
+                self._get_test_results(allow_retries=last)
+            if self.failed_fast:
+                break
+            if i < len(phases) - 1:
+                self.logger.info(
+                    f"Pass: {self.counts['Pass']}  Fail: {self.counts['Fail']} so far"
+                )
+
+    def _select_changed_tests(self):
+        """Keep only the test classes affected by the Apex classes and
+        triggers changed since the changed_since commit."""
+        coverage = self.history.coverage(self.org_config.org_id)
+        full_coverage_at = self.history.full_coverage_at(self.org_config.org_id)
+        interval = self.options["full_run_interval"] * 24 * 60 * 60
+        if not coverage or not full_coverage_at:
+            self.logger.info("No test coverage has been saved; running all tests.")
+            return
+        if time.time() - full_coverage_at > interval:
+            self.logger.info(
+                f"The last full test run was more than "
+                f"{self.options['full_run_interval']:g} days ago; running all tests."
+            )
+            return
+
+        paths = changed_files(
+            str(self.project_config.repo_root), self.options["changed_since"]
+        )
+        if paths is None:
+            self.logger.warning(
+                f"Could not list the files changed since "
+                f"{self.options['changed_since']}; running all tests."
+            )
+            return
+        changed = {
+            path.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+            for path in paths
+            if path.endswith(APEX_SOURCE_SUFFIXES)
+        }
+        selected = {
+            name: id
+            for name, id in self.classes_by_name.items()
+            if name in changed or name not in coverage or coverage[name] & changed
+        }
+        self.logger.info(
+            f"{len(changed)} Apex classes and triggers changed since "
+            f"{self.options['changed_since']}; running {len(selected)} of "
+            f"{len(self.classes_by_name)} test classes."
+        )
+        self.full_run = len(selected) == len(self.classes_by_name)
+        self.classes_by_name = selected
+        self.classes_by_id = {id: name for name, id in selected.items()}
+        self.results_by_class_name = {name: {} for name in selected}
+
+    def _record_coverage(self):
+        """Save the classes and triggers covered by each test class which ran."""
+        coverage = {name: set() for name in self.classes_by_name}
+        class_ids = list(self.classes_by_id)
+        for start in range(0, len(class_ids), RESULT_QUERY_CLASSES):
+            ids = ", ".join(
+                f"'{class_id}'"
+                for class_id in class_ids[start : start + RESULT_QUERY_CLASSES]
+            )
+            result = self.tooling.query_all(
+                TEST_COVERAGE_QUERY + f"AND ApexTestClassId IN ({ids})"
+            )
+            for record in result["records"]:
+                test_class = (record.get("ApexTestClass") or {}).get("Name")
+                covered = (record.get("ApexClassOrTrigger") or {}).get("Name")
+                if test_class in coverage and covered:
+                    coverage[test_class].add(covered)
+        self.history.record_coverage(
+            coverage, self.org_config.org_id, full=self.full_run
+        )
+
+    def _report_runtime_regressions(self, test_results):
+        threshold = self.options["runtime_regression_threshold"]
+        regressions = self.history.find_regressions(test_results, threshold)
+        for class_name, method_name, runtime, median in regressions:
+            self.logger.warning(
+                f"{class_name}.{method_name} took {runtime}ms, "
+                f"more than {threshold:g}% above its usual {median:.0f}ms"
+            )
+
     def _check_code_coverage(self):
         self.logger.info("Checking code coverage.")
         class_level_coverage_failures = {}
@@ -743,6 +1090,23 @@ class RunApexTests(BaseSalesforceApiTask):
         )
         self.counts["Fail"] = 0
 
+        if self.options["batch_retries"]:
+            # Classes retried for missing method names list all of their methods at once
+            tests = {
+                class_id: [
+                    method
+                    for test in test_list
+                    for method in (test if isinstance(test, list) else [test])
+                ]
+                for class_id, test_list in self.retry_details.items()
+            }
+            self.job_id = self._enqueue_test_run(tests)
+            self._wait_for_tests()
+            self._get_test_results(allow_retries=False)
+            if self.counts["Fail"]:
+                self.logger.error("Test retry failed.")
+            return
+
         for class_id, test_list in self.retry_details.items():
             for each_test in test_list:
                 self.logger.warning(
@@ -760,9 +1124,13 @@ class RunApexTests(BaseSalesforceApiTask):
         self.poll_complete = False
         self.poll_interval_s = int(self.options.get("poll_interval", 1))
         self.poll_count = 0
+        self.unfinished_items = None
         self._poll()
 
     def _poll_action(self):
+        if self.options["stream_results"]:
+            self._poll_unfinished_tests()
+            return
         self.result = self.tooling.query_all(
             "SELECT Id, Status, ApexClassId FROM ApexTestQueueItem "
             + "WHERE ParentJobId = '{}'".format(self.job_id)
@@ -800,6 +1168,102 @@ class RunApexTests(BaseSalesforceApiTask):
             self.logger.info("Apex tests completed")
             self.poll_complete = True
 
+    def _poll_unfinished_tests(self):
+        """Poll for the test classes which had not finished at the last poll,
+        and fetch the results of those which have finished since."""
+        query = (
+            "SELECT Id, Status, ApexClassId FROM ApexTestQueueItem "
+            + f"WHERE ParentJobId = '{self.job_id}'"
+        )
+        if self.unfinished_items is None:
+            records = self.tooling.query_all(query)["records"]
+            self.queued_count = len(records)
+            previous = {item["Id"]: item["ApexClassId"] for item in records}
+        else:
+            statuses = ", ".join(f"'{status}'" for status in UNFINISHED_STATUSES)
+            records = self.tooling.query_all(f"{query} AND Status IN ({statuses})")[
+                "records"
+            ]
+            previous = self.unfinished_items
+        unfinished = [item for item in records if item["Status"] in UNFINISHED_STATUSES]
+        self.unfinished_items = {item["Id"]: item["ApexClassId"] for item in unfinished}
+        finished = [
+            class_id
+            for item_id, class_id in previous.items()
+            if item_id not in self.unfinished_items
+        ]
+        self._stream_test_results(finished)
+
+        processing = [item for item in unfinished if item["Status"] == "Processing"]
+        processing_class = ""
+        if len(processing) == 1:
+            processing_class = f" ({self.classes_by_id[processing[0]['ApexClassId']]})"
+        self.logger.info(
+            f"Completed: {self.queued_count - len(unfinished)}  "
+            f"Processing: {len(processing)}{processing_class}  "
+            f"Queued: {len(unfinished) - len(processing)}"
+        )
+        if self.failed_fast and self.unfinished_items:
+            self._abort_test_runs([self.job_id])
+            self.unfinished_items = {}
+        if not self.unfinished_items:
+            self.logger.info("Apex tests completed")
+            self.poll_complete = True
+
+    def _stream_test_results(self, class_ids):
+        """Fetch and log the results of test classes which have finished."""
+        for start in range(0, len(class_ids), RESULT_QUERY_CLASSES):
+            ids = ", ".join(
+                f"'{class_id}'"
+                for class_id in class_ids[start : start + RESULT_QUERY_CLASSES]
+            )
+            records = self.tooling.query_all(
+                TEST_RESULT_QUERY.format(self.job_id) + f"AND ApexClassId IN ({ids})"
+            )["records"]
+            self._add_test_results(records)
+            for test_result in records:
+                if test_result["Outcome"] not in ("Fail", "CompileFail"):
+                    continue
+                class_name = self.classes_by_id[test_result["ApexClassId"]]
+                self.logger.error(
+                    f"{test_result['Outcome']}: {class_name}.{test_result['MethodName']}"
+                    f" - {test_result['Message']}"
+                )
+                if self.options["fail_fast"] and not self._is_retriable_failure(
+                    test_result
+                ):
+                    self.failed_fast = True
+
+    def _abort_test_runs(self, job_ids):
+        """Abort the test classes of the test runs which have not finished."""
+        if not job_ids:
+            return
+        jobs = ", ".join(f"'{job_id}'" for job_id in job_ids)
+        statuses = ", ".join(f"'{status}'" for status in UNFINISHED_STATUSES)
+        items = self.tooling.query_all(
+            "SELECT Id FROM ApexTestQueueItem "
+            + f"WHERE ParentJobId IN ({jobs}) AND Status IN ({statuses})"
+        )["records"]
+        self.logger.warning(
+            f"Aborting {len(items)} test classes after a test failed (fail_fast)"
+        )
+        for start in range(0, len(items), COLLECTION_SIZE):
+            self.sf.restful(
+                "composite/sobjects",
+                method="PATCH",
+                json={
+                    "allOrNone": False,
+                    "records": [
+                        {
+                            "attributes": {"type": "ApexTestQueueItem"},
+                            "id": item["Id"],
+                            "Status": "Aborted",
+                        }
+                        for item in items[start : start + COLLECTION_SIZE]
+                    ],
+                },
+            )
+
     def _write_output(self, test_results):
         junit_output = self.options["junit_output"]
         if junit_output:
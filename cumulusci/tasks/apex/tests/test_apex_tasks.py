@@ -1,10 +1,12 @@
 import http.client
+import json
 import logging
 import os
 import shutil
 import tempfile
+import time
 from copy import deepcopy
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import MagicMock, Mock, call, patch
 
 import pytest
 import responses
@@ -30,7 +32,8 @@ from cumulusci.core.keychain import BaseProjectKeychain
 from cumulusci.core.tests.utils import MockLoggerMixin
 from cumulusci.tasks.apex.anon import AnonymousApexTask
 from cumulusci.tasks.apex.batch import BatchApexWait
-from cumulusci.tasks.apex.testrunner import RunApexTests
+from cumulusci.tasks.apex.history import ApexTestHistory
+from cumulusci.tasks.apex.testrunner import RunApexTests, partition_by_runtime
 from cumulusci.utils.version_strings import StrictVersion
 
 
@@ -753,6 +756,450 @@ class TestRunApexTests(MockLoggerMixin):
             }
         )
 
+    @responses.activate
+    def test_run_task__batch_retries(self):
+        self._mock_apex_class_query()
+        self._mock_run_tests()
+        self._mock_run_tests(body="JOBID_9999")
+        self._mock_get_failed_test_classes()
+        self._mock_get_failed_test_classes(job_id="JOBID_9999")
+        self._mock_tests_complete()
+        self._mock_tests_complete(job_id="JOBID_9999")
+        self._mock_get_test_results_multiple(
+            ["TestOne", "TestTwo"],
+            ["Fail", "Fail"],
+            ["UNABLE_TO_LOCK_ROW", "UNABLE_TO_LOCK_ROW"],
+        )
+        self._mock_get_test_results_multiple(
+            ["TestOne", "TestTwo"], ["Pass", "Pass"], ["", ""], job_id="JOBID_9999"
+        )
+        task_config = TaskConfig()
+        task_config.config["options"] = {
+            "junit_output": "results_junit.xml",
+            "poll_interval": 1,
+            "test_name_match": "%_TEST",
+            "retry_failures": ["UNABLE_TO_LOCK_ROW"],
+            "batch_retries": True,
+        }
+        task = RunApexTests(self.project_config, task_config, self.org_config)
+        task()
+
+        run_calls = [
+            call
+            for call in responses.calls
+            if "runTestsAsynchronous" in call.request.url
+        ]
+        assert len(run_calls) == 2
+        assert json.loads(run_calls[1].request.body) == {
+            "tests": [{"classId": 1, "testMethods": ["TestOne", "TestTwo"]}]
+        }
+        assert task.counts["Fail"] == 0
+
+    def test_run_sharded_tests(self):
+        task_config = TaskConfig()
+        task_config.config["options"] = {
+            "junit_output": "results_junit.xml",
+            "poll_interval": 1,
+            "test_name_match": "%_TEST",
+            "shards": 2,
+        }
+        task = RunApexTests(self.project_config, task_config, self.org_config)
+        task._init_class()
+        task.classes_by_id = {"A": "A_TEST", "B": "B_TEST", "C": "C_TEST"}
+        task.tooling = Mock()
+        task.tooling.query_all.return_value = {
+            "records": [
+                {"ApexClassId": "A", "runtime": 500.0, "methods": 1},
+                {"ApexClassId": "B", "runtime": 150.0, "methods": 2},
+            ]
+        }
+        task._enqueue_test_run = Mock(side_effect=["JOB1", "JOB2"])
+        task._wait_for_tests = Mock()
+        task._get_test_results = Mock()
+
+        assert task._get_class_runtimes() == {"A": 500, "B": 300, "C": 400}
+        query = task.tooling.query_all.call_args[0][0]
+        assert "GROUP BY ApexClassId" in query
+        assert "ApexClassId IN ('A', 'B', 'C')" in query
+        task._run_test_phases(task._plan_test_phases())
+
+        assert task.options["batch_retries"]
+        assert [c.args[0] for c in task._enqueue_test_run.call_args_list] == [
+            ["A"],
+            ["C", "B"],
+        ]
+        assert task.job_ids == ["JOB1", "JOB2"]
+        assert task._get_test_results.call_args_list == [
+            ((), {"allow_retries": False}),
+            ((), {"allow_retries": True}),
+        ]
+
+    def test_run_task__test_history(self, tmp_path):
+        task_config = TaskConfig()
+        task_config.config["options"] = {
+            "test_name_match": "%_TEST",
+            "shards": 2,
+            "failed_first": True,
+            "runtime_regression_threshold": "50%",
+        }
+        task = RunApexTests(self.project_config, task_config, self.org_config)
+        task._init_class()
+        task.classes_by_id = {"A": "A_TEST", "B": "B_TEST", "C": "C_TEST"}
+        history = ApexTestHistory(tmp_path / "history.db")
+        history.record(
+            [
+                {
+                    "ClassName": name,
+                    "Method": "test",
+                    "Outcome": "Fail" if name == "C_TEST" else "Pass",
+                    "Stats": {"duration": duration},
+                }
+                for name, duration in [("A_TEST", 100), ("B_TEST", 300), ("C_TEST", 9)]
+            ],
+            org_id=self.org_config.org_id,
+        )
+        task.tooling = Mock()
+
+        with patch.object(task, "_get_test_history", return_value=history):
+            task.history = task._get_test_history()
+            assert task._plan_test_phases() == [[["C"]], [["B"], ["A"]]]
+        task.tooling.query_all.assert_not_called()
+
+        task._report_runtime_regressions(
+            [
+                {
+                    "ClassName": "B_TEST",
+                    "Method": "test",
+                    "Outcome": "Pass",
+                    "Stats": {"duration": 1500},
+                }
+            ]
+        )
+        assert self.task_log["warning"] == [
+            "B_TEST.test took 1500ms, more than 50% above its usual 300ms"
+        ]
+
+    def test_get_test_history(self, tmp_path):
+        task_config = TaskConfig()
+        task_config.config["options"] = {
+            "test_name_match": "%_TEST",
+            "test_history": True,
+        }
+        task = RunApexTests(self.project_config, task_config, self.org_config)
+        with patch.object(BaseProjectConfig, "repo_root", "/repo"), patch.object(
+            BaseProjectConfig, "cache_dir", tmp_path
+        ):
+            assert task._get_test_history().path == tmp_path / "apex_test_history.db"
+            task.options["test_history"] = False
+            assert task._get_test_history() is None
+
+    def test_init_options__test_history_default(self):
+        task_config = TaskConfig()
+        task_config.config["options"] = {"test_name_match": "%_TEST"}
+        task = RunApexTests(self.project_config, task_config, self.org_config)
+        assert not task.options["test_history"]
+
+        task_config.config["options"]["failed_first"] = True
+        task = RunApexTests(self.project_config, task_config, self.org_config)
+        assert task.options["test_history"]
+
+    def test_select_changed_tests(self, tmp_path):
+        task_config = TaskConfig()
+        task_config.config["options"] = {
+            "test_name_match": "%_TEST",
+            "changed_since": "main",
+        }
+        task = RunApexTests(self.project_config, task_config, self.org_config)
+        task._init_class()
+        task.classes_by_name = {
+            "A_TEST": "A",
+            "B_TEST": "B",
+            "C_TEST": "C",
+            "D_TEST": "D",
+        }
+        task.classes_by_id = {id: name for name, id in task.classes_by_name.items()}
+        task.history = ApexTestHistory(tmp_path / "history.db")
+        task.history.record_coverage(
+            {"A_TEST": {"Foo"}, "B_TEST": {"Bar"}, "C_TEST": {"Baz"}},
+            self.org_config.org_id,
+            full=True,
+        )
+
+        with patch(
+            "cumulusci.tasks.apex.testrunner.changed_files",
+            return_value=[
+                "force-app/main/default/classes/Foo.cls",
+                "force-app/main/default/classes/C_TEST.cls",
+                "force-app/main/default/classes/Bar.cls-meta.xml",
+                "README.md",
+            ],
+        ) as changed_files:
+            task._select_changed_tests()
+        changed_files.assert_called_once_with(
+            str(self.project_config.repo_root), "main"
+        )
+        assert task.classes_by_id == {"A": "A_TEST", "C": "C_TEST", "D": "D_TEST"}
+        assert list(task.results_by_class_name) == ["A_TEST", "C_TEST", "D_TEST"]
+        assert not task.full_run
+
+        task.tooling = Mock()
+        task.tooling.query_all.return_value = {
+            "records": [
+                {
+                    "ApexTestClass": {"Name": "A_TEST"},
+                    "ApexClassOrTrigger": {"Name": "Qux"},
+                },
+                {
+                    "ApexTestClass": {"Name": "B_TEST"},
+                    "ApexClassOrTrigger": {"Name": "Foo"},
+                },
+                {
+                    "ApexTestClass": {"Name": "D_TEST"},
+                    "ApexClassOrTrigger": {"Name": "Foo"},
+                },
+            ]
+        }
+        task._record_coverage()
+        task.tooling.query_all.assert_called_once()
+        assert task.tooling.query_all.call_args[0][0].endswith(
+            "AND ApexTestClassId IN ('A', 'C', 'D')"
+        )
+        assert task.history.coverage(self.org_config.org_id) == {
+            "A_TEST": {"Qux"},
+            "B_TEST": {"Bar"},
+            "D_TEST": {"Foo"},
+        }
+
+    def test_run_task__records_coverage(self, tmp_path):
+        task_config = TaskConfig()
+        task_config.config["options"] = {
+            "test_name_match": "%_TEST",
+            "test_history": True,
+        }
+        task = RunApexTests(self.project_config, task_config, self.org_config)
+        task._init_class()
+        task._get_test_classes = Mock(
+            return_value={"totalSize": 1, "records": [{"Id": "A", "Name": "A_TEST"}]}
+        )
+        task._get_test_history = Mock(
+            return_value=ApexTestHistory(tmp_path / "history.db")
+        )
+        task._run_test_phases = Mock()
+        task._process_test_results = Mock(return_value=[])
+        task._write_output = Mock()
+        task.tooling = Mock()
+        task.tooling.query_all.return_value = {
+            "records": [
+                {
+                    "ApexTestClass": {"Name": "A_TEST"},
+                    "ApexClassOrTrigger": {"Name": "Foo"},
+                }
+            ]
+        }
+        task._run_task()
+
+        assert task.history.coverage(self.org_config.org_id) == {"A_TEST": {"Foo"}}
+        assert task.history.full_coverage_at(self.org_config.org_id) is not None
+
+    def test_select_changed_tests__full_run(self, tmp_path):
+        task_config = TaskConfig()
+        task_config.config["options"] = {
+            "test_name_match": "%_TEST",
+            "changed_since": "main",
+            "full_run_interval": "1",
+        }
+        task = RunApexTests(self.project_config, task_config, self.org_config)
+        task._init_class()
+        task.classes_by_name = {"A_TEST": "A"}
+        task.classes_by_id = {"A": "A_TEST"}
+        task.history = ApexTestHistory(tmp_path / "history.db")
+
+        with patch("cumulusci.tasks.apex.testrunner.changed_files") as changed_files:
+            task._select_changed_tests()
+            task.history.record_coverage(
+                {"A_TEST": {"Foo"}}, self.org_config.org_id, full=True
+            )
+            with patch("time.time", return_value=time.time() + 2 * 24 * 60 * 60):
+                task._select_changed_tests()
+        changed_files.assert_not_called()
+        assert task.classes_by_id == {"A": "A_TEST"}
+        assert task.full_run
+        assert self.task_log["info"] == [
+            "No test coverage has been saved; running all tests.",
+            "The last full test run was more than 1 days ago; running all tests.",
+        ]
+
+    def test_select_changed_tests__git_error(self, tmp_path):
+        task_config = TaskConfig()
+        task_config.config["options"] = {
+            "test_name_match": "%_TEST",
+            "changed_since": "missing",
+        }
+        task = RunApexTests(self.project_config, task_config, self.org_config)
+        task._init_class()
+        task.classes_by_name = {"A_TEST": "A", "B_TEST": "B"}
+        task.classes_by_id = {"A": "A_TEST", "B": "B_TEST"}
+        task.history = ApexTestHistory(tmp_path / "history.db")
+        task.history.record_coverage(
+            {"A_TEST": {"Foo"}}, self.org_config.org_id, full=True
+        )
+
+        with patch("cumulusci.tasks.apex.testrunner.changed_files", return_value=None):
+            task._select_changed_tests()
+        assert task.classes_by_id == {"A": "A_TEST", "B": "B_TEST"}
+        assert task.full_run
+        assert self.task_log["warning"] == [
+            "Could not list the files changed since missing; running all tests."
+        ]
+
+    def test_init_options__changed_since_without_history(self):
+        task_config = TaskConfig()
+        task_config.config["options"] = {
+            "test_name_match": "%_TEST",
+            "changed_since": "main",
+            "test_history": False,
+        }
+        with pytest.raises(TaskOptionsError):
+            RunApexTests(self.project_config, task_config, self.org_config)
+
+    def _make_streaming_task(self, **options):
+        task_config = TaskConfig()
+        task_config.config["options"] = {"test_name_match": "%_TEST", **options}
+        task = RunApexTests(self.project_config, task_config, self.org_config)
+        task._init_class()
+        task.classes_by_id = {"A": "A_TEST", "B": "B_TEST"}
+        task.classes_by_name = {"A_TEST": "A", "B_TEST": "B"}
+        task.results_by_class_name = {"A_TEST": {}, "B_TEST": {}}
+        task.counts = {"Pass": 0, "Fail": 0, "CompileFail": 0, "Skip": 0}
+        task.job_id = "JOB"
+        task.tooling = Mock(base_url="https://tooling/")
+        task.sf = Mock()
+        return task
+
+    def _test_result(self, class_id, outcome="Pass"):
+        return {
+            "ApexClassId": class_id,
+            "MethodName": "test",
+            "Outcome": outcome,
+            "Message": "Boom" if outcome == "Fail" else None,
+            "StackTrace": None,
+            "RunTime": 10,
+        }
+
+    def test_poll_action__stream_results(self):
+        task = self._make_streaming_task(stream_results=True)
+        task.tooling.query_all.side_effect = [
+            {
+                "records": [
+                    {"Id": "1", "Status": "Completed", "ApexClassId": "A"},
+                    {"Id": "2", "Status": "Processing", "ApexClassId": "B"},
+                ]
+            },
+            {"records": [self._test_result("A", "Fail")]},
+            {"records": []},
+            {"records": [self._test_result("B")]},
+        ]
+
+        task._wait_for_tests()
+
+        queries = [call[0][0] for call in task.tooling.query_all.call_args_list]
+        assert queries[1].endswith("AND ApexClassId IN ('A')")
+        assert queries[2] == (
+            "SELECT Id, Status, ApexClassId FROM ApexTestQueueItem "
+            "WHERE ParentJobId = 'JOB' AND Status IN "
+            "('Holding', 'Queued', 'Preparing', 'Processing')"
+        )
+        assert queries[3].endswith("AND ApexClassId IN ('B')")
+        assert task.counts["Pass"] == 1 and task.counts["Fail"] == 1
+        assert task.results_by_class_name["B_TEST"]["test"]["Outcome"] == "Pass"
+        assert self.task_log["error"] == ["Fail: A_TEST.test - Boom"]
+        assert self.task_log["info"] == [
+            "Completed: 1  Processing: 1 (B_TEST)  Queued: 0",
+            "Completed: 2  Processing: 0  Queued: 0",
+            "Apex tests completed",
+        ]
+        assert not task.failed_fast
+
+        task.tooling.query_all.reset_mock(side_effect=True)
+        task.tooling.query_all.return_value = {"records": []}
+        task._get_test_results()
+        task.tooling.query_all.assert_called_once()
+        assert task.counts["Fail"] == 1
+
+    def test_run_test_phases__fail_fast(self):
+        task = self._make_streaming_task(fail_fast=True)
+        assert task.options["stream_results"]
+        task.classes_by_id.update({"C": "C_TEST", "D": "D_TEST"})
+        task.tooling.query_all.side_effect = [
+            {
+                "records": [
+                    {"Id": "1", "Status": "Completed", "ApexClassId": "A"},
+                    {"Id": "2", "Status": "Queued", "ApexClassId": "B"},
+                ]
+            },
+            {"records": [self._test_result("A", "Fail")]},
+            {"records": [{"Id": "2"}]},
+            {"records": [{"Id": "3"}]},
+            {"records": []},
+            {"records": [{"Id": "3", "Status": "Aborted", "ApexClassId": "C"}]},
+            {"records": []},
+            {"records": []},
+        ]
+
+        with patch.object(
+            task, "_enqueue_test_run", side_effect=["JOB1", "JOB2"]
+        ) as enqueue:
+            task._run_test_phases([[["A", "B"], ["C"]], [["D"]]])
+
+        assert task.failed_fast
+        assert enqueue.call_count == 2
+        assert task.tooling.query_all.call_args_list[3][0][0] == (
+            "SELECT Id FROM ApexTestQueueItem WHERE ParentJobId IN ('JOB2') "
+            "AND Status IN ('Holding', 'Queued', 'Preparing', 'Processing')"
+        )
+        assert task.sf.restful.call_args_list == [
+            call(
+                "composite/sobjects",
+                method="PATCH",
+                json={
+                    "allOrNone": False,
+                    "records": [
+                        {
+                            "attributes": {"type": "ApexTestQueueItem"},
+                            "id": id,
+                            "Status": "Aborted",
+                        }
+                    ],
+                },
+            )
+            for id in ("2", "3")
+        ]
+        assert task.counts["Fail"] == 1
+
+    def test_abort_test_runs__batches(self):
+        task = self._make_streaming_task(fail_fast=True)
+        task.tooling.query_all.return_value = {
+            "records": [{"Id": str(i)} for i in range(250)]
+        }
+        task._abort_test_runs(["JOB"])
+
+        batches = [c.kwargs["json"]["records"] for c in task.sf.restful.call_args_list]
+        assert [len(batch) for batch in batches] == [200, 50]
+        assert batches[1][-1]["id"] == "249"
+
+    def test_partition_by_runtime(self):
+        assert partition_by_runtime({"a": 5, "b": 4, "c": 3, "d": 3}, 2) == [
+            ["a", "d"],
+            ["b", "c"],
+        ]
+        assert partition_by_runtime({"a": 1}, 3) == [["a"]]
+
+    def test_init_options__bad_shards(self):
+        task_config = TaskConfig()
+        task_config.config["options"] = {"test_name_match": "%_TEST", "shards": "0"}
+        with pytest.raises(TaskOptionsError):
+            RunApexTests(self.project_config, task_config, self.org_config)
+
     def test_init_options__regexes(self):
         task_config = TaskConfig()
         task_config.config["options"] = {
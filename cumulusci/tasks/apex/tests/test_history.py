@@ -0,0 +1,98 @@
+from unittest import mock
+
+from cumulusci.tasks.apex import history
+from cumulusci.tasks.apex.history import ApexTestHistory
+
+
+def result(class_name, method, outcome="Pass", duration=100):
+    return {
+        "ClassName": class_name,
+        "Method": method,
+        "Outcome": outcome,
+        "Stats": {"duration": duration},
+    }
+
+
+class TestApexTestHistory:
+    def test_class_runtimes(self, tmp_path):
+        test_history = ApexTestHistory(tmp_path / "history.db")
+        test_history.record([result("A", "one", duration=100), result("A", "two")])
+        test_history.record([result("A", "one", duration=300), result("B", "one")])
+
+        assert test_history.class_runtimes() == {"A": 400, "B": 100}
+
+    def test_failed_classes(self, tmp_path):
+        test_history = ApexTestHistory(tmp_path / "history.db")
+        test_history.record([result("A", "one", "Fail"), result("B", "one", "Fail")])
+        test_history.record([result("A", "one")], org_id="00D1")
+        test_history.record([result("B", "one", "CompileFail")], org_id="00D2")
+        test_history.record([result("A", "one")])
+
+        assert test_history.failed_classes() == {"B"}
+        assert test_history.failed_classes("00D1") == set()
+        assert test_history.failed_classes("00D2") == {"B"}
+
+    def test_record__keeps_recent_runs(self, tmp_path):
+        test_history = ApexTestHistory(tmp_path / "history.db")
+        with mock.patch.object(history, "MAX_RUNS", 2):
+            for duration in (100, 200, 300):
+                test_history.record([result("A", "one", duration=duration)])
+            test_history.record([result("A", "one", "Fail")], org_id="00D1")
+
+        regressions = test_history.find_regressions(
+            [result("A", "one", duration=1300)], 100
+        )
+        assert regressions == [("A", "one", 1300, 250)]
+
+    def test_find_regressions(self, tmp_path):
+        test_history = ApexTestHistory(tmp_path / "history.db")
+        test_history.record(
+            [result("A", "one", duration=2000), result("A", "two", duration=10)]
+        )
+
+        assert (
+            test_history.find_regressions(
+                [
+                    result("A", "one", duration=2900),
+                    result("A", "two", duration=500),
+                    result("A", "three", duration=9000),
+                    result("A", "one", "Fail", duration=9000),
+                ],
+                40,
+            )
+            == []
+        )
+        assert test_history.find_regressions(
+            [result("A", "one", duration=3100)], 50
+        ) == [("A", "one", 3100, 2000)]
+
+    def test_record_coverage(self, tmp_path):
+        test_history = ApexTestHistory(tmp_path / "history.db")
+        assert test_history.coverage() == {}
+        assert test_history.full_coverage_at() is None
+
+        test_history.record_coverage({"A": {"Foo", "Bar"}, "B": {"Foo"}}, full=True)
+        full_coverage_at = test_history.full_coverage_at()
+        assert full_coverage_at is not None
+        test_history.record_coverage({"A": {"Baz"}, "C": set()})
+
+        assert test_history.coverage() == {"A": {"Baz"}, "B": {"Foo"}}
+        assert test_history.full_coverage_at() == full_coverage_at
+
+        test_history.record_coverage({"C": {"Foo"}}, full=True)
+        assert test_history.coverage() == {"C": {"Foo"}}
+
+    def test_record_coverage__by_org(self, tmp_path):
+        test_history = ApexTestHistory(tmp_path / "history.db")
+        test_history.record_coverage({"A": {"Foo"}}, "00D1", full=True)
+        test_history.record_coverage({"A": {"Bar"}}, "00D2")
+
+        assert test_history.coverage("00D1") == {"A": {"Foo"}}
+        assert test_history.coverage("00D2") == {"A": {"Bar"}}
+        assert test_history.coverage() == {}
+        assert test_history.full_coverage_at("00D1") is not None
+        assert test_history.full_coverage_at("00D2") is None
+
+        test_history.record_coverage({"B": {"Foo"}}, "00D2", full=True)
+        assert test_history.coverage("00D1") == {"A": {"Foo"}}
+        assert test_history.coverage("00D2") == {"B": {"Foo"}}
@@ -40,6 +40,7 @@ class DeleteData(BaseSalesforceApiTask):
         },
     }
     row_warning_limit = 10
+    changes_records = True
 
     def _init_options(self, kwargs):
         super(DeleteData, self)._init_options(kwargs)
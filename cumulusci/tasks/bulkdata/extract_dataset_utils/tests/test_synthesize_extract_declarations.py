@@ -519,8 +519,8 @@ def _fake_get_org_schema(
     **kwargs,
 ):
     with mock.patch(
-        "cumulusci.salesforce_api.org_schema.count_sobjects",
-        lambda *args: (
+        "cumulusci.salesforce_api.org_schema.count_sobjects_fast",
+        lambda *args, **kwargs: (
             object_counts,
             [],
             [],
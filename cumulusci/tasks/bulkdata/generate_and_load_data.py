@@ -91,6 +91,7 @@ class GenerateAndLoadData(BaseSalesforceApiTask):
         **LoadData.task_options,
     }
     task_options["mapping"]["required"] = False
+    changes_records = True
 
     def _init_options(self, kwargs):
         super()._init_options(kwargs)
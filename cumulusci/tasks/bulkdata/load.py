@@ -99,6 +99,7 @@ class LoadData(SqlAlchemyMixin, BaseSalesforceApiTask):
         },
     }
     row_warning_limit = 10
+    changes_records = True
 
     def _init_options(self, kwargs):
         super(LoadData, self)._init_options(kwargs)
@@ -415,7 +416,11 @@ class LoadData(SqlAlchemyMixin, BaseSalesforceApiTask):
     def configure_step(self, mapping):
         """Create a step appropriate to the action"""
         bulk_mode = mapping.bulk_mode or self.bulk_mode or "Parallel"
-        api_options = {"batch_size": mapping.batch_size, "bulk_mode": bulk_mode}
+        api_options = {
+            "batch_size": mapping.batch_size,
+            "bulk_mode": bulk_mode,
+            "concurrency": mapping.concurrency,
+        }
         num_records_in_target = None
         content_type = None
 
@@ -15,7 +15,11 @@ from cumulusci.core.enums import StrEnum
 from cumulusci.core.exceptions import BulkDataException
 from cumulusci.tasks.bulkdata.dates import iso_to_date
 from cumulusci.tasks.bulkdata.select_utils import SelectOptions, SelectStrategy
-from cumulusci.tasks.bulkdata.step import DataApi, DataOperationType
+from cumulusci.tasks.bulkdata.step import (
+    MAX_REST_CONCURRENCY,
+    DataApi,
+    DataOperationType,
+)
 from cumulusci.tasks.bulkdata.utils import CaseInsensitiveDict
 from cumulusci.utils import convert_to_snake_case
 from cumulusci.utils.yaml.model_parser import CCIDictModel
@@ -111,6 +115,7 @@ class MappingStep(CCIDictModel):
     action: DataOperationType = DataOperationType.INSERT
     api: DataApi = DataApi.SMART
     batch_size: int = None
+    concurrency: Optional[int] = None  # REST API requests in flight at once
     oid_as_pk: bool = False  # this one should be discussed and probably deprecated
     record_type: Optional[str] = None  # should be discussed and probably deprecated
     bulk_mode: Optional[
@@ -276,6 +281,14 @@ class MappingStep(CCIDictModel):
             assert f"Unknown API {values['api']}"
         return v
 
+    @validator("concurrency")
+    @classmethod
+    def validate_concurrency(cls, v):
+        assert (
+            0 < v <= MAX_REST_CONCURRENCY
+        ), f"concurrency must be between 1 and {MAX_REST_CONCURRENCY}"
+        return v
+
     @validator("anchor_date")
     @classmethod
     def validate_anchor_date(cls, v):
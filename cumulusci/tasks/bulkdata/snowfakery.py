@@ -151,6 +151,7 @@ class Snowfakery(BaseSalesforceApiTask):
             "description": "Boolean: When True, performs a rollback of all loaded records in case of an error. Defaults to False."
         },
     }
+    changes_records = True
 
     def _validate_options(self):
         "Validate options before executing the task or before freezing it"
@@ -1,11 +1,15 @@
+import copy
 import csv
 import io
 import json
 import os
 import pathlib
 import tempfile
+import threading
 import time
 from abc import ABCMeta, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from itertools import tee
 from typing import Any, Dict, List, NamedTuple, Optional, Union
@@ -30,6 +34,7 @@ from cumulusci.utils.xml import lxml_parse_string
 DEFAULT_BULK_BATCH_SIZE = 10_000
 DEFAULT_REST_BATCH_SIZE = 200
 MAX_REST_BATCH_SIZE = 200
+MAX_REST_CONCURRENCY = 25
 HIGH_PRIORITY_VALUE = 3
 LOW_PRIORITY_VALUE = 0.5
 csv.field_size_limit(2**27)  # 128 MB
@@ -77,12 +82,17 @@ class DataOperationJobResult(NamedTuple):
 
 
 @contextmanager
-def download_file(uri, bulk_api, *, chunk_size=8192):
+def download_file(uri, bulk_api, *, chunk_size=8192, governor=None):
     """Download the Bulk API result file for a single batch,
     and remove it when the context manager exits."""
     try:
         (handle, path) = tempfile.mkstemp(text=False)
+        if governor:
+            governor.check()
+            governor.throttle()
         resp = requests.get(uri, headers=bulk_api.headers(), stream=True)
+        if governor:
+            governor.record_response(resp)
         resp.raise_for_status()
         f = os.fdopen(handle, "wb")
         for chunk in resp.iter_content(chunk_size=chunk_size):  # VCR needs a chunk_size
@@ -96,14 +106,69 @@ def download_file(uri, bulk_api, *, chunk_size=8192):
         pathlib.Path(path).unlink()
 
 
+class SpooledResults:
+    """Append-only collection of JSON results kept in a temporary file,
+    so that memory use does not grow with the number of records."""
+
+    def __init__(self):
+        self.file = tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+        self.count = 0
+
+    def extend(self, results):
+        self.file.seek(0, os.SEEK_END)
+        for result in results:
+            self.file.write(json.dumps(result))
+            self.file.write("\n")
+            self.count += 1
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        self.file.seek(0)
+        for line in self.file:
+            yield json.loads(line)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
 class BulkJobMixin:
     """Provides mixin utilities for classes that manage Bulk API jobs."""
 
+    @property
+    def api_governor(self):
+        """The ApiLimitGovernor tracking usage of the target org, if any."""
+        context = getattr(self, "context", None)
+        org_config = getattr(context, "org_config", None)
+        return org_config.api_governor if org_config is not None else None
+
+    def _count_bulk_request(self):
+        """Throttle and count a call made through salesforce_bulk, which
+        doesn't expose its responses."""
+        governor = self.api_governor
+        if governor:
+            governor.check()
+            governor.throttle()
+            governor.count_request()
+
     def _job_state_from_batches(self, job_id):
         """Query for batches under job_id and return overall status
         inferred from batch-level status values."""
         uri = f"{self.bulk.endpoint}/job/{job_id}/batch"
+        governor = self.api_governor
+        if governor:
+            governor.check()
+            governor.throttle()
         response = requests.get(uri, headers=self.bulk.headers())
+        if governor:
+            governor.record_response(response)
         response.raise_for_status()
         return self._parse_job_state(response.content)
 
@@ -257,7 +322,7 @@ class BulkApiQueryOperation(BaseQueryOperation, BulkJobMixin):
         for result_id in result_ids:
             uri = f"{self.bulk.endpoint}/job/{self.job_id}/batch/{self.batch_id}/result/{result_id}"
 
-            with download_file(uri, self.bulk) as f:
+            with download_file(uri, self.bulk, governor=self.api_governor) as f:
                 reader = csv.reader(f)
                 self.headers = next(reader)
                 if "Records not found for this query" in self.headers:
@@ -452,6 +517,7 @@ class BulkApiDmlOperation(BaseDmlOperation, BulkJobMixin):
         batch_size = self.api_options["batch_size"]
         for count, csv_batch in enumerate(self._batch(records, batch_size)):
             self.context.logger.info(f"Uploading batch {count + 1}")
+            self._count_bulk_request()
             self.batch_ids.append(self.bulk.post_batch(self.job_id, iter(csv_batch)))
 
     def select_records(self, records):
@@ -564,7 +630,9 @@ class BulkApiDmlOperation(BaseDmlOperation, BulkJobMixin):
                 results_url = f"{insert_step.bulk.endpoint}/job/{insert_step.job_id}/batch/{batch_id}/result"
                 # Download entire result file to a temporary file first
                 # to avoid the server dropping connections
-                with download_file(results_url, insert_step.bulk) as f:
+                with download_file(
+                    results_url, insert_step.bulk, governor=insert_step.api_governor
+                ) as f:
                     self.logger.info(f"Downloaded results for batch {batch_id}")
                     reader = csv.reader(f)
                     next(reader)  # Skip header row
@@ -611,7 +679,7 @@ class BulkApiDmlOperation(BaseDmlOperation, BulkJobMixin):
             # Modify URI to request JSON format
             uri = f"{self.bulk.endpoint}/job/{self.job_id}/batch/{self.batch_id}/result/{result_id}?format=json"
             # Download JSON data
-            with download_file(uri, self.bulk) as f:
+            with download_file(uri, self.bulk, governor=self.api_governor) as f:
                 data = json.load(f)
                 # Get headers from fields, expanding nested structures for TYPEOF results
                 self.headers = query_fields
@@ -701,7 +769,9 @@ class BulkApiDmlOperation(BaseDmlOperation, BulkJobMixin):
                 )
                 # Download entire result file to a temporary file first
                 # to avoid the server dropping connections
-                with download_file(results_url, self.bulk) as f:
+                with download_file(
+                    results_url, self.bulk, governor=self.api_governor
+                ) as f:
                     self.logger.info(f"Downloaded results for batch {batch_id}")
                     yield from self._parse_batch_results(f)
 
@@ -836,41 +906,19 @@ class RestApiDmlOperation(BaseDmlOperation):
         return prev_record_values, tuple(relevant_fields)
 
     def load_records(self, records):
-        """Load, update, upsert or delete records into the org"""
+        """Load, update, upsert or delete records into the org
 
-        self.results = []
-        method = {
-            DataOperationType.INSERT: "POST",
-            DataOperationType.UPDATE: "PATCH",
-            DataOperationType.DELETE: "DELETE",
-            DataOperationType.UPSERT: "PATCH",
-        }[self.operation]
+        Each chunk of records is sent as one sObject Collections request.
+        Up to `concurrency` requests are in flight at once, and their results
+        are collected in the original record order."""
 
-        update_key = self.api_options.get("update_key")
-        for chunk in iterate_in_chunks(self.api_options.get("batch_size"), records):
-            if self.operation is DataOperationType.DELETE:
-                url_string = "?ids=" + ",".join(
-                    self._record_to_json(rec)["Id"] for rec in chunk
-                )
-                json = None
-            else:
-                if update_key:
-                    assert self.operation == DataOperationType.UPSERT
-                    url_string = f"/{self.sobject}/{update_key}"
-                else:
-                    url_string = ""
-                json = {
-                    "allOrNone": False,
-                    "records": [self._record_to_json(rec) for rec in chunk],
-                }
-
-            self.results.extend(
-                self.sf.restful(
-                    f"composite/sobjects{url_string}", method=method, json=json
-                )
-            )
+        self.results = SpooledResults()
+        row_errors = 0
+        chunks = iterate_in_chunks(self.api_options.get("batch_size"), records)
+        for chunk_results in self._send_collection_requests(chunks):
+            row_errors += sum(1 for res in chunk_results if not res["success"])
+            self.results.extend(chunk_results)
 
-        row_errors = len([res for res in self.results if not res["success"]])
         self.job_result = DataOperationJobResult(
             (
                 DataOperationStatus.SUCCESS
@@ -882,6 +930,72 @@ class RestApiDmlOperation(BaseDmlOperation):
             row_errors,
         )
 
+    def _send_collection_requests(self, chunks):
+        """Send a collection request per chunk and yield each chunk's results
+        in order, keeping at most `concurrency` requests in flight."""
+        concurrency = self.api_options.get("concurrency") or 1
+        if concurrency == 1:
+            for chunk in chunks:
+                yield self._send_collection_request(chunk)
+            return
+        # requests.Session is not thread safe, so each worker thread sends
+        # its requests through its own copy of the client.
+        worker = threading.local()
+
+        def send(chunk):
+            if not hasattr(worker, "sf"):
+                worker.sf = self._copy_sf()
+            return self._send_collection_request(chunk, worker.sf)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            in_flight = deque()
+            for chunk in chunks:
+                in_flight.append(executor.submit(send, chunk))
+                if len(in_flight) >= concurrency:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+
+    def _copy_sf(self):
+        """A copy of the Salesforce client with a session of its own, which
+        shares the original session's adapters and so its connection pools
+        and API governor."""
+        sf = copy.copy(self.sf)
+        sf.session = requests.Session()
+        sf.session.proxies = self.sf.session.proxies
+        for prefix, adapter in self.sf.session.adapters.items():
+            sf.session.mount(prefix, adapter)
+        return sf
+
+    def _send_collection_request(self, chunk, sf=None):
+        method = {
+            DataOperationType.INSERT: "POST",
+            DataOperationType.UPDATE: "PATCH",
+            DataOperationType.DELETE: "DELETE",
+            DataOperationType.UPSERT: "PATCH",
+        }[self.operation]
+
+        update_key = self.api_options.get("update_key")
+        if self.operation is DataOperationType.DELETE:
+            url_string = "?ids=" + ",".join(
+                self._record_to_json(rec)["Id"] for rec in chunk
+            )
+            body = None
+        else:
+            if update_key:
+                assert self.operation == DataOperationType.UPSERT
+                url_string = f"/{self.sobject}/{update_key}"
+            else:
+                url_string = ""
+            body = {
+                "allOrNone": False,
+                "records": [self._record_to_json(rec) for rec in chunk],
+            }
+
+        return (sf or self.sf).restful(
+            f"composite/sobjects{url_string}", method=method, json=body
+        )
+
     def select_records(self, records):
         """Executes a SOQL query to select records and adds them to results"""
 
@@ -1007,13 +1121,12 @@ class RestApiDmlOperation(BaseDmlOperation):
         insert_step.start()
         insert_step.load_records(insert_records)
         insert_step.end()
-        insert_results = insert_step.results
 
-        insert_index = 0
-        for idx, record in enumerate(selected_records):
-            if record is None:
-                selected_records[idx] = insert_results[insert_index]
-                insert_index += 1
+        with insert_step.results:
+            insert_results = iter(insert_step.results)
+            for idx, record in enumerate(selected_records):
+                if record is None:
+                    selected_records[idx] = next(insert_results)
 
     def _update_job_result(self, error_message):
         """Updates the job result based on the selection outcome."""
@@ -1050,7 +1163,12 @@ class RestApiDmlOperation(BaseDmlOperation):
 
             return DataOperationResult(res.get("id"), res["success"], errors, created)
 
-        yield from (_convert(res) for res in self.results)
+        if isinstance(self.results, SpooledResults):
+            # The step is finished once its results have been read
+            with self.results:
+                yield from (_convert(res) for res in self.results)
+        else:
+            yield from (_convert(res) for res in self.results)
 
 
 def get_query_operation(
@@ -334,7 +334,7 @@ class TestDeleteData:
         task = _make_task(DeleteData, {"options": {"objects": "Contact,Test__c"}})
         task.project_config.project__package__namespace = "ns"
         task.org_config = mock.Mock()
-        task.org_config.salesforce_client.describe.return_value = {
+        task.org_config.describe.return_value = {
             "sobjects": [
                 {"name": "ns__Test__c", "deletable": True},
                 {"name": "Contact", "deletable": True},
@@ -349,7 +349,7 @@ class TestDeleteData:
         task = _make_task(DeleteData, {"options": {"objects": "Contact,Test__c"}})
         task.project_config.project__package__namespace = "ns"
         task.org_config = mock.Mock()
-        task.org_config.salesforce_client.describe.return_value = {
+        task.org_config.describe.return_value = {
             "sobjects": [
                 {"name": "Test__c", "deletable": True},
                 {"name": "Contact", "deletable": True},
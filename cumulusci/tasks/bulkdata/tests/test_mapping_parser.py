@@ -95,6 +95,13 @@ class TestMappingParser:
             with pytest.raises(ValidationError):
                 parse_from_yaml(StringIO(data))
 
+    def test_bad_mapping_concurrency(self):
+        base_path = Path(__file__).parent / "mapping_v2.yml"
+        with open(base_path, "r") as f:
+            data = f.read().replace("record_type: HH_Account", "concurrency: 100")
+            with pytest.raises(ValidationError):
+                parse_from_yaml(StringIO(data))
+
     def test_ambiguous_mapping_batch_size_default(self, caplog):
         caplog.set_level(logging.WARNING)
         base_path = Path(__file__).parent / "mapping_vanilla_sf.yml"
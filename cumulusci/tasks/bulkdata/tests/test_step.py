@@ -1,12 +1,16 @@
 import io
 import json
+import threading
 from itertools import tee
 from unittest import mock
 
 import pytest
+import requests
 import responses
+from simple_salesforce import Salesforce
 
 from cumulusci.core.exceptions import BulkDataException
+from cumulusci.salesforce_api.api_limits import ApiLimitGovernor
 from cumulusci.tasks.bulkdata.load import LoadData
 from cumulusci.tasks.bulkdata.select_utils import SelectStrategy
 from cumulusci.tasks.bulkdata.step import (
@@ -22,6 +26,7 @@ from cumulusci.tasks.bulkdata.step import (
     DataOperationType,
     RestApiDmlOperation,
     RestApiQueryOperation,
+    SpooledResults,
     assign_weights,
     download_file,
     extract_flattened_headers,
@@ -56,6 +61,24 @@ class TestDownloadFile:
             # make sure it was decoded as utf-8
             assert f.read() == "TEST\u2014"
 
+    @responses.activate
+    def test_download_file__governor(self):
+        url = "https://example.com"
+        bulk_mock = mock.Mock()
+        bulk_mock.headers.return_value = {}
+        governor = ApiLimitGovernor()
+
+        responses.add(
+            method="GET",
+            url=url,
+            body=b"TEST",
+            headers={"Sforce-Limit-Info": "api-usage=10/100"},
+        )
+        with download_file(url, bulk_mock, governor=governor) as f:
+            assert f.read() == "TEST"
+        assert governor.requests_made == 1
+        assert governor.usage.used == 10
+
 
 class TestBulkDataJobTaskMixin:
     @responses.activate
@@ -339,7 +362,9 @@ class TestBulkApiQueryOperation:
             "BATCH", job_id="JOB"
         )
         download_mock.assert_called_once_with(
-            "https://test/job/JOB/batch/BATCH/result/RESULT", context.bulk
+            "https://test/job/JOB/batch/BATCH/result/RESULT",
+            context.bulk,
+            governor=context.org_config.api_governor,
         )
 
         assert list(results) == [
@@ -375,7 +400,9 @@ class TestBulkApiQueryOperation:
             "BATCH", job_id="JOB"
         )
         download_mock.assert_called_once_with(
-            "https://test/job/JOB/batch/BATCH/result/RESULT", context.bulk
+            "https://test/job/JOB/batch/BATCH/result/RESULT",
+            context.bulk,
+            governor=context.org_config.api_governor,
         )
 
         assert list(results) == []
@@ -1217,7 +1244,9 @@ class TestBulkApiDmlOperation:
 
                 # Validate the download file interactions
                 download_mock.assert_called_once_with(
-                    "https://test/job/JOB/batch/BATCH1/result", insert_step.bulk
+                    "https://test/job/JOB/batch/BATCH1/result",
+                    insert_step.bulk,
+                    governor=insert_step.api_governor,
                 )
 
                 # Validate that selected_records is updated with insert results
@@ -1652,8 +1681,16 @@ class TestBulkApiDmlOperation:
         ]
         download_mock.assert_has_calls(
             [
-                mock.call("https://test/job/JOB/batch/BATCH1/result", context.bulk),
-                mock.call("https://test/job/JOB/batch/BATCH2/result", context.bulk),
+                mock.call(
+                    "https://test/job/JOB/batch/BATCH1/result",
+                    context.bulk,
+                    governor=context.org_config.api_governor,
+                ),
+                mock.call(
+                    "https://test/job/JOB/batch/BATCH2/result",
+                    context.bulk,
+                    governor=context.org_config.api_governor,
+                ),
             ]
         )
 
@@ -1706,6 +1743,7 @@ class TestBulkApiDmlOperation:
         step.end()
 
         assert step.job_result.status is DataOperationStatus.SUCCESS
+        context.org_config.api_governor.count_request.assert_called_once_with()
         results = step.get_results()
 
         assert list(results) == [
@@ -1846,6 +1884,119 @@ class TestRestApiDmlOperation:
             DataOperationResult("003000000000003", True, "", True),
         ]
 
+    @responses.activate
+    def test_insert_dml_operation__concurrent(self):
+        mock_describe_calls()
+        task = _make_task(
+            LoadData,
+            {
+                "options": {
+                    "database_url": "sqlite:///test.db",
+                    "mapping": "mapping.yml",
+                }
+            },
+        )
+        task.project_config.project__package__api_version = CURRENT_SF_API_VERSION
+        task._init_task()
+
+        def insert_callback(request):
+            records = json.loads(request.body)["records"]
+            return (
+                200,
+                {},
+                json.dumps(
+                    [
+                        {
+                            "id": rec["LastName"],
+                            "success": rec["LastName"] != "Fail",
+                            "errors": [],
+                        }
+                        for rec in records
+                    ]
+                ),
+            )
+
+        responses.add_callback(
+            responses.POST,
+            url=f"https://example.com/services/data/v{CURRENT_SF_API_VERSION}/composite/sobjects",
+            callback=insert_callback,
+        )
+
+        recs = [["First", str(i)] for i in range(50)] + [["First", "Fail"]]
+
+        dml_op = RestApiDmlOperation(
+            sobject="Contact",
+            operation=DataOperationType.INSERT,
+            api_options={"batch_size": 3, "concurrency": 4},
+            context=task,
+            fields=["FirstName", "LastName"],
+        )
+
+        dml_op.start()
+        dml_op.load_records(iter(recs))
+        dml_op.end()
+
+        inserts = [c for c in responses.calls if c.request.method == "POST"]
+        assert len(inserts) == 17
+        assert dml_op.job_result == DataOperationJobResult(
+            DataOperationStatus.ROW_FAILURE, [], 51, 1
+        )
+        results = list(dml_op.get_results())
+        assert [res.id for res in results] == [str(i) for i in range(50)] + ["Fail"]
+        assert not results[-1].success
+        assert dml_op.results.file.closed
+
+    def test_send_collection_requests__session_per_worker(self):
+        context = mock.Mock()
+        context.sf.Contact.describe.return_value = {
+            "fields": [{"name": "LastName", "type": "string"}]
+        }
+        dml_op = RestApiDmlOperation(
+            sobject="Contact",
+            operation=DataOperationType.INSERT,
+            api_options={"batch_size": 2, "concurrency": 2},
+            context=context,
+            fields=["LastName"],
+        )
+        dml_op.sf = Salesforce(instance="example.com", session_id="TOKEN")
+        adapter = requests.adapters.HTTPAdapter()
+        dml_op.sf.session.mount("https://", adapter)
+        sessions = []
+        lock = threading.Lock()
+
+        def send(chunk, sf=None):
+            with lock:
+                sessions.append((threading.get_ident(), sf.session))
+            return chunk
+
+        dml_op._send_collection_request = mock.Mock(side_effect=send)
+        results = list(dml_op._send_collection_requests(iter([[1], [2], [3], [4]])))
+
+        assert results == [[1], [2], [3], [4]]
+        assert dml_op.sf.session not in {session for _, session in sessions}
+        for thread, session in sessions:
+            assert {s for t, s in sessions if t == thread} == {session}
+            assert session.get_adapter("https://example.com") is adapter
+
+    def test_send_collection_requests__sequential(self):
+        context = mock.Mock()
+        context.sf.Contact.describe.return_value = {
+            "fields": [{"name": "LastName", "type": "string"}]
+        }
+        dml_op = RestApiDmlOperation(
+            sobject="Contact",
+            operation=DataOperationType.INSERT,
+            api_options={"batch_size": 2},
+            context=context,
+            fields=["LastName"],
+        )
+        dml_op._send_collection_request = mock.Mock(side_effect=lambda chunk: chunk)
+
+        with mock.patch("cumulusci.tasks.bulkdata.step.ThreadPoolExecutor") as executor:
+            results = list(dml_op._send_collection_requests(iter([[1, 2], [3]])))
+        executor.assert_not_called()
+        assert results == [[1, 2], [3]]
+
     @responses.activate
     def test_get_prev_record_values(self):
         mock_describe_calls()
@@ -2873,11 +3024,14 @@ class TestRestApiDmlOperation:
             mock_rest_api_dml_operation = mock.create_autospec(
                 RestApiDmlOperation, instance=True
             )
-            mock_rest_api_dml_operation.results = [
-                {"id": "003000000000001", "success": True},
-                {"id": "003000000000002", "success": True},
-                {"id": "003000000000003", "success": True},
-            ]
+            mock_rest_api_dml_operation.results = SpooledResults()
+            mock_rest_api_dml_operation.results.extend(
+                [
+                    {"id": "003000000000001", "success": True},
+                    {"id": "003000000000002", "success": True},
+                    {"id": "003000000000003", "success": True},
+                ]
+            )
 
             with mock.patch(
                 "cumulusci.tasks.bulkdata.step.RestApiDmlOperation",
@@ -2909,6 +3063,7 @@ class TestRestApiDmlOperation:
                     insert_records
                 )
                 mock_rest_api_dml_operation.end.assert_called_once()
+                assert mock_rest_api_dml_operation.results.file.closed
 
     @responses.activate
     def test_process_insert_records_failure(self):
@@ -3955,3 +4110,13 @@ def test_flatten_record(record, headers, expected):
 def test_assign_weights(priority_fields, fields, expected):
     result = assign_weights(priority_fields, fields)
     assert result == expected
+
+
+class TestSpooledResults:
+    def test_spooled_results(self):
+        with SpooledResults() as results:
+            results.extend([{"id": "1"}, {"id": "2"}])
+            results.extend([{"id": "3"}])
+            assert len(results) == 3
+            assert [res["id"] for res in results] == ["1", "2", "3"]
+        assert results.file.closed
@@ -59,6 +59,7 @@ class UpdateData(BaseSalesforceApiTask):
         },
     }
     row_warning_limit = 10
+    changes_records = True
 
     def _init_options(self, kwargs):
         super()._init_options(kwargs)
@@ -20,7 +20,9 @@ class CheckSObjectsAvailable(BaseSalesforceApiTask):
 
     def _run_task(self):
 
-        self.return_values = {entry["name"] for entry in self.sf.describe()["sobjects"]}
+        self.return_values = {
+            entry["name"] for entry in self.org_config.describe(sf=self.sf)["sobjects"]
+        }
 
         self.logger.info(
             "Completed sObjects preflight check with result {}".format(
@@ -79,7 +81,9 @@ class CheckSObjectPerms(BaseSalesforceApiTask):
             }
 
     def _run_task(self):
-        describe = {s["name"]: s for s in self.sf.describe()["sobjects"]}
+        describe = {
+            s["name"]: s for s in self.org_config.describe(sf=self.sf)["sobjects"]
+        }
 
         success = True
 
@@ -2,6 +2,7 @@ from salesforce_bulk import SalesforceBulk
 
 from cumulusci.core.exceptions import ConfigError
 from cumulusci.core.tasks import BaseSalesforceTask
+from cumulusci.salesforce_api.api_limits import ApiLimitGovernor
 from cumulusci.salesforce_api.utils import get_simple_salesforce_connection
 
 
@@ -39,6 +40,20 @@ class BaseSalesforceApiTask(BaseSalesforceTask):
     def _init_class(self):
         pass
 
+    @property
+    def api_governor(self) -> ApiLimitGovernor:
+        """Tracks the org's API usage across every connection made to it."""
+        return self.org_config.api_governor
+
+    def __call__(self):
+        return_values = super().__call__()
+        # Report usage when the project sets API limits
+        governor = self.api_governor
+        if isinstance(governor, ApiLimitGovernor) and governor.configured:
+            if isinstance(return_values, dict):
+                return_values["api_usage"] = governor.as_dict()
+        return return_values
+
     def _get_tooling_object(self, obj_name):
         obj = getattr(self.tooling, obj_name)
         obj.base_url = obj.base_url.replace("/sobjects/", "/tooling/sobjects/")
@@ -3,6 +3,9 @@ from cumulusci.salesforce_api.package_zip import DestructiveChangesZipBuilder
 from cumulusci.tasks.salesforce import Deploy
 
 uninstall_task_options = Deploy.task_options.copy()
+# Uninstalls are not recorded in the deploy ledger
+del uninstall_task_options["skip_unchanged"]
+del uninstall_task_options["delta"]
 uninstall_task_options["purge_on_delete"] = {
     "description": "Sets the purgeOnDelete option for the deployment. Defaults to True"
 }
@@ -1,4 +1,6 @@
 import pathlib
+import threading
+from contextlib import contextmanager
 from typing import List, Optional, Union
 
 from defusedxml.minidom import parseString
@@ -13,14 +15,31 @@ from cumulusci.core.source_transforms.transforms import (
     SourceTransformList,
 )
 from cumulusci.core.utils import process_bool_arg, process_list_arg
+from cumulusci.salesforce_api.deploy_ledger import (
+    DeployLedger,
+    delta_members,
+    deploy_hash,
+)
 from cumulusci.salesforce_api.metadata import ApiDeploy, ApiRetrieveUnpackaged
-from cumulusci.salesforce_api.package_zip import MetadataPackageZipBuilder
+from cumulusci.salesforce_api.package_zip import (
+    BasePackageZipBuilder,
+    MetadataPackageZipBuilder,
+)
 from cumulusci.salesforce_api.rest_deploy import RestDeploy
-from cumulusci.tasks.metadata.package import process_common_components
+from cumulusci.tasks.metadata.package import (
+    PackageXmlGenerator,
+    process_common_components,
+)
 from cumulusci.tasks.salesforce.BaseSalesforceMetadataApiTask import (
     BaseSalesforceMetadataApiTask,
 )
+from cumulusci.utils import temporary_dir
 from cumulusci.utils.xml import metadata_tree
+from cumulusci.utils.ziputils import hash_zipfile_members
+
+# Returned in place of a package when none of its components changed since
+# the last delta deployment
+NO_CHANGES = object()
 
 
 class Deploy(BaseSalesforceMetadataApiTask):
@@ -65,6 +84,22 @@ class Deploy(BaseSalesforceMetadataApiTask):
             "description": "Apply source transforms before deploying. See the CumulusCI documentation for details on how to specify transforms."
         },
         "rest_deploy": {"description": "If True, deploy metadata using REST API"},
+        "skip_unchanged": {
+            "description": "If True, skip the deployment when the package is identical to the last one "
+            "successfully deployed to this org from the same path. If `warn`, deploy anyway but log a warning. "
+            "Only deployments made with this option are tracked, so leave it off if the org's metadata "
+            "may have been changed by other means. Defaults to False."
+        },
+        "delta": {
+            "description": "If True, deploy only the components which were added or changed since the last "
+            "successful deployment of this path to this org with this option. Components removed locally are "
+            "not deleted from the org. Defaults to False."
+        },
+        "compression_level": {
+            "description": "The zlib compression level (0-9) used for the package. 0 stores files "
+            "without compression, which can be faster for large packages on a fast network. "
+            "Defaults to zlib's default level (6)."
+        },
     }
 
     namespaces = {"sf": "http://soap.sforce.com/2006/04/metadata"}
@@ -114,13 +149,47 @@ class Deploy(BaseSalesforceMetadataApiTask):
         # Set class variable to true if rest_deploy is set to True
         self.rest_deploy = process_bool_arg(self.options.get("rest_deploy", False))
 
+        skip_unchanged = self.options.get("skip_unchanged", False)
+        if str(skip_unchanged).lower() == "warn":
+            self.skip_unchanged = "warn"
+        else:
+            self.skip_unchanged = process_bool_arg(skip_unchanged)
+        self.delta = process_bool_arg(self.options.get("delta", False))
+
+        if self.options.get("compression_level") is not None:
+            try:
+                compression_level = int(self.options["compression_level"])
+            except ValueError:
+                compression_level = None
+            if compression_level not in range(10):
+                raise TaskOptionsError(
+                    "The compression_level option must be an integer from 0 to 9."
+                )
+            self.options["compression_level"] = compression_level
+
+        self._deploy_hash = None
+        self._deploy_files = None
+        # Deployments to record in the ledger once they succeed, by path
+        self._pending_deploys = {}
+        self._ledger_lock = threading.Lock()
+
+    def _run_task(self):
+        self._pending_deploys = {}
+        result = super()._run_task()
+        for path in list(self._pending_deploys):
+            self._record_pending_deploy(path)
+        return result
+
     def _get_api(self, path=None):
         if not path:
             path = self.options.get("path")
 
         package_zip = self._get_package_zip(path)
 
-        if isinstance(package_zip, dict):
+        if package_zip is NO_CHANGES:
+            self.logger.info("No components changed since last deploy; skipping.")
+            return None
+        elif isinstance(package_zip, dict):
             self.logger.warning(
                 "Deploy getting aborted due to collision of following components"
             )
@@ -140,6 +209,23 @@ class Deploy(BaseSalesforceMetadataApiTask):
             self.logger.warning("Deployment package is empty; skipping deployment.")
             return
 
+        if self._deploy_hash and self.skip_unchanged:
+            if self._is_unchanged(path, self._deploy_hash):
+                if self.skip_unchanged != "warn":
+                    self.logger.info(
+                        "Package is unchanged since the last deployment to this org; skipping deployment."
+                    )
+                    return None
+                self.logger.warning(
+                    "Package is unchanged since the last deployment to this org."
+                )
+        if self._deploy_hash:
+            self._pending_deploys[str(path)] = (
+                path,
+                self._deploy_hash,
+                self._deploy_files,
+            )
+
         # If rest_deploy param is set, update api_class to be RestDeploy
         if self.rest_deploy:
             self.api_class = RestDeploy
@@ -193,8 +279,10 @@ class Deploy(BaseSalesforceMetadataApiTask):
 
         return is_collision, xml_map
 
-    def _get_package_zip(self, path) -> Union[str, dict, None]:
+    def _get_package_zip(self, path) -> Union[str, dict, object, None]:
         assert path, f"Path should be specified for {self.__class__.name}"
+        self._deploy_hash = None
+        self._deploy_files = None
         if not pathlib.Path(path).exists():
             self.logger.warning(f"{path} not found.")
             return
@@ -228,10 +316,109 @@ class Deploy(BaseSalesforceMetadataApiTask):
                 # If the package is empty, do nothing.
                 if not package_zip.zf.namelist():
                     return
+                if (self.skip_unchanged or self.delta) and not self.check_only:
+                    self._deploy_hash = deploy_hash(
+                        package_zip.as_hash(),
+                        self.project_config.project__package__api_version,
+                        self.options.get("transforms"),
+                    )
+                if self.delta:
+                    files = hash_zipfile_members(package_zip.zf)
+                    if not self.check_only:
+                        self._deploy_files = files
+                    package_zip = self._get_delta_package(path, package_zip, files)
+                    if package_zip is NO_CHANGES:
+                        return NO_CHANGES
                 return package_zip.as_base64()
             else:
                 return xml_map
 
+    @contextmanager
+    def _deploy_ledger(self):
+        with self.org_config.get_orginfo_cache_dir(Deploy.__module__) as cache:
+            yield DeployLedger(cache / "deploy_ledger.json")
+
+    def _is_unchanged(self, path, package_hash) -> bool:
+        with self._deploy_ledger() as ledger:
+            return ledger.is_unchanged(
+                str(path), package_hash, org_id=self.org_config.org_id
+            )
+
+    def _record_deploy(self, path, package_hash, files=None):
+        extra = {"files": files} if files is not None else {}
+        with self._ledger_lock, self._deploy_ledger() as ledger:
+            ledger.record(
+                str(path), package_hash, org_id=self.org_config.org_id, **extra
+            )
+
+    def _record_pending_deploy(self, path):
+        """Record the deployment of a path once it has succeeded."""
+        pending = self._pending_deploys.pop(str(path), None)
+        if pending:
+            self._record_deploy(*pending)
+
+    def _get_delta_package(
+        self, path, package_zip: BasePackageZipBuilder, files: dict
+    ) -> Union[BasePackageZipBuilder, object]:
+        """Reduce a package to the components which changed since the last
+        deployment, or return NO_CHANGES if none did."""
+        with self._deploy_ledger() as ledger:
+            entry = ledger.get(str(path))
+        if (
+            not entry
+            or entry.get("org_id") != self.org_config.org_id
+            or "files" not in entry
+        ):
+            self.logger.info(
+                "No previous deployment of this path to this org was found; deploying all components."
+            )
+            return package_zip
+
+        members, removed = delta_members(files, entry["files"])
+        if removed:
+            self.logger.warning(
+                f"{len(removed)} files were removed since the last deployment. "
+                "Delta deployments do not delete components from the org."
+            )
+        if not members:
+            # Nothing is deployed, but the removals are now in the org's state
+            if removed and self._deploy_hash:
+                self._record_deploy(path, self._deploy_hash, files)
+            return NO_CHANGES
+
+        try:
+            delta_zip = self._subset_package(package_zip, members)
+        except Exception as e:
+            self.logger.warning(
+                f"Could not build a delta package ({e}); deploying all components."
+            )
+            return package_zip
+        self.logger.info(f"Deploying {len(members)} of {len(files)} files.")
+        return delta_zip
+
+    def _subset_package(
+        self, package_zip: BasePackageZipBuilder, members
+    ) -> BasePackageZipBuilder:
+        package = metadata_tree.fromstring(package_zip.zf.read("package.xml"))
+        full_name = package.find("fullName")
+        version = package.find("version")
+
+        delta_zip = BasePackageZipBuilder()
+        with temporary_dir(chdir=False) as tempdir:
+            for name in sorted(members):
+                package_zip.zf.extract(name, tempdir)
+                delta_zip.zf.write(pathlib.Path(tempdir, name), arcname=name)
+            package_xml = PackageXmlGenerator(
+                tempdir,
+                version.text
+                if version is not None
+                else self.project_config.project__package__api_version,
+                package_name=full_name.text if full_name is not None else None,
+                logger=self.logger,
+            )()
+        delta_zip.zf.writestr("package.xml", package_xml)
+        return delta_zip
+
     def freeze(self, step):
         steps = super().freeze(step)
         for step in steps:
@@ -1,17 +1,31 @@
 import copy
 import os
+import threading
 
 from cumulusci.tasks.salesforce import Deploy
+from cumulusci.tasks.salesforce.bundles import (
+    bundle_options,
+    get_bundle_dependencies,
+    list_bundles,
+    process_concurrency_arg,
+    run_in_dependency_order,
+)
 
 deploy_options = copy.deepcopy(Deploy.task_options)
 deploy_options["path"][
     "description"
 ] = "The path to the parent directory containing the metadata bundles directories"
+deploy_options.update(copy.deepcopy(bundle_options))
 
 
 class DeployBundles(Deploy):
     task_options = deploy_options
 
+    def _init_options(self, kwargs):
+        super()._init_options(kwargs)
+        self.concurrency = process_concurrency_arg(self.options.get("concurrency"))
+        self._api_lock = threading.Lock()
+
     def _run_task(self):
         path = self.options["path"]
         pwd = os.getcwd()
@@ -24,20 +38,28 @@ class DeployBundles(Deploy):
             self.logger.warning("Path {} not found, skipping".format(path))
             return
 
-        for item in sorted(os.listdir(path)):
-            item_path = os.path.join(path, item)
-            if not os.path.isdir(item_path):
-                continue
+        bundles = list_bundles(path)
+        dependencies = get_bundle_dependencies(
+            self.options, path, bundles, self.concurrency
+        )
 
+        def deploy(item):
             self.logger.info(
                 "Deploying bundle: {}/{}".format(self.options["path"], item)
             )
+            self._deploy_bundle(os.path.join(path, item))
 
-            self._deploy_bundle(item_path)
+        run_in_dependency_order(bundles, dependencies, deploy, self.concurrency)
 
     def _deploy_bundle(self, path):
-        api = self._get_api(path)
-        return api()
+        # Packages are built one at a time because _get_api keeps
+        # state on the task; only the deployments overlap.
+        with self._api_lock:
+            api = self._get_api(path)
+        if api:
+            result = api()
+            self._record_pending_deploy(path)
+            return result
 
     def freeze(self, step):
         ui_options = self.task_config.config.get("ui_options", {})
@@ -22,5 +22,12 @@ class DescribeMetadataTypes(BaseRetrieveMetadata):
 
     def _run_task(self):
         api_object = self._get_api()
-        self.return_values = api_object()
+        self.return_values = self.org_config.describe_cache.get(
+            (
+                self.org_config.org_id,
+                str(self.options.get("api_version")),
+                "describeMetadata",
+            ),
+            api_object,
+        )
         return self.return_values
@@ -1,4 +1,9 @@
+from cumulusci.core.exceptions import TaskOptionsError
 from cumulusci.salesforce_api.metadata import ApiRetrieveUnpackaged
+from cumulusci.salesforce_api.sharded_retrieve import (
+    MAX_RETRIEVE_COMPONENTS,
+    ShardedRetrieveUnpackaged,
+)
 from cumulusci.tasks.salesforce import BaseRetrieveMetadata
 
 retrieve_unpackaged_options = BaseRetrieveMetadata.task_options.copy()
@@ -14,6 +19,12 @@ retrieve_unpackaged_options.update(
                 + " Defaults to project__package__api_version"
             )
         },
+        "concurrency": {
+            "description": "The number of retrieves to run at once. If more than 1, the "
+            "package.xml is split into shards of similar size which are retrieved "
+            "concurrently and merged. Defaults to 1. Packages with more than "
+            f"{MAX_RETRIEVE_COMPONENTS} members are always split."
+        },
     }
 )
 
@@ -30,7 +41,24 @@ class RetrieveUnpackaged(BaseRetrieveMetadata):
             with open(self.options["package_xml"], "r") as f:
                 self.options["package_xml_content"] = f.read()
 
+        try:
+            self.options["concurrency"] = int(self.options.get("concurrency") or 1)
+        except ValueError:
+            self.options["concurrency"] = 0
+        if self.options["concurrency"] < 1:
+            raise TaskOptionsError("The concurrency option must be a positive integer.")
+
     def _get_api(self):
-        return self.api_class(
-            self, self.options["package_xml_content"], self.options.get("api_version")
-        )
+        package_xml = self.options["package_xml_content"]
+        if (
+            self.options["concurrency"] > 1
+            or package_xml.count("<members>") > MAX_RETRIEVE_COMPONENTS
+        ):
+            return ShardedRetrieveUnpackaged(
+                self,
+                package_xml,
+                self.options.get("api_version"),
+                concurrency=self.options["concurrency"],
+                api_class=self.api_class,
+            )
+        return self.api_class(self, package_xml, self.options.get("api_version"))
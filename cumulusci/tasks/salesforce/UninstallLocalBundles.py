@@ -1,9 +1,29 @@
+import copy
 import os
+import threading
 
 from cumulusci.tasks.salesforce import UninstallLocal
+from cumulusci.tasks.salesforce.bundles import (
+    bundle_options,
+    get_bundle_dependencies,
+    list_bundles,
+    process_concurrency_arg,
+    reverse_dependencies,
+    run_in_dependency_order,
+)
+
+uninstall_options = copy.deepcopy(UninstallLocal.task_options)
+uninstall_options.update(copy.deepcopy(bundle_options))
 
 
 class UninstallLocalBundles(UninstallLocal):
+    task_options = uninstall_options
+
+    def _init_options(self, kwargs):
+        super()._init_options(kwargs)
+        self.concurrency = process_concurrency_arg(self.options.get("concurrency"))
+        self._api_lock = threading.Lock()
+
     def _run_task(self):
         path = self.options["path"]
         path = os.path.abspath(path)
@@ -12,17 +32,22 @@ class UninstallLocalBundles(UninstallLocal):
             "Deleting all metadata from bundles in {} from target org".format(path)
         )
 
-        for item in sorted(os.listdir(path)):
-            item_path = os.path.join(path, item)
-            if not os.path.isdir(item_path):
-                continue
+        bundles = list_bundles(path)
+        # Bundles are deleted before the bundles they depend on.
+        dependencies = reverse_dependencies(
+            get_bundle_dependencies(self.options, path, bundles, self.concurrency)
+        )
 
+        def delete(item):
             self.logger.info(
                 "Deleting bundle: {}/{}".format(self.options["path"], item)
             )
+            self._delete_bundle(os.path.join(path, item))
 
-            self._delete_bundle(item_path)
+        run_in_dependency_order(bundles, dependencies, delete, self.concurrency)
 
     def _delete_bundle(self, path=None):
-        api = self._get_api(path)
-        return api()
+        with self._api_lock:
+            api = self._get_api(path)
+        if api:
+            return api()
@@ -1,6 +1,7 @@
 from cumulusci.core.utils import process_bool_arg
 from cumulusci.tasks.metadata.package import PackageXmlGenerator
 from cumulusci.tasks.salesforce import UninstallLocalBundles
+from cumulusci.tasks.salesforce.bundles import bundle_options
 
 
 class UninstallLocalNamespacedBundles(UninstallLocalBundles):
@@ -24,6 +25,7 @@ class UninstallLocalNamespacedBundles(UninstallLocalBundles):
             "description": "Sets the purgeOnDelete option for the deployment.  Defaults to True",
             "required": True,
         },
+        **bundle_options,
     }
 
     def _init_options(self, kwargs):
@@ -0,0 +1,198 @@
+"""Helpers for tasks which deploy or delete a directory of metadata bundles.
+
+Bundles are subdirectories of a path and are processed in sorted order.
+When bundles are processed concurrently, each bundle waits for the
+bundles it depends on, which are taken from the `bundle_dependencies`
+option or found by scanning each bundle for references to components
+defined in the bundles sorted before it.
+"""
+import os
+import re
+import typing as T
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from cumulusci.core.exceptions import TaskOptionsError
+from cumulusci.core.utils import process_list_arg
+
+# The Metadata API queues concurrent deployments to the same org,
+# so there is little to gain from keeping many more in flight.
+MAX_BUNDLE_CONCURRENCY = 10
+
+NAMESPACE_TOKEN_RE = re.compile(
+    r"%%%NAMESPACE(?:D_ORG)?%%%|___NAMESPACE(?:D_ORG)?___|%%%NAMESPACE_DOT%%%"
+)
+IDENTIFIER_RE = re.compile(r"\w+")
+
+Dependencies = T.Dict[str, T.Set[str]]
+
+bundle_options = {
+    "concurrency": {
+        "description": "The number of bundles to process at once. Defaults to 1. "
+        f"The maximum is {MAX_BUNDLE_CONCURRENCY}. Each bundle waits for the bundles it depends on, "
+        "which are taken from bundle_dependencies or found by scanning each bundle for references "
+        "to components in the bundles sorted before it."
+    },
+    "bundle_dependencies": {
+        "description": "A mapping from the name of each bundle to a list of the bundles it "
+        "depends on. If set, it is used instead of scanning the bundles for references."
+    },
+}
+
+
+def list_bundles(path: str) -> T.List[str]:
+    """Names of the bundle directories in `path`, in sorted order."""
+    return [
+        item
+        for item in sorted(os.listdir(path))
+        if os.path.isdir(os.path.join(path, item))
+    ]
+
+
+def process_concurrency_arg(value) -> int:
+    try:
+        concurrency = int(value if value is not None else 1)
+    except ValueError:
+        concurrency = 0
+    if not 1 <= concurrency <= MAX_BUNDLE_CONCURRENCY:
+        raise TaskOptionsError(
+            f"The concurrency option must be an integer from 1 to {MAX_BUNDLE_CONCURRENCY}."
+        )
+    return concurrency
+
+
+def get_bundle_dependencies(
+    options: dict, path: str, bundles: T.List[str], concurrency: int
+) -> Dependencies:
+    """The dependencies between bundles, from the `bundle_dependencies` option
+    or, when bundles will be processed concurrently, a scan of their files."""
+    if "bundle_dependencies" in options:
+        return parse_bundle_dependencies(options["bundle_dependencies"], bundles)
+    if concurrency > 1:
+        return scan_bundle_dependencies(path, bundles)
+    return {bundle: set() for bundle in bundles}
+
+
+def parse_bundle_dependencies(value: T.Any, bundles: T.List[str]) -> Dependencies:
+    """Validate the `bundle_dependencies` option against the bundles in the path."""
+    if not isinstance(value, dict):
+        raise TaskOptionsError(
+            "The bundle_dependencies option must be a mapping of bundle names to lists of bundle names."
+        )
+    dependencies = {bundle: set() for bundle in bundles}
+    for bundle, required in value.items():
+        required = process_list_arg(required) or []
+        unknown = [name for name in [bundle, *required] if name not in dependencies]
+        if unknown:
+            raise TaskOptionsError(
+                f"bundle_dependencies refers to bundles which were not found: {', '.join(unknown)}"
+            )
+        dependencies[bundle].update(required)
+    dependency_order(bundles, dependencies)
+    return dependencies
+
+
+def scan_bundle_dependencies(path: str, bundles: T.List[str]) -> Dependencies:
+    """Find the bundles sorted before each bundle that it must follow.
+
+    A bundle follows an earlier bundle if it refers to, or also contains,
+    a component the earlier bundle contains. Only earlier bundles are
+    considered, so bundles are never reordered relative to a serial run."""
+    scanned = [_scan_bundle(os.path.join(path, bundle)) for bundle in bundles]
+    dependencies = {bundle: set() for bundle in bundles}
+    for i, (_, referenced) in enumerate(scanned):
+        for earlier, (earlier_defined, _) in zip(bundles[:i], scanned[:i]):
+            if not earlier_defined.isdisjoint(referenced):
+                dependencies[bundles[i]].add(earlier)
+    return dependencies
+
+
+def _scan_bundle(path: str) -> T.Tuple[T.Set[str], T.Set[str]]:
+    """Names of the components defined by a bundle's files,
+    and every identifier found in its files (including those names)."""
+    defined = set()
+    referenced = set()
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            file_path = os.path.join(dirpath, filename)
+            parts = os.path.relpath(file_path, path).split(os.sep)
+            # Skip package.xml and other files outside a metadata type's directory
+            if len(parts) < 2:
+                continue
+            for part in parts[1:]:
+                defined.add(NAMESPACE_TOKEN_RE.sub("", part).split(".")[0])
+            try:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    text = f.read()
+            except UnicodeDecodeError:
+                continue
+            referenced.update(IDENTIFIER_RE.findall(NAMESPACE_TOKEN_RE.sub("", text)))
+    defined.discard("")
+    return defined, referenced | defined
+
+
+def reverse_dependencies(dependencies: Dependencies) -> Dependencies:
+    """Dependencies for processing in the opposite order, as when deleting."""
+    reversed_dependencies = {item: set() for item in dependencies}
+    for item, required in dependencies.items():
+        for other in required:
+            reversed_dependencies[other].add(item)
+    return reversed_dependencies
+
+
+def dependency_order(items: T.List[str], dependencies: Dependencies) -> T.List[str]:
+    """Order `items` so each follows its dependencies, preferring the given order.
+
+    Raises TaskOptionsError if the dependencies contain a cycle."""
+    ordered = []
+    done = set()
+    remaining = list(items)
+    while remaining:
+        ready = next(
+            (item for item in remaining if dependencies.get(item, set()) <= done), None
+        )
+        if ready is None:
+            raise TaskOptionsError(
+                f"Bundle dependencies contain a cycle between: {', '.join(remaining)}"
+            )
+        remaining.remove(ready)
+        done.add(ready)
+        ordered.append(ready)
+    return ordered
+
+
+def run_in_dependency_order(
+    items: T.List[str],
+    dependencies: Dependencies,
+    process: T.Callable[[str], T.Any],
+    max_workers: int = 1,
+):
+    """Call `process` on each item in a thread pool, starting each item
+    only once its dependencies have finished, and in the given order when
+    more than one item is ready.
+
+    If an item fails, no more items are started and the first exception
+    is raised once the running items have finished."""
+    remaining = dependency_order(items, dependencies)
+    done = set()
+    running = {}
+    error = None
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while remaining or running:
+            if error is None:
+                for item in list(remaining):
+                    if len(running) >= max_workers:
+                        break
+                    if dependencies.get(item, set()) <= done:
+                        remaining.remove(item)
+                        running[executor.submit(process, item)] = item
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                item = running.pop(future)
+                if future.exception() is not None:
+                    error = error or future.exception()
+                else:
+                    done.add(item)
+    if error is not None:
+        raise error
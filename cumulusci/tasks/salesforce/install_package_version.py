@@ -192,6 +192,7 @@ class InstallPackageVersion(BaseSalesforceApiTask):
         )
 
         self.org_config.reset_installed_packages()
+        self.org_config.org_changed()
 
     def freeze(self, step):
         if self.options["interactive"]:
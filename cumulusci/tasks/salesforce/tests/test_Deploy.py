@@ -1,7 +1,9 @@
 import base64
 import io
 import os
+import pathlib
 import zipfile
+from contextlib import contextmanager
 from unittest import mock
 
 import pytest
@@ -9,6 +11,7 @@ import pytest
 from cumulusci.core.exceptions import TaskOptionsError
 from cumulusci.core.flowrunner import StepSpec
 from cumulusci.core.source_transforms.transforms import CleanMetaXMLTransform
+from cumulusci.salesforce_api.deploy_ledger import DeployLedger
 from cumulusci.tasks.salesforce import Deploy
 from cumulusci.utils import temporary_dir, touch
 
@@ -402,6 +405,153 @@ class TestDeploy:
 
             assert "transform spec is not valid" in str(e)
 
+    def test_init_options__compression_level(self):
+        task = create_task(Deploy, {"path": "src", "compression_level": "0"})
+        assert task.options["compression_level"] == 0
+
+        for level in ("10", "fast"):
+            with pytest.raises(TaskOptionsError, match="compression_level"):
+                create_task(Deploy, {"path": "src", "compression_level": level})
+
+    @pytest.mark.parametrize("skip_unchanged", ["True", "warn"])
+    def test_skip_unchanged(self, skip_unchanged, tmp_path, caplog):
+        caplog.set_level("INFO")
+        ledger = DeployLedger(tmp_path / "deploy_ledger.json")
+
+        @contextmanager
+        def deploy_ledger():
+            yield ledger
+
+        with temporary_dir() as path:
+            touch("package.xml")
+            task = create_task(Deploy, {"path": path, "skip_unchanged": skip_unchanged})
+            task._deploy_ledger = deploy_ledger
+            task.api_class = mock.Mock()
+
+            task()
+            task()
+            assert task.api_class.call_count == (1 if skip_unchanged == "True" else 2)
+            assert "unchanged since the last deployment" in caplog.text
+
+            # A changed package is deployed again
+            pathlib.Path(path, "classes").mkdir()
+            touch(os.path.join("classes", "Foo.cls"))
+            task()
+            assert task.api_class.call_count == (2 if skip_unchanged == "True" else 3)
+
+    def test_skip_unchanged__failed_deploy_not_recorded(self, tmp_path):
+        ledger = DeployLedger(tmp_path / "deploy_ledger.json")
+
+        @contextmanager
+        def deploy_ledger():
+            yield ledger
+
+        with temporary_dir() as path:
+            touch("package.xml")
+            task = create_task(Deploy, {"path": path, "skip_unchanged": True})
+            task._deploy_ledger = deploy_ledger
+            task.api_class = mock.Mock(return_value=mock.Mock(side_effect=Exception))
+
+            with pytest.raises(Exception):
+                task()
+            assert ledger.get(path) is None
+
+    def test_skip_unchanged__off(self):
+        with temporary_dir() as path:
+            touch("package.xml")
+            task = create_task(Deploy, {"path": path})
+            task._deploy_ledger = mock.Mock()
+            task.api_class = mock.Mock()
+
+            task()
+            task._deploy_ledger.assert_not_called()
+
+    def test_delta(self, tmp_path, caplog):
+        caplog.set_level("INFO")
+        ledger = DeployLedger(tmp_path / "deploy_ledger.json")
+
+        @contextmanager
+        def deploy_ledger():
+            yield ledger
+
+        with temporary_dir() as path:
+            pathlib.Path("package.xml").write_text(
+                """<?xml version="1.0" encoding="UTF-8"?>
+<Package xmlns="http://soap.sforce.com/2006/04/metadata">
+    <fullName>Test Package</fullName>
+    <version>58.0</version>
+</Package>"""
+            )
+            pathlib.Path("classes").mkdir()
+            for name in ("Foo", "Bar"):
+                pathlib.Path("classes", f"{name}.cls").write_text(f"class {name} {{}}")
+                pathlib.Path("classes", f"{name}.cls-meta.xml").write_text(
+                    "<ApexClass/>"
+                )
+            task = create_task(Deploy, {"path": path, "delta": True})
+            task._deploy_ledger = deploy_ledger
+
+            # First deploy has nothing to compare with
+            zf = self._zip(task._get_api().package_zip)
+            assert len(zf.namelist()) == 5
+            task._record_pending_deploy(path)
+
+            # Only the changed class and its -meta.xml are deployed
+            pathlib.Path("classes", "Foo.cls").write_text("class Foo { }")
+            zf = self._zip(task._get_api().package_zip)
+            assert sorted(zf.namelist()) == [
+                "classes/Foo.cls",
+                "classes/Foo.cls-meta.xml",
+                "package.xml",
+            ]
+            package_xml = zf.read("package.xml").decode("utf-8")
+            assert "<members>Foo</members>" in package_xml
+            assert "<members>Bar</members>" not in package_xml
+            assert "<fullName>Test Package</fullName>" in package_xml
+            assert "<version>58.0</version>" in package_xml
+            task._record_pending_deploy(path)
+
+            # Nothing changed
+            assert task._get_api() is None
+            assert "No components changed since last deploy; skipping." in caplog.text
+            assert "Deployment package is empty" not in caplog.text
+
+            # Removals aren't deployed, but are recorded so they're reported once
+            pathlib.Path("classes", "Bar.cls").unlink()
+            pathlib.Path("classes", "Bar.cls-meta.xml").unlink()
+            caplog.clear()
+            assert task._get_api() is None
+            assert "2 files were removed" in caplog.text
+            assert "classes/Bar.cls" not in ledger.get(path)["files"]
+            caplog.clear()
+            assert task._get_api() is None
+            assert "were removed" not in caplog.text
+
+    def test_delta__subset_failure(self, tmp_path, caplog):
+        ledger = DeployLedger(tmp_path / "deploy_ledger.json")
+
+        @contextmanager
+        def deploy_ledger():
+            yield ledger
+
+        with temporary_dir() as path:
+            touch("package.xml")
+            pathlib.Path("classes").mkdir()
+            pathlib.Path("classes", "Foo.cls").write_text("class Foo {}")
+            task = create_task(Deploy, {"path": path, "delta": True})
+            task._deploy_ledger = deploy_ledger
+            task._get_api()
+            task._record_pending_deploy(path)
+
+            pathlib.Path("classes", "Foo.cls").write_text("class Foo { }")
+            task._subset_package = mock.Mock(side_effect=ValueError("bad package"))
+            zf = self._zip(task._get_api().package_zip)
+            assert len(zf.namelist()) == 2
+            assert "Could not build a delta package (bad package)" in caplog.text
+
+    def _zip(self, package_zip):
+        return zipfile.ZipFile(io.BytesIO(base64.b64decode(package_zip)), "r")
+
     @pytest.mark.parametrize("rest_deploy", [True, False])
     def test_freeze_sets_kind(self, rest_deploy):
         task = create_task(
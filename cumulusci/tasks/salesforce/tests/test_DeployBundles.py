@@ -1,7 +1,9 @@
 import os
+from contextlib import contextmanager
 from unittest import mock
 
 from cumulusci.core.flowrunner import StepSpec
+from cumulusci.salesforce_api.deploy_ledger import DeployLedger
 from cumulusci.tasks.salesforce import DeployBundles
 from cumulusci.utils import temporary_dir
 
@@ -19,6 +21,51 @@ class TestDeployBundles:
             task()
             task._get_api.assert_called_once()
 
+    def test_run_task__concurrency(self, tmp_path):
+        (tmp_path / "a" / "objects").mkdir(parents=True)
+        (tmp_path / "a" / "objects" / "Widget__c.object").write_text("<CustomObject/>")
+        (tmp_path / "b" / "layouts").mkdir(parents=True)
+        (tmp_path / "b" / "layouts" / "Widget__c-Layout.layout").write_text(
+            "<field>Widget__c.Name</field>"
+        )
+        (tmp_path / "c").mkdir()
+        task = create_task(DeployBundles, {"path": str(tmp_path), "concurrency": 3})
+        deployed = []
+        task._get_api = mock.Mock(
+            side_effect=lambda path: lambda: deployed.append(os.path.basename(path))
+        )
+
+        task()
+
+        assert sorted(deployed) == ["a", "b", "c"]
+        assert deployed.index("a") < deployed.index("b")
+
+    def test_run_task__skip_unchanged(self, tmp_path):
+        for name in ("a", "b"):
+            (tmp_path / name / "classes").mkdir(parents=True)
+            (tmp_path / name / "classes" / f"{name}.cls").write_text("class A {}")
+            (tmp_path / name / "package.xml").write_text("<Package/>")
+        ledger = DeployLedger(tmp_path / "deploy_ledger.json")
+
+        @contextmanager
+        def deploy_ledger():
+            yield ledger
+
+        task = create_task(
+            DeployBundles, {"path": str(tmp_path), "skip_unchanged": True}
+        )
+        task._deploy_ledger = deploy_ledger
+        task.api_class = mock.Mock()
+
+        task()
+        assert task.api_class.call_count == 2
+        assert ledger.get(str(tmp_path / "a")) and ledger.get(str(tmp_path / "b"))
+
+        # Only the changed bundle is deployed again
+        (tmp_path / "b" / "classes" / "b.cls").write_text("class B {}")
+        task()
+        assert task.api_class.call_count == 3
+
     def test_run_task__path_not_found(self):
         with temporary_dir() as path:
             pass
@@ -1,6 +1,9 @@
 import os
 from unittest import mock
 
+import pytest
+
+from cumulusci.core.exceptions import TaskOptionsError
 from cumulusci.tasks.salesforce import RetrieveUnpackaged
 from cumulusci.utils import temporary_dir
 
@@ -19,3 +22,28 @@ class TestRetrieveUnpackaged:
             task.api_class = mock.Mock()
             task._get_api()
             assert task.api_class.call_args[0][1] == "PACKAGE"
+
+    def test_get_api__concurrency(self):
+        with temporary_dir() as path:
+            with open(os.path.join(path, "package.xml"), "w") as f:
+                f.write("PACKAGE")
+            task = create_task(
+                RetrieveUnpackaged,
+                {"path": path, "package_xml": "package.xml", "concurrency": "2"},
+            )
+            with mock.patch(
+                "cumulusci.tasks.salesforce.RetrieveUnpackaged.ShardedRetrieveUnpackaged"
+            ) as sharded:
+                assert task._get_api() is sharded.return_value
+            assert sharded.call_args[0][1] == "PACKAGE"
+            assert sharded.call_args[1]["concurrency"] == 2
+
+    def test_init_options__invalid_concurrency(self):
+        with temporary_dir() as path:
+            with open(os.path.join(path, "package.xml"), "w") as f:
+                f.write("PACKAGE")
+            with pytest.raises(TaskOptionsError):
+                create_task(
+                    RetrieveUnpackaged,
+                    {"path": path, "package_xml": "package.xml", "concurrency": "x"},
+                )
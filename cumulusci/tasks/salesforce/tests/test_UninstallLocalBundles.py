@@ -17,3 +17,25 @@ class TestUninstallLocalBundles:
             task._get_api = mock.Mock()
             task()
             task._get_api.assert_called_once()
+
+    def test_run_task__bundle_dependencies(self, tmp_path):
+        for name in ("a", "b", "c"):
+            (tmp_path / name).mkdir()
+        task = create_task(
+            UninstallLocalBundles,
+            {
+                "path": str(tmp_path),
+                "concurrency": 2,
+                "bundle_dependencies": {"a": ["c"]},
+            },
+        )
+        deleted = []
+        task._get_api = mock.Mock(
+            side_effect=lambda path: lambda: deleted.append(os.path.basename(path))
+        )
+
+        task()
+
+        # Bundles are deleted before the bundles they depend on
+        assert sorted(deleted) == ["a", "b", "c"]
+        assert deleted.index("a") < deleted.index("c")
@@ -52,6 +52,19 @@ class TestBaseSalesforceTask:
         assert update_config_called
         self.project_config.keychain.set_org.assert_called_once()
 
+    @pytest.mark.parametrize("changes_records", [True, False])
+    def test_changes_records(self, changes_records):
+        self.org_config.records_changed = mock.Mock()
+        task = BaseSalesforceTask(
+            self.project_config, self.task_config, self.org_config
+        )
+        task.changes_records = changes_records
+        task._update_credentials = mock.Mock()
+        task._run_task = mock.Mock(side_effect=Exception("partly loaded"))
+        with pytest.raises(Exception, match="partly loaded"):
+            task()
+        assert self.org_config.records_changed.called == changes_records
+
 
 class TestBaseSalesforceApiTask:
     def test_sf_instance(self):
@@ -62,6 +75,26 @@ class TestBaseSalesforceApiTask:
         task._init_task()
         assert not task.sf.sf_instance.endswith("/")
 
+    def test_return_values__api_usage(self):
+        org_config = OrgConfig(
+            {"instance_url": "https://foo/", "access_token": "TOKEN"}, "test"
+        )
+        task = create_task(BaseSalesforceApiTask, org_config=org_config)
+        task.project_config.config["project"]["api_limits"] = {"budget": 0.5}
+        task._update_credentials = mock.Mock()
+        task._run_task = mock.Mock()
+        return_values = task()
+        assert return_values["api_usage"]["budget"] == 0.5
+
+    def test_return_values__no_api_limits(self):
+        org_config = OrgConfig(
+            {"instance_url": "https://foo/", "access_token": "TOKEN"}, "test"
+        )
+        task = create_task(BaseSalesforceApiTask, org_config=org_config)
+        task._update_credentials = mock.Mock()
+        task._run_task = mock.Mock()
+        assert "api_usage" not in task()
+
 
 class TestBaseSalesforceMetadataApiTask:
     def test_run_task(self):
@@ -108,3 +141,7 @@ class TestBaseUninstallMetadata:
             task.api_class = mock.Mock(return_value=api)
             task()
             api.assert_not_called()
+
+    def test_task_options__no_ledger(self):
+        assert "skip_unchanged" not in BaseUninstallMetadata.task_options
+        assert "delta" not in BaseUninstallMetadata.task_options
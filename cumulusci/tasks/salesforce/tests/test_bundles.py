@@ -0,0 +1,143 @@
+import pathlib
+import threading
+
+import pytest
+
+from cumulusci.core.exceptions import TaskOptionsError
+from cumulusci.tasks.salesforce.bundles import (
+    dependency_order,
+    get_bundle_dependencies,
+    list_bundles,
+    parse_bundle_dependencies,
+    process_concurrency_arg,
+    reverse_dependencies,
+    run_in_dependency_order,
+    scan_bundle_dependencies,
+)
+
+
+def write_bundles(path: pathlib.Path, files: dict):
+    for name, content in files.items():
+        file_path = path / name
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(content, bytes):
+            file_path.write_bytes(content)
+        else:
+            file_path.write_text(content)
+
+
+@pytest.fixture
+def bundles_path(tmp_path):
+    write_bundles(
+        tmp_path,
+        {
+            "a_objects/package.xml": "<Package><members>Unrelated</members></Package>",
+            "a_objects/objects/___NAMESPACE___Widget__c.object": "<CustomObject/>",
+            "b_layouts/layouts/Widget__c-Widget Layout.layout": "<field>%%%NAMESPACE%%%Widget__c.Name</field>",
+            "c_account/objects/Account.object": "<CustomObject/>",
+            "d_account_too/objects/Account.object": "<CustomObject/>",
+            "e_unrelated/classes/Unrelated.cls": "public class Unrelated {}",
+            "e_unrelated/staticresources/Logo.resource": b"\x89PNG\xff",
+            "file.txt": "not a bundle",
+        },
+    )
+    return str(tmp_path)
+
+
+def test_list_bundles(bundles_path):
+    assert list_bundles(bundles_path) == [
+        "a_objects",
+        "b_layouts",
+        "c_account",
+        "d_account_too",
+        "e_unrelated",
+    ]
+
+
+def test_scan_bundle_dependencies(bundles_path):
+    assert scan_bundle_dependencies(bundles_path, list_bundles(bundles_path)) == {
+        "a_objects": set(),
+        "b_layouts": {"a_objects"},
+        "c_account": set(),
+        "d_account_too": {"c_account"},
+        # package.xml does not define a component called Unrelated
+        "e_unrelated": set(),
+    }
+
+
+def test_get_bundle_dependencies(bundles_path):
+    bundles = list_bundles(bundles_path)
+    assert get_bundle_dependencies({}, bundles_path, bundles, 1) == {
+        bundle: set() for bundle in bundles
+    }
+    assert get_bundle_dependencies({}, bundles_path, bundles, 2)["b_layouts"] == {
+        "a_objects"
+    }
+    options = {"bundle_dependencies": {"a_objects": "e_unrelated"}}
+    assert get_bundle_dependencies(options, bundles_path, bundles, 2) == {
+        "a_objects": {"e_unrelated"},
+        "b_layouts": set(),
+        "c_account": set(),
+        "d_account_too": set(),
+        "e_unrelated": set(),
+    }
+
+
+def test_parse_bundle_dependencies__errors():
+    with pytest.raises(TaskOptionsError, match="mapping"):
+        parse_bundle_dependencies(["a"], ["a", "b"])
+    with pytest.raises(TaskOptionsError, match="not found: c"):
+        parse_bundle_dependencies({"a": ["c"]}, ["a", "b"])
+    with pytest.raises(TaskOptionsError, match="cycle"):
+        parse_bundle_dependencies({"a": ["b"], "b": ["a"]}, ["a", "b"])
+
+
+def test_process_concurrency_arg():
+    assert process_concurrency_arg(None) == 1
+    assert process_concurrency_arg("4") == 4
+    for value in ("0", "11", "many"):
+        with pytest.raises(TaskOptionsError):
+            process_concurrency_arg(value)
+
+
+def test_dependency_order():
+    assert dependency_order(["a", "b", "c"], {"a": {"c"}}) == ["b", "c", "a"]
+    assert reverse_dependencies({"a": set(), "b": {"a"}}) == {"a": {"b"}, "b": set()}
+
+
+def test_run_in_dependency_order():
+    events = []
+    a_started = threading.Event()
+    c_started = threading.Event()
+    lock = threading.Lock()
+
+    def process(item):
+        with lock:
+            events.append(f"start {item}")
+        if item == "a":
+            a_started.set()
+            # c has no dependencies, so it runs alongside a
+            assert c_started.wait(5)
+        if item == "c":
+            c_started.set()
+            assert a_started.wait(5)
+        with lock:
+            events.append(f"end {item}")
+
+    run_in_dependency_order(["a", "b", "c"], {"b": {"a"}}, process, max_workers=2)
+
+    assert set(events[:2]) == {"start a", "start c"}
+    assert events.index("start b") > events.index("end a")
+
+
+def test_run_in_dependency_order__error():
+    processed = []
+
+    def process(item):
+        processed.append(item)
+        if item == "a":
+            raise Exception("Deploy failed")
+
+    with pytest.raises(Exception, match="Deploy failed"):
+        run_in_dependency_order(["a", "b", "c"], {}, process, max_workers=1)
+    assert processed == ["a"]
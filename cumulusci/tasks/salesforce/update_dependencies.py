@@ -224,6 +224,7 @@ class UpdateDependencies(BaseSalesforceTask):
             self._install_dependency(d)
 
         self.org_config.reset_installed_packages()
+        self.org_config.org_changed()
 
     def _install_dependency(self, dependency):
         if isinstance(
@@ -20,6 +20,7 @@ Assigns Permission Sets whose Names are in ``api_names`` to either the default o
             "description": "Target user aliases, separated by commas. Defaults to the current running user."
         },
     }
+    thread_safe = True
 
     permission_name = "PermissionSet"
     permission_name_field = "Name"
@@ -132,6 +133,9 @@ Assigns Permission Sets whose Names are in ``api_names`` to either the default o
                 "composite/sobjects", method="POST", data=request_body
             )
             result_list.extend(result)
+        if result_list:
+            # New assignments change which objects and fields are accessible
+            self.org_config.reset_describe_cache()
         self._process_composite_results(result_list)
 
     def _process_composite_results(self, api_results):
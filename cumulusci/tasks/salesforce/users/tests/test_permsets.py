@@ -84,9 +84,11 @@ class TestCreatePermissionSet:
             ],
         )
 
+        task.org_config.describe_cache.get(("key",), lambda: "stale")
         task()
 
         assert len(responses.calls) == 3
+        assert len(task.org_config.describe_cache) == 0
 
     @responses.activate
     def test_create_permset__alias(self):
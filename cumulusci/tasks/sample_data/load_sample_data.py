@@ -25,6 +25,7 @@ class LoadSampleData(BaseSalesforceApiTask):
         },
     }
     org_config: OrgConfig
+    changes_records = True
 
     def _run_task(self):
         name = self._find_dataset()
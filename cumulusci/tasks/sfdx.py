@@ -50,6 +50,13 @@ class SFDXOrgTask(SFDXBaseTask, BaseSalesforceTask):
             command += " -o {username}".format(username=self.org_config.username)
         return command
 
+    def _run_task(self):
+        try:
+            super()._run_task()
+        finally:
+            # The command may have deployed metadata or installed packages
+            self.org_config.org_changed()
+
     def _get_env(self):
         env = super(SFDXOrgTask, self)._get_env()
         if not isinstance(self.org_config, ScratchOrgConfig):
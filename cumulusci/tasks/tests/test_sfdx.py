@@ -66,11 +66,13 @@ class TestSFDXBaseTask(MockLoggerMixin):
 
         org_config.refresh_oauth_token = mock.Mock(side_effect=refresh_oauth_token)
         org_config.save = mock.Mock()
+        org_config.org_changed = mock.Mock()
 
         task = SFDXOrgTask(self.project_config, self.task_config, org_config)
         task()
 
         org_config.refresh_oauth_token.assert_called_once()
+        org_config.org_changed.assert_called_once()
         print(task._get_env())
         assert "SF_ORG_INSTANCE_URL" in task._get_env()
         assert "SF_TARGET_ORG" in task._get_env()
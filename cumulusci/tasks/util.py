@@ -82,6 +82,7 @@ class ListMetadataTypes(BaseTask):
 
 class Sleep(BaseTask):
     name = "Sleep"
+    thread_safe = True
 
     class Options(CCIOptions):
         seconds: int = Field(..., description="The number of seconds to sleep")
@@ -18,6 +18,7 @@ from cumulusci.core.flowrunner import FlowCoordinator
 from cumulusci.core.tasks import BaseTask
 from cumulusci.tests.util import create_project_config
 from cumulusci.utils.xml import elementtree_parse_file, lxml_parse_file
+from cumulusci.utils.ziputils import compress_zipfile
 
 
 class FunTestTask(BaseTask):
@@ -436,6 +437,19 @@ Options\n------------------------------------------\n\n
                 result = f.read()
             assert contents == result
 
+    def test_process_text_in_directory__unchanged_file_not_written(self):
+        with utils.temporary_dir():
+            with open("test", "w") as f:
+                f.write("test")
+            os.utime("test", (0, 0))
+
+            def process(name, content):
+                return name, content
+
+            utils.process_text_in_directory(".", process)
+
+            assert os.stat("test").st_mtime == 0
+
     def test_process_text_in_zipfile__skips_binary(self):
         contents = b"\x9c%%%NAMESPACE%%%"
         zf = zipfile.ZipFile(io.BytesIO(), "w")
@@ -450,6 +464,40 @@ Options\n------------------------------------------\n\n
         assert contents == result
         zf.close()
 
+    @pytest.mark.parametrize(
+        "compresslevel,compress_type",
+        [
+            (None, zipfile.ZIP_DEFLATED),
+            (9, zipfile.ZIP_DEFLATED),
+            (0, zipfile.ZIP_STORED),
+        ],
+    )
+    def test_compress_zipfile(self, compresslevel, compress_type):
+        zf = zipfile.ZipFile(io.BytesIO(), "w", zipfile.ZIP_STORED)
+        for i in range(20):
+            zf.writestr(f"classes/Class{i}.cls", f"public class Class{i} {{}}" * 100)
+        zf.writestr("staticresources/", "")
+        zf.writestr("binary", b"\x9c\x00" * 10)
+
+        new_zf = compress_zipfile(zf, compresslevel)
+        fp = new_zf.fp
+        new_zf.close()
+        new_zf = zipfile.ZipFile(fp, "r")
+
+        assert new_zf.testzip() is None
+        assert new_zf.namelist() == [f"classes/Class{i}.cls" for i in range(20)] + [
+            "staticresources/",
+            "binary",
+        ]
+        assert new_zf.getinfo("staticresources/").is_dir()
+        assert new_zf.read("classes/Class3.cls") == b"public class Class3 {}" * 100
+        assert new_zf.read("binary") == b"\x9c\x00" * 10
+        assert all(
+            info.compress_type == compress_type
+            for info in new_zf.infolist()
+            if not info.is_dir()
+        )
+
     def test_inject_namespace__managed(self):
         logger = mock.Mock()
         name = "___NAMESPACE___test"
@@ -485,6 +533,37 @@ Options\n------------------------------------------\n\n
         )
         assert content == "ns__"
 
+    def test_inject_namespace__no_tokens(self):
+        logger = mock.Mock()
+        content = "public class Foo { String s = '%%%'; }"
+        name, new_content = utils.inject_namespace(
+            "classes/Foo.cls", content, namespace="ns", managed=True, logger=logger
+        )
+        assert name == "classes/Foo.cls"
+        assert new_content is content
+        logger.info.assert_not_called()
+
+    def test_inject_namespace__logs_each_token(self):
+        logger = mock.Mock()
+        utils.inject_namespace(
+            "test",
+            "%%%NAMESPACE_DOT%%% %%%NAMESPACE%%% %%%NAMESPACE%%%",
+            namespace="ns",
+            managed=True,
+            logger=logger,
+        )
+        assert logger.info.call_args_list == [
+            mock.call('  test: Replaced %%%NAMESPACE_DOT%%% with "ns."'),
+            mock.call('  test: Replaced %%%NAMESPACE%%% with "ns__"'),
+        ]
+
+    def test_multi_replacer(self):
+        replacer = utils.MultiReplacer({"%%%A%%%": "a", "%%%AB%%%": "b", "": "x"})
+        assert replacer.prefix == "%%%A"
+        assert replacer.replace("%%%AB%%% %%%A%%%") == ("b a", ["%%%AB%%%", "%%%A%%%"])
+        assert replacer.replace("none") == ("none", [])
+        assert utils.MultiReplacer({}).replace("text") == ("text", [])
+
     def test_strip_namespace(self):
         logger = mock.Mock()
         name, content = utils.strip_namespace(
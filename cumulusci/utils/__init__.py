@@ -1,5 +1,6 @@
 import contextlib
 import fnmatch
+import functools
 import io
 import math
 import os
@@ -11,7 +12,7 @@ import textwrap
 import zipfile
 from datetime import datetime
 from pathlib import Path
-from typing import Union
+from typing import Dict, List, Tuple, Union
 
 import requests
 import sarge
@@ -175,7 +176,8 @@ def process_text_in_directory(path, process_file):
     and returns a (possibly modified) filename and content.  The file will be
     updated with the new content, and renamed if necessary.
 
-    Files with content that cannot be decoded as UTF-8 will be skipped.
+    Files with content that cannot be decoded as UTF-8 will be skipped,
+    and files which are not changed are not rewritten.
     """
 
     for path, dirs, files in os.walk(path):
@@ -191,10 +193,51 @@ def process_text_in_directory(path, process_file):
             new_path = os.path.join(path, new_name)
             if new_name != orig_name:
                 os.rename(orig_path, new_path)
+            elif new_content == orig_content:
+                continue
             with open(new_path, "w", encoding="utf-8") as f:
                 f.write(new_content)
 
 
+class MultiReplacer:
+    """Replaces several literal tokens in a single pass over a string.
+
+    Text which doesn't contain the prefix shared by all of the tokens
+    (such as "%%%NAMESPACE") is returned after a single fast scan."""
+
+    def __init__(self, replacements: Dict[str, str]):
+        self.replacements = replacements
+        tokens = sorted((token for token in replacements if token), key=len)
+        self.prefix = os.path.commonprefix(tokens)
+        self.pattern = (
+            re.compile("|".join(re.escape(t) for t in reversed(tokens)))
+            if tokens
+            else None
+        )
+
+    def replace(self, text: str) -> Tuple[str, List[str]]:
+        """Returns the text with each token replaced, and the tokens found."""
+        if self.pattern is None or (self.prefix and self.prefix not in text):
+            return text, []
+        found = {}
+
+        def replace_token(match):
+            token = match.group()
+            found[token] = None
+            return self.replacements[token]
+
+        return self.pattern.sub(replace_token, text), list(found)
+
+
+@functools.lru_cache(maxsize=32)
+def _get_replacer(replacements: Tuple[Tuple[str, str], ...]) -> MultiReplacer:
+    # Tokens are listed in order of precedence, so the first replacement wins
+    replacements_dict = {}
+    for token, replacement in replacements:
+        replacements_dict.setdefault(token, replacement)
+    return MultiReplacer(replacements_dict)
+
+
 def inject_namespace(
     name,
     content,
@@ -236,51 +279,33 @@ def inject_namespace(
     namespaced_org_or_c_token = "%%%NAMESPACED_ORG_OR_C%%%"
     namespaced_org_or_c = namespace if namespaced_org else "c"
 
-    orig_name = name
-    prev_content = content
-    content = content.replace(namespace_token, namespace_prefix)
-    if logger and content != prev_content:
-        logger.info(f'  {name}: Replaced {namespace_token} with "{namespace_prefix}"')
-
-    prev_content = content
-    content = content.replace(namespace_dot_token, namespace_dot_prefix)
-    if logger and content != prev_content:
-        logger.info(
-            f'  {name}: Replaced {namespace_dot_token} with "{namespace_dot_prefix}"'
-        )
-
-    prev_content = content
-    content = content.replace(namespace_or_c_token, namespace_or_c)
-    if logger and content != prev_content:
-        logger.info(
-            f'  {name}: Replaced {namespace_or_c_token} with "{namespace_or_c}"'
-        )
-
+    content_tokens = [
+        (namespace_token, namespace_prefix),
+        (namespace_dot_token, namespace_dot_prefix),
+        (namespace_or_c_token, namespace_or_c),
+    ]
     if name == "package.xml":
-        prev_content = content
-        content = content.replace(filename_token, namespace_prefix)
-        if logger and content != prev_content:
+        content_tokens.append((filename_token, namespace_prefix))
+    content_tokens += [
+        (namespaced_org_token, namespaced_org),
+        (namespaced_org_or_c_token, namespaced_org_or_c),
+    ]
+    replacer = _get_replacer(tuple(content_tokens))
+    content, found = replacer.replace(content)
+    if logger:
+        for token in found:
             logger.info(
-                f'  {name}: Replaced {filename_token} with "{namespace_prefix}"'
+                f'  {name}: Replaced {token} with "{replacer.replacements[token]}"'
             )
 
-    prev_content = content
-    content = content.replace(namespaced_org_token, namespaced_org)
-    if logger and content != prev_content:
-        logger.info(
-            f'  {name}: Replaced {namespaced_org_token} with "{namespaced_org}"'
-        )
-
-    prev_content = content
-    content = content.replace(namespaced_org_or_c_token, namespaced_org_or_c)
-    if logger and content != prev_content:
-        logger.info(
-            f'  {name}: Replaced {namespaced_org_or_c_token} with "{namespaced_org_or_c}"'
-        )
-
     # Replace namespace token in file name
-    name = name.replace(filename_token, namespace_prefix)
-    name = name.replace(namespaced_org_file_token, namespaced_org)
+    orig_name = name
+    name, _ = _get_replacer(
+        (
+            (filename_token, namespace_prefix),
+            (namespaced_org_file_token, namespaced_org),
+        )
+    ).replace(name)
     if logger and name != orig_name:
         logger.info(f"  {orig_name}: renamed to {name}")
 
@@ -292,11 +317,11 @@ def strip_namespace(name, content, namespace, logger=None):
     namespace_prefix = "{}__".format(namespace)
     lightning_namespace = "{}:".format(namespace)
 
-    orig_content = content
-    new_content = orig_content.replace(namespace_prefix, "")
-    new_content = new_content.replace(lightning_namespace, "c:")
+    new_content, found = _get_replacer(
+        ((namespace_prefix, ""), (lightning_namespace, "c:"))
+    ).replace(content)
     name = name.replace(namespace_prefix, "")
-    if orig_content != new_content and logger:
+    if found and logger:
         logger.info(
             "  {file_name}: removed {namespace}".format(
                 file_name=name, namespace=namespace_prefix
@@ -315,8 +340,12 @@ def tokenize_namespace(name, content, namespace, logger=None):
     namespace_prefix = "{}__".format(namespace)
     lightning_namespace = "{}:".format(namespace)
 
-    content = content.replace(namespace_prefix, "%%%NAMESPACE%%%")
-    content = content.replace(lightning_namespace, "%%%NAMESPACE_OR_C%%%")
+    content, _ = _get_replacer(
+        (
+            (namespace_prefix, "%%%NAMESPACE%%%"),
+            (lightning_namespace, "%%%NAMESPACE_OR_C%%%"),
+        )
+    ).replace(content)
     name = name.replace(namespace_prefix, "___NAMESPACE___")
 
     return name, content
@@ -1,6 +1,8 @@
 import pathlib
 import re
-from typing import Any, Optional, Tuple
+from typing import Any, List, Optional, Tuple
+
+import sarge
 
 EMPTY_URL_MESSAGE = """
 The provided URL is empty or no URL under git remote "origin".
@@ -28,6 +30,30 @@ def current_branch(repo_root: str) -> Optional[str]:
                 return "/".join(branch_ref[5:].split("/")[2:])
 
 
+def changed_files(repo_root: str, ref: str) -> Optional[List[str]]:
+    """Paths, relative to repo_root, of the files which differ between
+    the commit `ref` and the working tree, including untracked files
+    which are not ignored, or None if git can't tell."""
+    paths = []
+    for command in (
+        ["git", "diff", "--name-only", ref, "--"],
+        ["git", "ls-files", "--others", "--exclude-standard"],
+    ):
+        try:
+            p = sarge.run(
+                command,
+                cwd=repo_root,
+                stdout=sarge.Capture(),
+                stderr=sarge.Capture(),
+            )
+        except ValueError:  # git is not installed
+            return None
+        if p.returncode:
+            return None
+        paths.extend(p.stdout.text.splitlines())
+    return list(dict.fromkeys(paths))
+
+
 def is_release_branch(branch_name: str, prefix: str) -> bool:
     """A release branch begins with the given prefix"""
     if not branch_name.startswith(prefix):
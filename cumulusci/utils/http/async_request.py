@@ -0,0 +1,291 @@
+import asyncio
+import logging
+import os
+import time
+import typing as T
+import weakref
+from urllib.parse import urlsplit
+
+from requests.exceptions import ReadTimeout
+
+from cumulusci.core.utils import process_bool_arg
+from cumulusci.salesforce_api.api_limits import governor_for_session
+from cumulusci.utils.http.multi_request import (
+    IDEMPOTENT_METHODS,
+    RECOVERABLE_ERRORS,
+    CompositeParallelSalesforce,
+    HTTPRequestError,
+    create_composite_requests,
+    split_requests,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import httpx
+
+    ASYNC_DEPENDENCIES_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    ASYNC_DEPENDENCIES_AVAILABLE = False
+
+REQUEST_LIMIT_EXCEEDED = "REQUEST_LIMIT_EXCEEDED"
+
+# Semaphores limiting the requests in flight to each Salesforce instance,
+# shared by every session on an event loop
+_instance_semaphores = weakref.WeakKeyDictionary()
+
+
+def instance_semaphore(instance: str, max_concurrency: int) -> asyncio.Semaphore:
+    """The semaphore for requests to `instance` on the running event loop.
+
+    The first session to connect to an instance sets its limit."""
+    semaphores = _instance_semaphores.setdefault(asyncio.get_running_loop(), {})
+    if instance not in semaphores:
+        semaphores[instance] = asyncio.Semaphore(max_concurrency)
+    return semaphores[instance]
+
+
+class AsyncCompositeSalesforce:
+    """Salesforce Session which sends Composite API requests concurrently
+    from a single thread using asyncio.
+
+    Has the same contract as CompositeParallelSalesforce, but in-flight
+    requests are coroutines rather than OS threads, so thousands of
+    sub-requests can be outstanding at once. Concurrency against the org
+    is capped by `max_concurrency`, and responses that indicate the org is
+    overloaded (HTTP 429 or REQUEST_LIMIT_EXCEEDED) pause every request
+    in the session before retrying. Sessions on the same event loop share
+    the cap for each org's instance, and requests are throttled by the
+    org's ApiLimitGovernor, if `sf` has one.
+    """
+
+    chunk_size = 25  # max composite batch size
+    max_concurrency = 64
+    max_retries = 5
+    backoff_seconds = 1.0
+    max_backoff_seconds = 60.0
+    timeout = 30
+    opened = False
+
+    def __init__(
+        self,
+        sf,
+        chunk_size=None,
+        max_concurrency=None,
+        max_retries=None,
+        transport=None,
+    ):
+        if not ASYNC_DEPENDENCIES_AVAILABLE:  # pragma: no cover
+            raise ImportError(
+                "AsyncCompositeSalesforce requires the optional `httpx` dependency."
+            )
+        self.sf = sf
+        self.base_url = self.sf.base_url.rstrip("/") + "/"
+        self.chunk_size = chunk_size or self.chunk_size
+        self.max_concurrency = max_concurrency or self.max_concurrency
+        self.max_retries = max_retries if max_retries is not None else self.max_retries
+        self.transport = transport
+        self.throttle_count = 0
+        self.instance = urlsplit(self.base_url).netloc
+        self.governor = governor_for_session(getattr(sf, "session", None))
+
+    def open(self):
+        self.opened = True
+
+    def close(self):
+        self.opened = False
+
+    def __enter__(self, *args):
+        self.open()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def do_composite_requests(
+        self, requests
+    ) -> T.Tuple[T.Sequence, T.Sequence]:  # results, errors
+        if not self.opened:
+            raise AssertionError(
+                "Session was not opened. Please call open() or use as a context manager"
+            )
+        return asyncio.run(self.async_composite_requests(requests))
+
+    async def async_composite_requests(
+        self, requests
+    ) -> T.Tuple[T.List, T.List]:  # results, errors
+        """Coroutine version of do_composite_requests for callers which
+        already have a running event loop."""
+        self._semaphore = instance_semaphore(self.instance, self.max_concurrency)
+        self._resume_at = 0.0
+
+        composite_requests = list(create_composite_requests(requests, self.chunk_size))
+        async with httpx.AsyncClient(
+            transport=self.transport,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.max_concurrency),
+        ) as client:
+            responses = await asyncio.gather(
+                *(self._request(client, request) for request in composite_requests)
+            )
+            results = []
+            errors = []
+            for idx, response in enumerate(responses):
+                if isinstance(response, HTTPRequestError):
+                    errors.append(response)
+                elif response.is_error:
+                    errors.append(
+                        HTTPRequestError(
+                            httpx.HTTPStatusError(
+                                f"Composite request failed: {response.text}",
+                                request=response.request,
+                                response=response,
+                            ),
+                            composite_requests[idx],
+                        )
+                    )
+                else:
+                    results.extend(response.json()["compositeResponse"])
+
+            if errors:
+                singleton_results, unrecoverable_errors = await self._retry_errors(
+                    client, errors
+                )
+                results.extend(singleton_results)
+            else:
+                unrecoverable_errors = []
+
+        return results, unrecoverable_errors
+
+    async def _retry_errors(self, client, errors: T.List[HTTPRequestError]):
+        "Retry the idempotent members of composite requests that had errors."
+        unrecoverable_errors = []
+        singleton_requests = []
+        for error in errors:
+            if isinstance(error.exception, RECOVERABLE_ERRORS):
+                for request in split_requests(error.request):
+                    if request["method"] in IDEMPOTENT_METHODS:
+                        singleton_requests.append(request)
+                    else:
+                        unrecoverable_errors.append(
+                            HTTPRequestError(error.exception, request)
+                        )
+            else:
+                unrecoverable_errors.append(error)
+
+        responses = await asyncio.gather(
+            *(self._request(client, request) for request in singleton_requests)
+        )
+        singleton_results = []
+        for response in responses:
+            if isinstance(response, HTTPRequestError):
+                unrecoverable_errors.append(response)
+            else:
+                singleton_results.append(
+                    {
+                        "httpStatusCode": response.status_code,
+                        "body": response.json(),
+                        "httpHeaders": response.headers,
+                    }
+                )
+        return singleton_results, unrecoverable_errors
+
+    async def _request(self, client, request: dict):
+        """Send a single HTTP request, backing off while the org is
+        throttling us. Returns an httpx.Response or an HTTPRequestError."""
+        headers = {**self.sf.headers, **(request.get("httpHeaders") or {})}
+        for attempt in range(self.max_retries + 1):
+            await self._wait_for_backpressure()
+            async with self._semaphore:
+                await self._wait_for_backpressure()
+                if self.governor:
+                    self.governor.check()
+                    await self.governor.async_throttle()
+                try:
+                    response = await client.request(
+                        request["method"],
+                        self.base_url + request["url"].lstrip("/"),
+                        headers=headers,
+                        json=request.get("json"),
+                    )
+                except httpx.TimeoutException as e:
+                    return HTTPRequestError(ReadTimeout(str(e)), request)
+                except httpx.TransportError as e:
+                    return HTTPRequestError(ConnectionError(str(e)), request)
+                except Exception as e:
+                    return HTTPRequestError(e, request)
+                if self.governor:
+                    self.governor.record_headers(response.headers)
+
+            if not is_throttled(response):
+                return response
+            if attempt < self.max_retries:
+                self._throttle(response, attempt)
+
+        return HTTPRequestError(
+            RequestLimitExceeded(
+                f"Salesforce is still throttling after {self.max_retries} retries: "
+                f"{response.text}"
+            ),
+            request,
+        )
+
+    async def _wait_for_backpressure(self):
+        delay = self._resume_at - time.monotonic()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self._resume_at - time.monotonic()
+
+    def _throttle(self, response, attempt: int):
+        "Pause every request in the session before it is retried."
+        self.throttle_count += 1
+        delay = min(self.backoff_seconds * 2**attempt, self.max_backoff_seconds)
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        resume_at = time.monotonic() + delay
+        if resume_at > self._resume_at:
+            logger.warning(
+                f"Salesforce is throttling API requests. Pausing for {delay:.1f}s."
+            )
+            self._resume_at = resume_at
+
+
+class RequestLimitExceeded(Exception):
+    pass
+
+
+def is_throttled(response) -> bool:
+    "Does this response indicate that the org wants us to slow down?"
+    if response.status_code == 429:
+        return True
+    if response.status_code == 403:
+        try:
+            body = response.json()
+        except ValueError:
+            return False
+        return isinstance(body, list) and any(
+            error.get("errorCode") == REQUEST_LIMIT_EXCEEDED
+            for error in body
+            if isinstance(error, dict)
+        )
+    return False
+
+
+def async_http_enabled() -> bool:
+    return ASYNC_DEPENDENCIES_AVAILABLE and process_bool_arg(
+        os.environ.get("CUMULUSCI_ASYNC_HTTP") or False
+    )
+
+
+def composite_salesforce_session(sf, chunk_size=None, max_workers=None):
+    """Return a Composite API session for `sf`.
+
+    Uses the asyncio engine when the CUMULUSCI_ASYNC_HTTP environment
+    variable is set to True and its optional dependency is installed,
+    and the thread-pool engine otherwise."""
+    if async_http_enabled():
+        return AsyncCompositeSalesforce(sf, chunk_size=chunk_size)
+    return CompositeParallelSalesforce(
+        sf, chunk_size=chunk_size, max_workers=max_workers
+    )
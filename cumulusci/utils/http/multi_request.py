@@ -2,9 +2,11 @@ import typing as T
 from concurrent.futures import as_completed
 from itertools import chain
 
+from requests.adapters import DEFAULT_POOLSIZE
 from requests.exceptions import ReadTimeout
 from requests_futures.sessions import FuturesSession
 
+from cumulusci.salesforce_api.api_limits import governor_for_session
 from cumulusci.utils.iterators import iterate_in_chunks, partition
 
 RECOVERABLE_ERRORS = (ReadTimeout, ConnectionError)
@@ -81,9 +83,24 @@ class ParallelSalesforce(ParallelHTTP):
         base_url = self.sf.base_url.rstrip("/") + "/"
         super().__init__(base_url, max_workers)
 
+    def __enter__(self, *args):
+        super().__enter__(*args)
+        # Count and throttle requests against the org's API budget
+        self.governor = governor_for_session(self.sf.session)
+        if self.governor:
+            self.governor.install(
+                self.session,
+                raise_at_ceiling=False,
+                pool_maxsize=max(self.max_workers, DEFAULT_POOLSIZE),
+            )
+        return self
+
     def _async_request(
         self, url: str, method: str, json: object = None, httpHeaders: dict = None
     ):
+        # Worker threads can't stop the task, so check the ceiling here
+        if self.governor:
+            self.governor.check()
         headers = {**self.sf.headers, **(httpHeaders or {})}
         return super()._async_request(url, method, json, headers)
 
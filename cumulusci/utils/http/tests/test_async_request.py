@@ -0,0 +1,244 @@
+import asyncio
+import json
+from unittest import mock
+
+import pytest
+import requests
+
+from cumulusci.salesforce_api.api_limits import ApiLimitGovernor
+from cumulusci.salesforce_api.exceptions import ApiLimitExceeded
+from cumulusci.utils.http.async_request import (
+    AsyncCompositeSalesforce,
+    RequestLimitExceeded,
+    composite_salesforce_session,
+    is_throttled,
+)
+from cumulusci.utils.http.multi_request import CompositeParallelSalesforce
+
+httpx = pytest.importorskip("httpx")
+
+
+@pytest.fixture
+def fake_sf():
+    return mock.Mock(
+        base_url="https://example.my.salesforce.com/services/data/v50.0/",
+        headers={"Authorization": "Bearer TOKEN"},
+    )
+
+
+def composite_echo(request):
+    "Answer each composite sub-request with its own referenceId"
+    body = json.loads(request.content)
+    return httpx.Response(
+        200,
+        json={
+            "compositeResponse": [
+                {
+                    "body": {"url": sub["url"]},
+                    "httpHeaders": {},
+                    "httpStatusCode": 200,
+                    "referenceId": sub["referenceId"],
+                }
+                for sub in body["compositeRequest"]
+            ]
+        },
+    )
+
+
+def make_requests(n, method="GET", prefix="ref"):
+    return [
+        {
+            "method": method,
+            "url": f"/services/data/v50.0/sobjects/Obj{i}/describe",
+            "referenceId": f"{prefix}{i}",
+        }
+        for i in range(n)
+    ]
+
+
+class TestAsyncCompositeSalesforce:
+    def test_many_requests(self, fake_sf):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            assert request.headers["Authorization"] == "Bearer TOKEN"
+            assert request.url.path == "/services/data/v50.0/composite"
+            return composite_echo(request)
+
+        transport = httpx.MockTransport(handler)
+        with AsyncCompositeSalesforce(
+            fake_sf, chunk_size=25, transport=transport
+        ) as acsf:
+            results, errors = acsf.do_composite_requests(make_requests(1000))
+
+        assert not errors
+        assert len(calls) == 40
+        assert {r["referenceId"] for r in results} == {f"ref{i}" for i in range(1000)}
+
+    def test_not_opened(self, fake_sf):
+        acsf = AsyncCompositeSalesforce(fake_sf)
+        with pytest.raises(AssertionError):
+            acsf.do_composite_requests([])
+
+    def test_empty(self, fake_sf):
+        transport = httpx.MockTransport(composite_echo)
+        with AsyncCompositeSalesforce(fake_sf, transport=transport) as acsf:
+            results, errors = acsf.do_composite_requests([])
+        assert results == [] and errors == []
+
+    def test_backpressure(self, fake_sf):
+        counter = {"calls": 0}
+
+        def handler(request):
+            counter["calls"] += 1
+            if counter["calls"] == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            if counter["calls"] == 2:
+                return httpx.Response(
+                    403,
+                    json=[{"errorCode": "REQUEST_LIMIT_EXCEEDED", "message": "no"}],
+                )
+            return composite_echo(request)
+
+        transport = httpx.MockTransport(handler)
+        acsf = AsyncCompositeSalesforce(fake_sf, max_concurrency=1, transport=transport)
+        acsf.backoff_seconds = 0.001
+        with acsf:
+            results, errors = acsf.do_composite_requests(make_requests(3))
+
+        assert not errors
+        assert len(results) == 3
+        assert acsf.throttle_count == 2
+
+    def test_backpressure__retries_exhausted(self, fake_sf):
+        transport = httpx.MockTransport(lambda request: httpx.Response(429))
+        acsf = AsyncCompositeSalesforce(fake_sf, max_retries=2, transport=transport)
+        acsf.backoff_seconds = 0.001
+        with acsf:
+            results, errors = acsf.do_composite_requests(make_requests(3))
+
+        assert results == []
+        assert len(errors) == 1
+        assert isinstance(errors[0].exception, RequestLimitExceeded)
+
+    def test_timeout_retries_idempotent_requests(self, fake_sf):
+        singles = []
+
+        def handler(request):
+            if request.url.path.endswith("/composite"):
+                body = json.loads(request.content)
+                if body["compositeRequest"][0]["referenceId"] == "ref0":
+                    raise httpx.ReadTimeout("Timed out", request=request)
+                return composite_echo(request)
+            singles.append(request)
+            return httpx.Response(200, json={"single": True})
+
+        requests = make_requests(1)
+        requests += make_requests(1, method="POST", prefix="post")
+        requests += make_requests(2, prefix="other")
+        transport = httpx.MockTransport(handler)
+        with AsyncCompositeSalesforce(
+            fake_sf, chunk_size=2, transport=transport
+        ) as acsf:
+            results, errors = acsf.do_composite_requests(requests)
+
+        # The GET in the failing chunk is retried on its own. The POST is not.
+        assert len(singles) == 1
+        assert singles[0].url.path == "/services/data/v50.0/sobjects/Obj0/describe"
+        assert len(results) == 3
+        assert len(errors) == 1
+        assert errors[0].request["method"] == "POST"
+
+    def test_composite_http_error(self, fake_sf):
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(401, json=[{"errorCode": "INVALID"}])
+        )
+        with AsyncCompositeSalesforce(fake_sf, transport=transport) as acsf:
+            results, errors = acsf.do_composite_requests(make_requests(2))
+        assert results == []
+        assert isinstance(errors[0].exception, httpx.HTTPStatusError)
+
+    def test_concurrency_shared_by_instance(self, fake_sf):
+        in_flight = peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return composite_echo(request)
+
+        transport = httpx.MockTransport(handler)
+        sessions = [
+            AsyncCompositeSalesforce(fake_sf, max_concurrency=2, transport=transport)
+            for _ in range(2)
+        ]
+
+        async def run_sessions():
+            return await asyncio.gather(
+                *(
+                    session.async_composite_requests(make_requests(100))
+                    for session in sessions
+                )
+            )
+
+        for results, errors in asyncio.run(run_sessions()):
+            assert len(results) == 100 and not errors
+        assert peak == 2
+
+    def test_api_limit_governor(self, fake_sf):
+        usage = {"used": 60}
+
+        def handler(request):
+            response = composite_echo(request)
+            response.headers["Sforce-Limit-Info"] = f"api-usage={usage['used']}/100"
+            return response
+
+        governor = ApiLimitGovernor(budget=0.5, ceiling=0.9)
+        governor.max_throttle_delay = 0.001
+        fake_sf.session = requests.Session()
+        governor.install(fake_sf.session)
+        transport = httpx.MockTransport(handler)
+        with AsyncCompositeSalesforce(
+            fake_sf, max_concurrency=1, transport=transport
+        ) as acsf:
+            results, errors = acsf.do_composite_requests(make_requests(50))
+            assert len(results) == 50 and not errors
+            assert governor.requests_made == 2
+            assert governor.usage.used == 60
+            # The first request was sent before usage was known
+            assert governor.throttled_seconds > 0
+
+            usage["used"] = 95
+            with pytest.raises(ApiLimitExceeded):
+                acsf.do_composite_requests(make_requests(50))
+
+
+def test_is_throttled():
+    assert is_throttled(httpx.Response(429))
+    assert is_throttled(
+        httpx.Response(403, json=[{"errorCode": "REQUEST_LIMIT_EXCEEDED"}])
+    )
+    assert not is_throttled(httpx.Response(403, json=[{"errorCode": "OTHER"}]))
+    assert not is_throttled(httpx.Response(403, text="Forbidden"))
+    assert not is_throttled(httpx.Response(200, json={}))
+
+
+def test_composite_salesforce_session(fake_sf, monkeypatch):
+    monkeypatch.delenv("CUMULUSCI_ASYNC_HTTP", raising=False)
+    assert isinstance(
+        composite_salesforce_session(fake_sf), CompositeParallelSalesforce
+    )
+
+    monkeypatch.setenv("CUMULUSCI_ASYNC_HTTP", "True")
+    assert isinstance(composite_salesforce_session(fake_sf), AsyncCompositeSalesforce)
+
+    monkeypatch.setenv("CUMULUSCI_ASYNC_HTTP", "1")
+    assert isinstance(composite_salesforce_session(fake_sf), AsyncCompositeSalesforce)
+
+    monkeypatch.setenv("CUMULUSCI_ASYNC_HTTP", "false")
+    assert isinstance(
+        composite_salesforce_session(fake_sf), CompositeParallelSalesforce
+    )
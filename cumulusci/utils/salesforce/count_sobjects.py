@@ -1,9 +1,21 @@
+import json
+import time
 import typing as T
 
+from requests.exceptions import RequestException
 from simple_salesforce import Salesforce
+from simple_salesforce.exceptions import SalesforceError
 
-from cumulusci.utils.http.multi_request import CompositeParallelSalesforce
-from cumulusci.utils.iterators import partition
+from cumulusci.utils.http.async_request import composite_salesforce_session
+from cumulusci.utils.http.multi_request import HTTPRequestError
+from cumulusci.utils.iterators import iterate_in_chunks, partition
+
+# Object names per recordCount request. Keeps the URL a sensible length.
+RECORD_COUNT_CHUNK_SIZE = 100
+# How long cached counts are trusted, in seconds
+DEFAULT_COUNT_TTL = 60 * 60
+# Name of the orginfo cache directory holding a RecordCountCache
+RECORD_COUNT_CACHE_NAME = "record_counts"
 
 
 class ObjectCount(T.NamedTuple):
@@ -14,7 +26,7 @@ class ObjectCount(T.NamedTuple):
 
 def count_sobjects(sf: Salesforce, objs: T.Sequence[str]) -> ObjectCount:
     """Quickly count SObjects using SOQL and Parallelization"""
-    with CompositeParallelSalesforce(sf, max_workers=8, chunk_size=5) as cpsf:
+    with composite_salesforce_session(sf, max_workers=8, chunk_size=5) as cpsf:
         responses, transport_errors = cpsf.do_composite_requests(
             (
                 {
@@ -44,3 +56,112 @@ def count_sobjects(sf: Salesforce, objs: T.Sequence[str]) -> ObjectCount:
         for response in successes
     }
     return ObjectCount(ret, transport_errors, tuple(salesforce_errors))
+
+
+def count_sobjects_fast(
+    sf: Salesforce,
+    objs: T.Sequence[str],
+    cache: T.Optional["RecordCountCache"] = None,
+    *,
+    verify_empty: bool = False,
+) -> ObjectCount:
+    """Count SObjects using the recordCount resource, which reports many
+    objects in a single request.
+
+    recordCount reports the org's stored record counts rather than running
+    a query, so counts can lag slightly behind the data. Objects missing from
+    its response are counted with SOQL instead, as are objects it reports as
+    empty if `verify_empty` is set. If a `cache` is supplied, unexpired counts
+    are read from it and new counts are written to it."""
+    objs = list(objs)
+    cached_counts = cache.get(objs) if cache else {}
+    objs_to_count = [obj for obj in objs if obj not in cached_counts]
+
+    counts, transport_errors = record_counts(sf, objs_to_count)
+    missing = [
+        obj
+        for obj in objs_to_count
+        if obj not in counts or (verify_empty and counts[obj] == 0)
+    ]
+    if missing:
+        soql_counts = count_sobjects(sf, missing)
+        counts.update(soql_counts.counts)
+        transport_errors += tuple(soql_counts.transport_errors)
+        salesforce_errors = tuple(soql_counts.salesforce_errors)
+    else:
+        salesforce_errors = ()
+
+    if cache and counts:
+        cache.update(counts)
+
+    return ObjectCount({**cached_counts, **counts}, transport_errors, salesforce_errors)
+
+
+def record_counts(
+    sf: Salesforce, objs: T.Sequence[str]
+) -> T.Tuple[T.Dict[str, int], T.Tuple[dict, ...]]:
+    """Fetch counts from the recordCount resource.
+
+    Objects it doesn't report, including every object in a request
+    which Salesforce rejected, are left out of the result."""
+    counts = {}
+    transport_errors = []
+    for chunk in iterate_in_chunks(RECORD_COUNT_CHUNK_SIZE, objs):
+        try:
+            response = sf.restful(
+                "limits/recordCount", params={"sObjects": ",".join(chunk)}
+            )
+        except SalesforceError:
+            continue
+        except RequestException as e:
+            request = {"method": "GET", "url": "limits/recordCount", "objs": chunk}
+            transport_errors.append(HTTPRequestError(e, request)._asdict())
+            continue
+        requested = set(chunk)
+        counts.update(
+            (sobject["name"], sobject["count"])
+            for sobject in response.get("sObjects", ())
+            if sobject["name"] in requested
+        )
+    return counts, tuple(transport_errors)
+
+
+class RecordCountCache:
+    """SObject counts saved to a JSON file, each trusted for `ttl` seconds"""
+
+    def __init__(self, path, ttl: float = DEFAULT_COUNT_TTL):
+        self.path = path
+        self.ttl = ttl
+
+    def _load(self) -> dict:
+        if not self.path.exists():
+            return {}
+        try:
+            with self.path.open("r") as f:
+                data = json.load(f)
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get(self, objs: T.Sequence[str]) -> T.Dict[str, int]:
+        "Return the unexpired counts for `objs`"
+        oldest_allowed = time.time() - self.ttl
+        data = self._load()
+        return {
+            obj: data[obj]["count"]
+            for obj in objs
+            if obj in data and data[obj]["timestamp"] >= oldest_allowed
+        }
+
+    def update(self, counts: T.Dict[str, int]):
+        now = time.time()
+        data = self._load()
+        data.update(
+            {obj: {"count": count, "timestamp": now} for obj, count in counts.items()}
+        )
+        with self.path.open("w") as f:
+            json.dump(data, f)
+
+    def clear(self):
+        if self.path.exists():
+            self.path.unlink()
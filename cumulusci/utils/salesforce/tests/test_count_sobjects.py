@@ -1,7 +1,17 @@
+from unittest import mock
+
 import pytest
+import requests
 import vcr
+from simple_salesforce.exceptions import SalesforceError
 
-from cumulusci.utils.salesforce.count_sobjects import count_sobjects
+from cumulusci.utils.salesforce.count_sobjects import (
+    RECORD_COUNT_CHUNK_SIZE,
+    ObjectCount,
+    RecordCountCache,
+    count_sobjects,
+    count_sobjects_fast,
+)
 
 
 class TestCountSObjects:
@@ -27,3 +37,111 @@ class TestCountSObjects:
             _, net_errors, sf_errors = count_sobjects(sf, ["Account", "XYZZY"])
             assert net_errors
             assert not sf_errors
+
+
+class TestCountSObjectsFast:
+    def test_record_count(self):
+        sf = mock.Mock()
+        sf.restful.return_value = {
+            "sObjects": [
+                {"name": "Account", "count": 17},
+                {"name": "Other", "count": 1},
+            ]
+        }
+        with mock.patch(
+            "cumulusci.utils.salesforce.count_sobjects.count_sobjects"
+        ) as soql_count:
+            results, net_errors, sf_errors = count_sobjects_fast(sf, ["Account"])
+        assert results == {"Account": 17}
+        assert not net_errors and not sf_errors
+        sf.restful.assert_called_once_with(
+            "limits/recordCount", params={"sObjects": "Account"}
+        )
+        soql_count.assert_not_called()
+
+    def test_record_count__chunks(self):
+        sf = mock.Mock()
+        sf.restful.return_value = {"sObjects": []}
+        objs = [f"Obj{i}__c" for i in range(RECORD_COUNT_CHUNK_SIZE + 1)]
+        with mock.patch(
+            "cumulusci.utils.salesforce.count_sobjects.count_sobjects",
+            return_value=ObjectCount({obj: 0 for obj in objs}, (), ()),
+        ):
+            results, _, _ = count_sobjects_fast(sf, objs)
+        assert sf.restful.call_count == 2
+        assert len(results) == len(objs)
+
+    def test_falls_back_to_soql(self):
+        sf = mock.Mock()
+        sf.restful.return_value = {"sObjects": [{"name": "Account", "count": 17}]}
+        with mock.patch(
+            "cumulusci.utils.salesforce.count_sobjects.count_sobjects",
+            return_value=ObjectCount({"Opportunity": 3}, (), ({"error": "XYZZY"},)),
+        ) as soql_count:
+            results, net_errors, sf_errors = count_sobjects_fast(
+                sf, ["Account", "Opportunity", "XYZZY"]
+            )
+        soql_count.assert_called_once_with(sf, ["Opportunity", "XYZZY"])
+        assert results == {"Account": 17, "Opportunity": 3}
+        assert sf_errors == ({"error": "XYZZY"},)
+
+    def test_verify_empty(self):
+        sf = mock.Mock()
+        sf.restful.return_value = {
+            "sObjects": [
+                {"name": "Account", "count": 17},
+                {"name": "Contact", "count": 0},
+            ]
+        }
+        with mock.patch(
+            "cumulusci.utils.salesforce.count_sobjects.count_sobjects",
+            return_value=ObjectCount({"Contact": 4}, (), ()),
+        ) as soql_count:
+            results, _, _ = count_sobjects_fast(
+                sf, ["Account", "Contact"], verify_empty=True
+            )
+        soql_count.assert_called_once_with(sf, ["Contact"])
+        assert results == {"Account": 17, "Contact": 4}
+
+    def test_record_count_errors(self):
+        sf = mock.Mock()
+        sf.restful.side_effect = [
+            SalesforceError("url", 400, "recordCount", b"Bad request"),
+            requests.exceptions.ConnectionError("Network down"),
+        ]
+        objs = [f"Obj{i}__c" for i in range(RECORD_COUNT_CHUNK_SIZE + 1)]
+        with mock.patch(
+            "cumulusci.utils.salesforce.count_sobjects.count_sobjects",
+            return_value=ObjectCount({}, (), ()),
+        ) as soql_count:
+            results, net_errors, _ = count_sobjects_fast(sf, objs)
+        assert soql_count.mock_calls[0].args[1] == objs
+        assert "Network down" in str(net_errors)
+
+    def test_cache(self, tmp_path):
+        cache = RecordCountCache(tmp_path / "counts.json")
+        sf = mock.Mock()
+        sf.restful.return_value = {"sObjects": [{"name": "Account", "count": 17}]}
+        assert count_sobjects_fast(sf, ["Account"], cache).counts == {"Account": 17}
+        assert count_sobjects_fast(sf, ["Account"], cache).counts == {"Account": 17}
+        sf.restful.assert_called_once()
+
+    def test_cache__expiry(self, tmp_path):
+        cache = RecordCountCache(tmp_path / "counts.json", ttl=60)
+        with mock.patch("time.time", return_value=1000):
+            cache.update({"Account": 5})
+        with mock.patch("time.time", return_value=1059):
+            assert cache.get(["Account", "Contact"]) == {"Account": 5}
+        with mock.patch("time.time", return_value=1061):
+            assert cache.get(["Account"]) == {}
+
+    def test_cache__corrupt(self, tmp_path):
+        path = tmp_path / "counts.json"
+        path.write_text("{{{")
+        cache = RecordCountCache(path)
+        assert cache.get(["Account"]) == {}
+        cache.update({"Account": 5})
+        assert cache.get(["Account"]) == {"Account": 5}
+        cache.clear()
+        assert not path.exists()
+        cache.clear()
@@ -1,7 +1,11 @@
+import subprocess
+from unittest import mock
+
 import pytest
 
 from cumulusci.utils.git import (
     EMPTY_URL_MESSAGE,
+    changed_files,
     construct_release_branch_name,
     get_release_identifier,
     is_release_branch,
@@ -83,3 +87,28 @@ def test_parse_repo_url(repo_uri, owner, repo_name, host):
 def test_empty_url(URL):
     with pytest.raises(ValueError, match=EMPTY_URL_MESSAGE):
         parse_repo_url(URL)
+
+
+def test_changed_files(tmp_path):
+    def git(*args):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+
+    git("init")
+    git("config", "user.email", "test@example.com")
+    git("config", "user.name", "Test")
+    (tmp_path / "Foo.cls").write_text("one")
+    (tmp_path / "Bar.cls").write_text("one")
+    git("add", ".")
+    git("commit", "-m", "Initial")
+    (tmp_path / "Foo.cls").write_text("two")
+    (tmp_path / "Baz.cls").write_text("one")
+    (tmp_path / "Ignored.cls").write_text("one")
+    (tmp_path / ".gitignore").write_text("Ignored.cls\n")
+
+    assert changed_files(str(tmp_path), "HEAD") == ["Foo.cls", ".gitignore", "Baz.cls"]
+    assert changed_files(str(tmp_path), "missing") is None
+
+
+def test_changed_files__no_git(tmp_path):
+    with mock.patch("sarge.run", side_effect=ValueError("Command not found: git")):
+        assert changed_files(str(tmp_path), "HEAD") is None
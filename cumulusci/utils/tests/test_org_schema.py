@@ -6,6 +6,7 @@ from pathlib import Path
 from unittest.mock import patch
 
 import pytest
+import requests
 import responses
 import yaml
 from sqlalchemy import create_engine
@@ -23,6 +24,7 @@ from cumulusci.tasks.bulkdata.tests.integration_test_utils import (
 )
 from cumulusci.tests.util import FakeUnreliableRequestHandler
 from cumulusci.utils.http.multi_request import HTTPRequestError
+from cumulusci.utils.salesforce.count_sobjects import ObjectCount
 
 ensure_accounts = ensure_accounts  # fixes 4 lint errors at once. Don't hate the player, hate the game.
 ensure_records = ensure_records
@@ -35,6 +37,12 @@ class FakeSF:
 
     base_url = "https://innovation-page-2420-dev-ed.cs50.my.salesforce.com/"
     headers = {}
+    session = requests.Session()
+
+    def restful(self, path, params=None):
+        assert path == "limits/recordCount"
+        # no stored counts, so counting falls back to SOQL
+        return {"sObjects": []}
 
     def describe(self):
         defaults = {"createable": True, "deletable": True, "layoutable": True}
@@ -99,14 +107,14 @@ cached_responses = [
 
 def mock_return_uncached_responses(cassette_data):
     return patch(
-        "cumulusci.salesforce_api.org_schema.CompositeParallelSalesforce",
+        "cumulusci.salesforce_api.org_schema.composite_salesforce_session",
         makeFakeCompositeParallelSalesforce(lambda: uncached_responses(cassette_data)),
     )
 
 
 def mock_return_cached_responses():
     return patch(
-        "cumulusci.salesforce_api.org_schema.CompositeParallelSalesforce",
+        "cumulusci.salesforce_api.org_schema.composite_salesforce_session",
         makeFakeCompositeParallelSalesforce(lambda: cached_responses.copy()),
     )
 
@@ -400,8 +408,8 @@ class TestOrgSchema:
     def test_filter_by_populated(self, sf, org_config):
         with mock_return_uncached_responses(self.cassette_data):
             with patch(
-                "cumulusci.salesforce_api.org_schema.count_sobjects",
-                lambda *args: (
+                "cumulusci.salesforce_api.org_schema.count_sobjects_fast",
+                lambda *args, **kwargs: (
                     {"Account": 10, "Contact": 5, "PermissionSet": 0},
                     [],
                     [],
@@ -415,8 +423,8 @@ class TestOrgSchema:
     def test_error_while_counting(self, sf, org_config, caplog):
         with mock_return_uncached_responses(self.cassette_data):
             with patch(
-                "cumulusci.salesforce_api.org_schema.count_sobjects",
-                lambda *args: (
+                "cumulusci.salesforce_api.org_schema.count_sobjects_fast",
+                lambda *args, **kwargs: (
                     {"Account": 10, "Contact": 5, "PermissionSet": 0},
                     [],
                     [HTTPRequestError("Error! Apostasy!", None)] * 15,
@@ -428,6 +436,52 @@ class TestOrgSchema:
             assert "Apostasy" in caplog.text
             assert "more counting errors suppressed" in caplog.text
 
+    def test_filter_by_populated__record_count(self, org_config):
+        class RecordCountSF(FakeSF):
+            calls = 0
+
+            def restful(self, path, params=None):
+                self.calls += 1
+                objs = params["sObjects"].split(",")
+                return {
+                    "sObjects": [
+                        {"name": obj, "count": 0 if obj == "Case" else 3}
+                        for obj in objs
+                    ]
+                }
+
+        sf = RecordCountSF()
+        with mock_return_uncached_responses(self.cassette_data), patch(
+            "cumulusci.utils.salesforce.count_sobjects.count_sobjects",
+            return_value=ObjectCount({"Case": 0}, (), ()),
+        ) as soql_count:
+            for _ in range(2):
+                with get_org_schema(
+                    sf, org_config, include_counts=True, filters=[Filters.populated]
+                ) as schema:
+                    assert "Account" in schema
+                    assert "Case" not in schema
+            # objects reported as empty are recounted with SOQL
+            assert soql_count.mock_calls[0].args[1] == ["Case"]
+        # counts that decide what is included are never cached
+        assert sf.calls == 2
+
+        with mock_return_uncached_responses(self.cassette_data), patch(
+            "cumulusci.utils.salesforce.count_sobjects.count_sobjects"
+        ) as soql_count:
+            for _ in range(2):
+                with get_org_schema(sf, org_config, include_counts=True) as schema:
+                    assert schema["Account"].count == 3
+            soql_count.assert_not_called()
+        # the second schema used cached counts
+        assert sf.calls == 3
+
+        org_config.records_changed()
+        with mock_return_uncached_responses(self.cassette_data):
+            with get_org_schema(sf, org_config, include_counts=True) as schema:
+                assert schema["Account"].count == 3
+        assert sf.calls == 4
+
     def test_old_schema_version(self, sf, org_config, caplog):
         with mock_return_uncached_responses(self.cassette_data):
             with patch(
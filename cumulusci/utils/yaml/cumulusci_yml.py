@@ -5,15 +5,20 @@ Note: If you change the model here, you should run `make schema`
 to update the JSON Schema version in cumulusci.jsonschema.json
 """
 
+import hashlib
+import json
+import os
 from logging import getLogger
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Union
+from tempfile import NamedTemporaryFile
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 from pydantic.v1 import Field, root_validator, validator
 from pydantic.v1.types import DirectoryPath
 from typing_extensions import Literal, TypedDict
 
 from cumulusci.core.enums import StrEnum
+from cumulusci.core.utils import merge_config
 from cumulusci.utils.fileutils import DataInput, load_from_source
 from cumulusci.utils.yaml.model_parser import CCIDictModel, HashableBaseModel
 from cumulusci.utils.yaml.safer_loader import load_yaml_data
@@ -44,6 +49,11 @@ class Step(CCIDictModel):
     flow: str = None
     ignore_failure: bool = False
     when: str = None  # is this allowed?
+    depends_on: List[Union[int, float, str]] = Field(
+        None,
+        description="Earlier steps of the same flow which must finish before this "
+        "step starts. Only steps whose tasks are thread safe run at the same time.",
+    )
     options: Dict[str, Any] = VSCodeFriendlyDict
     ui_options: Dict[str, Any] = VSCodeFriendlyDict
     checks: List[PreflightCheck] = []
@@ -59,6 +69,11 @@ class Step(CCIDictModel):
         return values
 
 
+class TaskCache(CCIDictModel):
+    ttl: float = None
+    source: bool = None
+
+
 class Task(CCIDictModel):
     class_path: str = None
     description: str = None
@@ -68,6 +83,7 @@ class Task(CCIDictModel):
     options: Dict[str, Any] = VSCodeFriendlyDict
     ui_options: Dict[str, Any] = VSCodeFriendlyDict
     name: str = None  # get rid of this???
+    cache: Union[bool, TaskCache] = None
 
 
 class Flow(CCIDictModel):
@@ -132,6 +148,11 @@ class DependencyResolutions(CCIDictModel):
     resolution_strategies: Dict[str, List[str]] = None
 
 
+class ApiLimits(CCIDictModel):
+    budget: Optional[float] = None
+    ceiling: Optional[float] = None
+
+
 class Project(CCIDictModel):
     name: Optional[str] = None
     package: Optional[Package] = None
@@ -141,6 +162,7 @@ class Project(CCIDictModel):
     dependency_resolutions: Optional[DependencyResolutions] = None
     dependency_pins: Optional[List[Dict[str, str]]]
     source_format: Literal["sfdx", "mdapi"] = "mdapi"
+    api_limits: Optional[ApiLimits] = None
     custom: Optional[Dict] = None
 
 
@@ -322,6 +344,151 @@ def cci_safe_load(
         return data or {}
 
 
+def cci_cached_load(path: Union[str, Path], cache_dir: Path, logger=None) -> dict:
+    """Load a CumulusCI.yml file like cci_safe_load, reusing the data parsed
+    and validated by an earlier load for as long as the file is unchanged.
+
+    The data is saved as JSON in cache_dir, keyed by the file's path and
+    checked against a hash of its contents and the version of CumulusCI.
+    Data which JSON can't represent exactly is not cached."""
+    return cci_cached_load_with_digest(path, cache_dir, logger)[0]
+
+
+def cci_cached_load_with_digest(
+    path: Union[str, Path], cache_dir: Path, logger=None
+) -> Tuple[dict, str]:
+    """Like cci_cached_load, and also returns the hash the cached data is
+    checked against."""
+    logger = logger or default_logger
+    source = Path(path).resolve()
+    digest = config_digest(source.read_bytes())
+    cache_path = _config_cache_path(cache_dir, str(source))
+
+    entry = _read_config_cache(cache_path, digest)
+    if entry is not None:
+        if entry["errors"]:
+            _log_yaml_errors(logger, entry["errors"])
+        return entry["data"], digest
+
+    errors = []
+    data = cci_safe_load(str(path), on_error=errors.append)
+    if errors:
+        _log_yaml_errors(logger, errors)
+
+    _write_config_cache(
+        cache_path,
+        {"path": str(source), "digest": digest, "errors": errors, "data": data},
+    )
+    return data, digest
+
+
+def cci_cached_merge(
+    configs: Dict[str, dict],
+    path: Union[str, Path],
+    digest: Optional[str],
+    cache_dir: Path,
+) -> dict:
+    """Merge configs like merge_config, reusing the result of an earlier merge
+    for as long as `digest` is unchanged.
+
+    `digest` should combine the digests of all the files the configs were
+    loaded from; if it is None, the configs are merged without the cache.
+    The result is saved in cache_dir, keyed by `path`."""
+    source = Path(path).resolve()
+    cache_path = _config_cache_path(cache_dir, f"merged:{source}")
+    if digest is not None:
+        entry = _read_config_cache(cache_path, digest)
+        if entry is not None:
+            return entry["data"]
+
+    data = merge_config(configs)
+    if digest is not None:
+        _write_config_cache(
+            cache_path, {"path": str(source), "digest": digest, "data": data}
+        )
+    return data
+
+
+def config_digest(*parts: Optional[Union[bytes, str]]) -> Optional[str]:
+    """Returns a hash of `parts` and the version of CumulusCI, or None if any
+    part is None. Text is hashed as UTF-8."""
+    from cumulusci import __version__
+
+    h = hashlib.blake2b(__version__.encode("utf-8"))
+    for part in parts:
+        if part is None:
+            return None
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        h.update(hashlib.blake2b(part).digest())
+    return h.hexdigest()
+
+
+def _config_cache_path(cache_dir: Path, key: str) -> Path:
+    return (
+        Path(cache_dir)
+        / f"{hashlib.blake2b(key.encode('utf-8')).hexdigest()[:32]}.json"
+    )
+
+
+def _read_config_cache(cache_path: Path, digest: str) -> Optional[dict]:
+    try:
+        entry = json.loads(
+            cache_path.read_text(encoding="utf-8"), object_hook=_decode_keys
+        )
+        if entry["digest"] == digest:
+            return entry
+    except Exception:
+        pass  # missing, stale or unreadable
+    return None
+
+
+def _write_config_cache(cache_path: Path, entry: dict):
+    try:
+        text = json.dumps(_encode_keys(entry))
+        # e.g. dates don't survive a round trip
+        if json.loads(text, object_hook=_decode_keys)["data"] == entry["data"]:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            _prune_config_cache(cache_path.parent)
+            # Write atomically; other cci processes may be loading the same file
+            with NamedTemporaryFile(
+                "w", encoding="utf-8", dir=cache_path.parent, delete=False
+            ) as f:
+                f.write(text)
+            os.replace(f.name, cache_path)
+    except Exception:
+        pass  # the cache is only an optimization
+
+
+def _encode_keys(data):
+    """JSON keys must be strings, so mappings with other keys, like flow step
+    numbers, are saved as a list of pairs."""
+    if isinstance(data, dict):
+        if "__items__" in data or not all(isinstance(k, str) for k in data):
+            return {"__items__": [[k, _encode_keys(v)] for k, v in data.items()]}
+        return {k: _encode_keys(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [_encode_keys(v) for v in data]
+    return data
+
+
+def _decode_keys(obj: dict) -> dict:
+    if len(obj) == 1 and "__items__" in obj:
+        return {k: v for k, v in obj["__items__"]}
+    return obj
+
+
+def _prune_config_cache(cache_dir: Path):
+    """Remove cached entries for files which no longer exist."""
+    for cache_path in cache_dir.glob("*.json"):
+        try:
+            source = json.loads(cache_path.read_text(encoding="utf-8"))["path"]
+            if not Path(source).exists():
+                cache_path.unlink()
+        except Exception:
+            pass  # another process may have replaced or removed it
+
+
 def _validate_files(globs):
     "Validate YML files from Dev CLI for smoke testing"
 
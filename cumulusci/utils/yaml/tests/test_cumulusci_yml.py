@@ -1,4 +1,6 @@
+import json
 import os
+from datetime import date
 from io import StringIO
 from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
@@ -11,7 +13,10 @@ from cumulusci.utils.yaml.cumulusci_yml import (
     GitHubSourceModel,
     _validate_files,
     _validate_url,
+    cci_cached_load,
+    cci_cached_merge,
     cci_safe_load,
+    config_digest,
     parse_from_yaml,
 )
 
@@ -284,3 +289,106 @@ plans:
     }
     assert "" == caplog.text
     assert expected == parsed_yaml["plans"]
+
+
+def test_cci_cached_load(tmp_path, caplog):
+    path = tmp_path / "cumulusci.yml"
+    path.write_text("project:\n  name: Test\nxyz: 1\n")
+    cache_dir = tmp_path / "cache"
+
+    assert cci_cached_load(path, cache_dir)["project"] == {"name": "Test"}
+    assert len(list(cache_dir.iterdir())) == 1
+    caplog.clear()
+
+    with patch("cumulusci.utils.yaml.cumulusci_yml.cci_safe_load") as safe_load:
+        data = cci_cached_load(path, cache_dir)
+    safe_load.assert_not_called()
+    assert data["project"] == {"name": "Test"}
+    # Validation warnings are still reported
+    assert "xyz" in caplog.text
+
+    path.write_text("project:\n  name: Changed\n")
+    assert cci_cached_load(path, cache_dir)["project"] == {"name": "Changed"}
+    assert len(list(cache_dir.iterdir())) == 1
+
+
+def test_cci_cached_load__prunes_missing_files(tmp_path):
+    cache_dir = tmp_path / "cache"
+    old = tmp_path / "old.yml"
+    old.write_text("project:\n  name: Old\n")
+    cci_cached_load(old, cache_dir)
+    old.unlink()
+
+    new = tmp_path / "new.yml"
+    new.write_text("project:\n  name: New\n")
+    cci_cached_load(new, cache_dir)
+
+    entries = [json.loads(p.read_text()) for p in cache_dir.iterdir()]
+    assert [entry["path"] for entry in entries] == [str(new.resolve())]
+
+
+def test_cci_cached_load__not_json(tmp_path):
+    path = tmp_path / "cumulusci.yml"
+    path.write_text("project:\n  name: Test\nxyz: 2020-01-01\n")
+    cache_dir = tmp_path / "cache"
+
+    assert cci_cached_load(path, cache_dir)["xyz"] == date(2020, 1, 1)
+    assert not list(cache_dir.glob("*.json"))
+
+
+def test_cci_cached_load__non_string_keys(tmp_path):
+    path = tmp_path / "cumulusci.yml"
+    path.write_text(
+        "flows:\n  f:\n    steps:\n      1:\n        task: a\n      1.5:\n        task: b\n"
+        "xyz:\n  __items__: 1\n"
+    )
+    cache_dir = tmp_path / "cache"
+    expected = cci_cached_load(path, cache_dir)
+    assert list(cache_dir.glob("*.json"))
+
+    with patch("cumulusci.utils.yaml.cumulusci_yml.cci_safe_load") as safe_load:
+        data = cci_cached_load(path, cache_dir)
+    safe_load.assert_not_called()
+    assert data == expected
+    assert data["flows"]["f"]["steps"] == {1: {"task": "a"}, 1.5: {"task": "b"}}
+    assert data["xyz"] == {"__items__": 1}
+
+
+def test_cci_cached_merge(tmp_path):
+    cache_dir = tmp_path / "cache"
+    path = tmp_path / "cumulusci.yml"
+    configs = {"a": {"x": 1, "steps": {1: "a"}}, "b": {"x": 2}}
+    digest = config_digest("a", "b")
+
+    assert cci_cached_merge(configs, path, digest, cache_dir) == {
+        "x": 2,
+        "steps": {1: "a"},
+    }
+    with patch("cumulusci.utils.yaml.cumulusci_yml.merge_config") as merge:
+        merged = cci_cached_merge(configs, path, digest, cache_dir)
+    merge.assert_not_called()
+    assert merged == {"x": 2, "steps": {1: "a"}}
+
+    configs["b"]["x"] = 3
+    assert cci_cached_merge(configs, path, config_digest("a", "c"), cache_dir) == {
+        "x": 3,
+        "steps": {1: "a"},
+    }
+    # Without a digest the cache isn't used
+    configs["b"]["x"] = 4
+    assert cci_cached_merge(configs, path, None, cache_dir)["x"] == 4
+
+
+def test_config_digest():
+    assert config_digest("a", b"b") == config_digest(b"a", "b")
+    assert config_digest("ab", "") != config_digest("a", "b")
+    assert config_digest("a", None) is None
+
+
+def test_cci_cached_load__unwritable_cache(tmp_path):
+    path = tmp_path / "cumulusci.yml"
+    path.write_text("project:\n  name: Test\n")
+    cache_dir = tmp_path / "cache"
+    cache_dir.write_text("not a directory")
+
+    assert cci_cached_load(path, cache_dir)["project"] == {"name": "Test"}
@@ -21,7 +21,7 @@ def zip_subfolder(zip_src: zipfile.ZipFile, path):
     return zip_dest
 
 
-def process_text_in_zipfile(zf, process_file):
+def process_text_in_zipfile(zf, process_file, compression=zipfile.ZIP_DEFLATED):
     """Process each file in a zip file using the `process_file` function.
 
     Returns a new zip file.
@@ -33,7 +33,7 @@ def process_text_in_zipfile(zf, process_file):
     Files with content that cannot be decoded as UTF-8 will be skipped.
     """
 
-    new_zf = zipfile.ZipFile(io.BytesIO(), "w", zipfile.ZIP_DEFLATED)
+    new_zf = zipfile.ZipFile(io.BytesIO(), "w", compression)
     for name in zf.namelist():
         content = zf.read(name)
         try:
@@ -59,3 +59,35 @@ def hash_zipfile_contents(zf):
         h.update(name.encode("utf-8"))
         h.update(zf.read(name))
     return h.hexdigest()
+
+
+def hash_zipfile_members(zf) -> dict:
+    """Returns a hash of the content of each file in a zipfile, keyed by name."""
+    return {
+        name: hashlib.blake2b(zf.read(name)).hexdigest()
+        for name in zf.namelist()
+        if not name.endswith("/")
+    }
+
+
+def compress_zipfile(zf, compresslevel=None):
+    """Returns a new zip file with the members of `zf` compressed with DEFLATE.
+
+    Members are copied one at a time, so only one member is held in memory
+    in addition to the zip files. Directory entries are kept. A
+    `compresslevel` of 0 stores the members without compression.
+    """
+    compress_type = zipfile.ZIP_STORED if compresslevel == 0 else zipfile.ZIP_DEFLATED
+    new_zf = zipfile.ZipFile(
+        io.BytesIO(),
+        "w",
+        compress_type,
+        compresslevel=None if compresslevel == 0 else compresslevel,
+    )
+    for info in zf.infolist():
+        zinfo = zipfile.ZipInfo(info.filename, info.date_time)
+        zinfo.external_attr = info.external_attr
+        zinfo.compress_type = zipfile.ZIP_STORED if info.is_dir() else compress_type
+        new_zf.writestr(zinfo, zf.read(info))
+    zf.close()
+    return new_zf